@@ -4,52 +4,108 @@ Commandes slash pour la configuration et gestion du bot avec permissions détail
 """
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
+import asyncio
 import json
-import os
 import logging
-import asyncio
 from datetime import datetime
 
+from bot.utils.guild_config import SETTINGS, parse_value
+from bot.utils.judgment import DivineJudgment
+from bot.utils.server_template import ServerPlanner, load_template, plan_embed, report_embed
+from bot.utils.snapshots import SnapshotRestorer, SnapshotStore
+
 class AdminCog(commands.Cog):
     """Module de commandes slash d'administration avec configuration automatique des permissions"""
     
+    setup_group = app_commands.Group(
+        name="setup",
+        description="🏛️ Configuration avancée du serveur avec permissions automatiques",
+        default_permissions=discord.Permissions(administrator=True),
+        guild_only=True
+    )
+    
+    config_group = app_commands.Group(
+        name="config",
+        description="🗂️ Réglages propres à ce serveur (valeurs globales par défaut)",
+        default_permissions=discord.Permissions(administrator=True),
+        guild_only=True
+    )
+    
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
+        self.snapshots = SnapshotStore(full_every=bot.config.get('snapshots.full_every', 7))
+        self.judgment = DivineJudgment(
+            bot,
+            concurrency=bot.config.get('judgment.concurrency', 5),
+            batch_size=bot.config.get('judgment.batch_size', 25),
+            snapshots=self.snapshots
+        )
+        self._resume_task = None
+    
+    async def cog_load(self):
+        """Démarre les snapshots périodiques (0 pour les désactiver) et reprend les jugements interrompus"""
+        hours = self.bot.config.get('snapshots.interval_hours', 24)
+        if hours:
+            self.nightly_snapshots.change_interval(hours=hours)
+            self.nightly_snapshots.start()
+        self._resume_task = asyncio.create_task(self._resume_judgments())
+    
+    async def cog_unload(self):
+        """Arrêter les tâches périodiques (les jugements en cours reprendront au prochain chargement)"""
+        self.nightly_snapshots.cancel()
+        if self._resume_task:
+            self._resume_task.cancel()
+        self.judgment.cancel_all()
     
-    async def _apply_permissions(self, channel, permissions_dict, guild):
-        """Applique les permissions détaillées à un canal"""
-        for role_name, perms in permissions_dict.items():
+    async def _resume_judgments(self):
+        """Reprise une fois le cache des serveurs rempli"""
+        await self.bot.wait_until_ready()
+        self.judgment.resume_all()
+    
+    @tasks.loop(hours=24)
+    async def nightly_snapshots(self):
+        """Snapshot incrémental de chaque serveur : seuls les objets modifiés sont écrits"""
+        for guild in self.bot.guilds:
             try:
-                if role_name == "@everyone":
-                    role = guild.default_role
-                else:
-                    role = discord.utils.get(guild.roles, name=role_name)
-                
-                if role:
-                    overwrites = discord.PermissionOverwrite()
-                    for perm_name, value in perms.items():
-                        setattr(overwrites, perm_name, value)
-                    
-                    await channel.set_permissions(role, overwrite=overwrites)
-                    await asyncio.sleep(0.2)  # Éviter le rate limiting
-                    self.logger.info(f"✅ Permissions appliquées: {role_name} sur {channel.name}")
+                result = await self.snapshots.capture(guild)
+                self.logger.info(
+                    f"📸 Snapshot {result['name']} de {guild.name} : "
+                    f"{result['changed']} modifié(s), {result['removed']} supprimé(s), {result['size']} octets"
+                )
             except Exception as e:
-                self.logger.error(f"❌ Erreur permission {role_name} sur {channel.name}: {e}")
+                self.logger.error(f"Erreur lors du snapshot de {guild.name}: {e}")
+    
+    @nightly_snapshots.before_loop
+    async def before_nightly_snapshots(self):
+        await self.bot.wait_until_ready()
+    
+    def _planner(self):
+        """Planificateur construit sur le modèle du serveur (relu à chaque commande)"""
+        return ServerPlanner(self.bot, load_template())
 
-    @app_commands.command(name="setup", description="🏛️ Configuration avancée du serveur avec permissions automatiques")
-    @app_commands.default_permissions(administrator=True)
-    async def setup_server(self, interaction: discord.Interaction):
-        """Configuration complète du serveur avec création de canaux, rôles et permissions automatiques"""
+    @setup_group.command(name="plan", description="🔎 Aperçu des changements que /setup appliquerait, sans rien modifier")
+    async def setup_plan(self, interaction: discord.Interaction):
+        """Affiche la différence entre le modèle et le serveur réel"""
+        try:
+            operations = self._planner().plan(interaction.guild)
+        except Exception as e:
+            await interaction.response.send_message(f"❌ Erreur lors de la planification : {str(e)}", ephemeral=True)
+            self.logger.error(f"Erreur lors de la planification: {e}")
+            return
+        
+        await interaction.response.send_message(embed=plan_embed(operations), ephemeral=True)
+
+    @setup_group.command(name="appliquer", description="🏛️ Rendre le serveur conforme au modèle (rôles, canaux, permissions)")
+    @app_commands.describe(supprimer_doublons="Supprimer aussi les rôles, catégories et canaux en double")
+    async def setup_server(self, interaction: discord.Interaction, supprimer_doublons: bool = False):
+        """Configuration complète du serveur : seules les différences avec le modèle sont appliquées"""
         
         await interaction.response.defer()
         
         guild = interaction.guild
-        if guild is None:
-            await interaction.edit_original_response(content="❌ Erreur: Impossible d'accéder aux informations du serveur.")
-            return
         
         setup_embed = discord.Embed(
             title="🏛️ Configuration Avancée du Royaume de Thémis",
@@ -57,500 +113,31 @@ class AdminCog(commands.Cog):
             color=0x9932CC
         )
         
-        created_roles = []
-        created_channels = []
-        created_categories = []
-        errors = []
-        
         try:
-            # 1. Création des rôles de modération hiérarchiques
-            setup_embed.add_field(
-                name="⚡ Étape 1/3",
-                value="Création de la hiérarchie divine...",
-                inline=False
-            )
-            await interaction.edit_original_response(embed=setup_embed)
-            
-            # Rôles de modération hiérarchiques avec permissions détaillées
-            roles_to_create = [
-                {
-                    "name": "🏛️ Gardien Suprême", 
-                    "color": 0x9932CC, 
-                    "permissions": discord.Permissions.all()
-                },
-                {
-                    "name": "⚖️ Magistrat", 
-                    "color": 0xFF6B35, 
-                    "permissions": discord.Permissions(
-                        manage_messages=True, kick_members=True, ban_members=True, 
-                        manage_channels=True, moderate_members=True, manage_roles=True,
-                        view_audit_log=True, manage_nicknames=True
-                    )
-                },
-                {
-                    "name": "🛡️ Sentinel", 
-                    "color": 0x3498DB, 
-                    "permissions": discord.Permissions(
-                        manage_messages=True, kick_members=True, moderate_members=True,
-                        manage_nicknames=True, view_audit_log=True
-                    )
-                },
-                {
-                    "name": "⚔️ Garde Élite", 
-                    "color": 0x8B0000, 
-                    "permissions": discord.Permissions(
-                        manage_messages=True, moderate_members=True, view_audit_log=True
-                    )
-                },
-                {
-                    "name": "🔍 Inspecteur", 
-                    "color": 0x4B0082, 
-                    "permissions": discord.Permissions(
-                        view_audit_log=True, read_message_history=True
-                    )
-                },
-                {
-                    "name": "📚 Sage", 
-                    "color": 0x00FF7F, 
-                    "permissions": discord.Permissions(
-                        manage_messages=True, send_messages=True, embed_links=True,
-                        attach_files=True, use_external_emojis=True
-                    )
-                },
-                {
-                    "name": "🎭 Animateur", 
-                    "color": 0xFF1493, 
-                    "permissions": discord.Permissions(
-                        send_messages=True, embed_links=True, attach_files=True,
-                        use_external_emojis=True, create_public_threads=True,
-                        manage_threads=True
-                    )
-                },
-                {
-                    "name": "🎯 Spécialiste", 
-                    "color": 0x32CD32, 
-                    "permissions": discord.Permissions(
-                        send_messages=True, embed_links=True, attach_files=True
-                    )
-                },
-                {
-                    "name": "� VIP", 
-                    "color": 0xFF00FF, 
-                    "permissions": discord.Permissions(
-                        send_messages=True, embed_links=True, attach_files=True,
-                        use_external_emojis=True, add_reactions=True, priority_speaker=True
-                    )
-                },
-                {
-                    "name": "🌟 Membre Actif", 
-                    "color": 0x87CEEB, 
-                    "permissions": discord.Permissions(
-                        send_messages=True, attach_files=True, add_reactions=True
-                    )
-                },
-                {
-                    "name": "�👑 Citoyen d'Honneur", 
-                    "color": 0xFFD700, 
-                    "permissions": discord.Permissions(
-                        send_messages=True, embed_links=True, attach_files=True,
-                        use_external_emojis=True, add_reactions=True
-                    )
-                },
-                {
-                    "name": "🎭 Citoyen", 
-                    "color": 0x95A5A6, 
-                    "permissions": discord.Permissions(
-                        send_messages=True, read_message_history=True, add_reactions=True,
-                        connect=True, speak=True
-                    )
-                },
-                {
-                    "name": "🎫 En Attente", 
-                    "color": 0x2F3136, 
-                    "permissions": discord.Permissions(
-                        read_message_history=True, view_channel=True
-                    )
-                },
-                {
-                    "name": "⚠️ Banni Temporaire", 
-                    "color": 0x000000, 
-                    "permissions": discord.Permissions()
-                }
-            ]
+            planner = self._planner()
+            operations = planner.plan(guild)
             
-            for role_data in roles_to_create:
-                try:
-                    role = await guild.create_role(
-                        name=role_data["name"],
-                        color=discord.Color(role_data["color"]),
-                        permissions=role_data["permissions"],
-                        reason="Configuration automatique par Themis-Bot"
-                    )
-                    created_roles.append(role.name)
-                    await asyncio.sleep(0.5)  # Éviter les rate limits
-                except Exception as e:
-                    errors.append(f"Rôle {role_data['name']}: {str(e)}")
-            
-            # 2. Création des catégories et canaux avec permissions automatiques
-            setup_embed.clear_fields()
             setup_embed.add_field(
-                name="⚡ Étape 2/3",
-                value="Construction de l'architecture divine avec permissions...",
+                name="⚡ Plan",
+                value=f"{len(operations)} opération(s) à appliquer...",
                 inline=False
             )
             await interaction.edit_original_response(embed=setup_embed)
             
-            # Structure des canaux avec permissions détaillées par rôle
-            channel_structure = {
-                "📋 INFORMATIONS": {
-                    "type": "category",
-                    "permissions": {
-                        "@everyone": {"view_channel": True, "send_messages": False},
-                        "🏛️ Gardien Suprême": {"view_channel": True, "send_messages": True, "manage_messages": True},
-                        "⚖️ Magistrat": {"view_channel": True, "send_messages": True, "manage_messages": True}
-                    },
-                    "channels": [
-                        {
-                            "name": "📜-règles-sacrées", 
-                            "type": "text", 
-                            "topic": "Les lois divines qui régissent ce royaume",
-                            "permissions": {
-                                "🎭 Citoyen": {"view_channel": True, "send_messages": False, "add_reactions": True},
-                                "� En Attente": {"view_channel": False},
-                                "�🏛️ Gardien Suprême": {"send_messages": True, "manage_messages": True},
-                                "⚖️ Magistrat": {"send_messages": True, "manage_messages": True},
-                                "📚 Sage": {"send_messages": True}
-                            }
-                        },
-                        {
-                            "name": "📢-annonces-royales", 
-                            "type": "text", 
-                            "topic": "Proclamations officielles du royaume",
-                            "permissions": {
-                                "🎭 Citoyen": {"view_channel": True, "send_messages": False, "add_reactions": True},
-                                "� En Attente": {"view_channel": False},
-                                "�🏛️ Gardien Suprême": {"send_messages": True, "manage_messages": True},
-                                "⚖️ Magistrat": {"send_messages": True},
-                                "🛡️ Sentinel": {"send_messages": True},
-                                "🎭 Animateur": {"send_messages": True}
-                            }
-                        },
-                        {
-                            "name": "ℹ️-guide-serveur", 
-                            "type": "text", 
-                            "topic": "Guide d'utilisation du serveur et de ses fonctionnalités",
-                            "permissions": {
-                                "🎭 Citoyen": {"view_channel": True, "send_messages": False, "add_reactions": True},
-                                "🎫 En Attente": {"view_channel": True, "send_messages": False},
-                                "📚 Sage": {"send_messages": True, "manage_messages": True}
-                            }
-                        }
-                    ]
-                },
-                "🎫 VÉRIFICATION D'IDENTITÉ": {
-                    "type": "category",
-                    "permissions": {
-                        "@everyone": {"view_channel": True, "send_messages": True},
-                        "🎭 Citoyen": {"view_channel": False},  # Les citoyens vérifiés n'ont plus besoin de cette zone
-                        "🏛️ Gardien Suprême": {"view_channel": True, "send_messages": True, "manage_messages": True},
-                        "⚖️ Magistrat": {"view_channel": True, "send_messages": True, "manage_messages": True},
-                        "🛡️ Sentinel": {"view_channel": True, "send_messages": True, "manage_messages": True}
-                    },
-                    "channels": [
-                        {
-                            "name": "🎫-créer-ticket", 
-                            "type": "text", 
-                            "topic": "Créez votre ticket pour vérifier votre identité",
-                            "permissions": {
-                                "@everyone": {"view_channel": True, "send_messages": True},
-                                "🎭 Citoyen": {"view_channel": False}
-                            }
-                        },
-                        {
-                            "name": "�-guide-vérification", 
-                            "type": "text", 
-                            "topic": "Guide complet pour la vérification d'identité",
-                            "permissions": {
-                                "@everyone": {"view_channel": True, "send_messages": False},
-                                "🎭 Citoyen": {"view_channel": False}
-                            }
-                        }
-                    ]
-                },
-                "�💬 AGORA PUBLIQUE": {
-                    "type": "category",
-                    "permissions": {
-                        "🎭 Citoyen": {"view_channel": True, "send_messages": True},
-                        "🎫 En Attente": {"view_channel": False},
-                        "🛡️ Sentinel": {"manage_messages": True}
-                    },
-                    "channels": [
-                        {
-                            "name": "💬-discussion-générale", 
-                            "type": "text", 
-                            "topic": "Temple de la parole libre et des échanges",
-                            "permissions": {
-                                "🎭 Citoyen": {"send_messages": True, "embed_links": True, "attach_files": True},
-                                "👑 Citoyen d'Honneur": {"create_public_threads": True, "manage_threads": True},
-                                "🌟 Membre Actif": {"create_public_threads": True}
-                            }
-                        },
-                        {
-                            "name": "🎮-gaming", 
-                            "type": "text", 
-                            "topic": "Partage tes aventures ludiques et organise des parties",
-                            "permissions": {
-                                "🎭 Citoyen": {"send_messages": True, "attach_files": True, "embed_links": True}
-                            }
-                        },
-                        {
-                            "name": "🎨-créations", 
-                            "type": "text", 
-                            "topic": "Partage tes créations artistiques et projets",
-                            "permissions": {
-                                "🎭 Citoyen": {"send_messages": True, "attach_files": True, "embed_links": True}
-                            }
-                        },
-                        {
-                            "name": "📰-actualités", 
-                            "type": "text", 
-                            "topic": "Discussions sur l'actualité et les événements",
-                            "permissions": {
-                                "🎭 Citoyen": {"send_messages": True, "embed_links": True},
-                                "📚 Sage": {"manage_messages": True}
-                            }
-                        }
-                    ]
-                },
-                "🔊 SALONS VOCAUX": {
-                    "type": "category",
-                    "permissions": {
-                        "🎭 Citoyen": {"view_channel": True, "connect": True, "speak": True},
-                        "🎫 En Attente": {"view_channel": False},
-                        "💎 VIP": {"priority_speaker": True},
-                        "🛡️ Sentinel": {"move_members": True, "mute_members": True}
-                    },
-                    "channels": [
-                        {
-                            "name": "🔊 Hall Principal", 
-                            "type": "voice", 
-                            "user_limit": 0,  # Pas de limite
-                            "permissions": {
-                                "🎭 Citoyen": {"connect": True, "speak": True},
-                                "💎 VIP": {"priority_speaker": True}
-                            }
-                        },
-                        {
-                            "name": "🎮 Gaming Lounge", 
-                            "type": "voice", 
-                            "user_limit": 10,
-                            "permissions": {
-                                "🎭 Citoyen": {"connect": True, "speak": True, "use_voice_activation": True}
-                            }
-                        },
-                        {
-                            "name": "📚 Salle d'Étude", 
-                            "type": "voice", 
-                            "user_limit": 6,
-                            "permissions": {
-                                "🎭 Citoyen": {"connect": True, "speak": True},
-                                "📚 Sage": {"priority_speaker": True}
-                            }
-                        },
-                        {
-                            "name": "🎵 Musique & Détente", 
-                            "type": "voice", 
-                            "user_limit": 8,
-                            "permissions": {
-                                "🎭 Citoyen": {"connect": True, "speak": True, "use_voice_activation": True}
-                            }
-                        },
-                        {
-                            "name": "💼 Réunion Privée", 
-                            "type": "voice", 
-                            "user_limit": 4,
-                            "permissions": {
-                                "🎭 Citoyen": {"connect": True, "speak": True},
-                                "🎯 Spécialiste": {"priority_speaker": True}
-                            }
-                        }
-                    ]
-                },
-                "👑 ZONE VIP": {
-                    "type": "category",
-                    "permissions": {
-                        "@everyone": {"view_channel": False},
-                        "💎 VIP": {"view_channel": True, "send_messages": True, "connect": True, "speak": True},
-                        "👑 Citoyen d'Honneur": {"view_channel": True, "send_messages": True, "connect": True},
-                        "🏛️ Gardien Suprême": {"view_channel": True, "send_messages": True},
-                        "⚖️ Magistrat": {"view_channel": True, "send_messages": True}
-                    },
-                    "channels": [
-                        {
-                            "name": "💎-salon-vip", 
-                            "type": "text", 
-                            "topic": "Salon exclusif pour les membres VIP",
-                            "permissions": {
-                                "💎 VIP": {"send_messages": True, "embed_links": True, "attach_files": True}
-                            }
-                        },
-                        {
-                            "name": "👑 Salon Royal", 
-                            "type": "voice", 
-                            "user_limit": 6,
-                            "permissions": {
-                                "💎 VIP": {"connect": True, "speak": True, "priority_speaker": True}
-                            }
-                        }
-                    ]
-                },
-                "🛡️ MODÉRATION": {
-                    "type": "category",
-                    "permissions": {
-                        "@everyone": {"view_channel": False},
-                        "🏛️ Gardien Suprême": {"view_channel": True, "send_messages": True, "manage_messages": True},
-                        "⚖️ Magistrat": {"view_channel": True, "send_messages": True, "manage_messages": True},
-                        "🛡️ Sentinel": {"view_channel": True, "send_messages": True}
-                    },
-                    "channels": [
-                        {
-                            "name": "📋-rapports", 
-                            "type": "text", 
-                            "topic": "Rapports de modération et sanctions",
-                            "permissions": {
-                                "🔍 Inspecteur": {"view_channel": True, "send_messages": True}
-                            }
-                        },
-                        {
-                            "name": "💼-discussion-staff", 
-                            "type": "text", 
-                            "topic": "Discussions internes de l'équipe"
-                        },
-                        {
-                            "name": "📊-logs-serveur", 
-                            "type": "text", 
-                            "topic": "Logs automatiques des actions du serveur",
-                            "permissions": {
-                                "@everyone": {"send_messages": False}
-                            }
-                        },
-                        {
-                            "name": "🎫-logs-tickets", 
-                            "type": "text", 
-                            "topic": "Historique des tickets de vérification d'identité",
-                            "permissions": {
-                                "@everyone": {"send_messages": False}
-                            }
-                        },
-                        {
-                            "name": "🛡️ Bureau Modération", 
-                            "type": "voice", 
-                            "user_limit": 5,
-                            "permissions": {
-                                "🔍 Inspecteur": {"connect": True, "speak": True}
-                            }
-                        }
-                    ]
-                }
-            }
-            
-            # Créer les catégories et canaux avec leurs permissions automatiques
-            for category_name, category_data in channel_structure.items():
-                try:
-                    # Créer la catégorie
-                    category = await guild.create_category(
-                        name=category_name,
-                        reason="Configuration automatique par Themis-Bot"
-                    )
-                    created_categories.append(category_name)
-                    
-                    # Appliquer les permissions de catégorie
-                    if "permissions" in category_data:
-                        await self._apply_permissions(category, category_data["permissions"], guild)
-                    
-                    # Créer les canaux dans la catégorie
-                    for channel_info in category_data["channels"]:
-                        channel = None
-                        try:
-                            if channel_info["type"] == "text":
-                                channel = await guild.create_text_channel(
-                                    name=channel_info["name"],
-                                    category=category,
-                                    topic=channel_info.get("topic", ""),
-                                    reason="Configuration automatique par Themis-Bot"
-                                )
-                            elif channel_info["type"] == "voice":
-                                channel = await guild.create_voice_channel(
-                                    name=channel_info["name"],
-                                    category=category,
-                                    user_limit=channel_info.get("user_limit", 0),
-                                    reason="Configuration automatique par Themis-Bot"
-                                )
-                            
-                            if channel:
-                                created_channels.append(channel.name)
-                                
-                                # Appliquer les permissions spécifiques du canal
-                                if "permissions" in channel_info:
-                                    await self._apply_permissions(channel, channel_info["permissions"], guild)
-                            
-                            await asyncio.sleep(0.3)
-                            
-                        except Exception as e:
-                            errors.append(f"Canal {channel_info['name']}: {str(e)}")
-                    
-                    await asyncio.sleep(1)  # Pause entre les catégories
-                    
-                except Exception as e:
-                    errors.append(f"Catégorie {category_name}: {str(e)}")
-            
-            # 3. Résumé final
-            setup_embed.clear_fields()
-            setup_embed.title = "✅ Configuration du Royaume Accomplie"
-            setup_embed.description = "🏛️ **Le royaume de Thémis est établi avec permissions automatiques !**"
-            setup_embed.color = 0x00FF00
-            
-            setup_embed.add_field(
-                name="👑 Rôles Créés",
-                value=f"**{len(created_roles)} rôles hiérarchiques**\n" + 
-                      "\n".join([f"• {role}" for role in created_roles]),
-                inline=True
-            )
-            
-            setup_embed.add_field(
-                name="🏛️ Structure Créée",
-                value=f"**{len(created_categories)} catégories**\n" +
-                      f"**{len(created_channels)} canaux**\n" +
-                      "**✅ Permissions configurées automatiquement**",
-                inline=True
-            )
-            
-            setup_embed.add_field(
-                name="🔐 Permissions Appliquées Automatiquement",
-                value="**📜 Règles :** Lecture seule pour tous, écriture pour staff\n" +
-                      "**📢 Annonces :** Lecture pour tous, écriture pour modération\n" +
-                      "**💬 Discussion :** Accès graduel selon les rôles\n" +
-                      "**🛡️ Modération :** Staff uniquement\n" +
-                      "**Chaque rôle a ses permissions spécifiques !**",
-                inline=False
+            report = await planner.apply(
+                guild,
+                operations,
+                delete_duplicates=supprimer_doublons,
+                concurrency=self.bot.config.get('setup.concurrency', 5)
             )
             
-            if errors:
-                error_text = "\n".join(errors[:3])
-                if len(errors) > 3:
-                    error_text += f"\n... et {len(errors) - 3} autres erreurs"
-                setup_embed.add_field(
-                    name="⚠️ Avertissements",
-                    value=f"```{error_text}```",
-                    inline=False
-                )
-            
-            setup_embed.set_footer(text="Themis-Bot • Configuration avec Permissions Automatiques")
-            
-            await interaction.edit_original_response(embed=setup_embed)
+            await interaction.edit_original_response(embed=report_embed(report))
             
             # Log de l'action
-            self.logger.info(f"🏛️ {interaction.user} a configuré le serveur {guild.name} avec permissions automatiques")
+            self.logger.info(
+                f"🏛️ {interaction.user} a configuré le serveur {guild.name} "
+                f"({len(operations)} opérations, {report['api_calls']} appels API)"
+            )
             
         except Exception as e:
             error_embed = discord.Embed(
@@ -563,6 +150,225 @@ class AdminCog(commands.Cog):
             await interaction.edit_original_response(embed=error_embed)
             self.logger.error(f"Erreur lors de la configuration: {e}")
 
+    @app_commands.command(name="snapshot", description="📸 Sauvegarder la structure du serveur (rôles, canaux, permissions)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def snapshot(self, interaction: discord.Interaction):
+        """Snapshot incrémental de la structure du serveur"""
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            result = await self.snapshots.capture(interaction.guild)
+        except Exception as e:
+            await interaction.followup.send(f"❌ Erreur lors du snapshot : {str(e)}", ephemeral=True)
+            self.logger.error(f"Erreur lors du snapshot: {e}")
+            return
+        
+        embed = discord.Embed(
+            title="📸 Snapshot enregistré",
+            description=f"**Nom :** `{result['name']}`",
+            color=0x00FF00,
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="🧾 Type", value="Complet" if result['full'] else "Incrémental", inline=True)
+        embed.add_field(name="✏️ Modifiés", value=str(result['changed']), inline=True)
+        embed.add_field(name="🗑️ Supprimés", value=str(result['removed']), inline=True)
+        embed.add_field(name="📦 Objets suivis", value=str(result['total']), inline=True)
+        embed.add_field(name="💾 Taille", value=f"{result['size'] / 1024:.1f} Ko", inline=True)
+        
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        self.logger.info(f"📸 {interaction.user} a pris le snapshot {result['name']} de {interaction.guild.name}")
+
+    @app_commands.command(name="restore", description="♻️ Recréer les rôles et canaux manquants depuis un snapshot")
+    @app_commands.describe(nom="Snapshot à restaurer (le plus récent par défaut)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def restore(self, interaction: discord.Interaction, nom: str = None):
+        """Reconstruit la structure du serveur à partir d'un snapshot"""
+        await interaction.response.defer()
+        
+        guild = interaction.guild
+        try:
+            name, state = await asyncio.to_thread(self.snapshots.load, guild.id, nom)
+        except FileNotFoundError:
+            await interaction.followup.send("❌ Snapshot introuvable pour ce serveur.", ephemeral=True)
+            return
+        
+        progress = discord.Embed(
+            title="♻️ Restauration en cours",
+            description=f"Snapshot `{name}` : {len(state['roles'])} rôle(s), {len(state['channels'])} canal(aux)...",
+            color=0x9932CC
+        )
+        await interaction.edit_original_response(embed=progress)
+        
+        try:
+            restorer = SnapshotRestorer(self.bot, concurrency=self.bot.config.get('setup.concurrency', 5))
+            report = await restorer.restore(guild, state)
+        except Exception as e:
+            error_embed = discord.Embed(
+                title="❌ Erreur de Restauration",
+                description=f"**Erreur :** {str(e)}\n\nLa restauration a été interrompue.",
+                color=0xFF0000,
+                timestamp=datetime.utcnow()
+            )
+            await interaction.edit_original_response(embed=error_embed)
+            self.logger.error(f"Erreur lors de la restauration: {e}")
+            return
+        
+        embed = discord.Embed(
+            title="♻️ Restauration terminée",
+            description=f"Snapshot `{name}` appliqué en {report['elapsed']:.1f}s ({report['api_calls']} appels API)",
+            color=0xFF8C00 if report['errors'] else 0x00FF00,
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="🎭 Rôles recréés", value=str(report['roles']), inline=True)
+        embed.add_field(name="📁 Canaux recréés", value=str(report['channels']), inline=True)
+        if report['errors']:
+            errors = "\n".join(report['errors'][:10])
+            if len(report['errors']) > 10:
+                errors += f"\n... et {len(report['errors']) - 10} autre(s)"
+            embed.add_field(name="⚠️ Erreurs", value=errors[:1024], inline=False)
+        
+        await interaction.edit_original_response(embed=embed)
+        self.logger.info(f"♻️ {interaction.user} a restauré le snapshot {name} sur {guild.name}")
+
+    @restore.autocomplete("nom")
+    async def restore_autocomplete(self, interaction: discord.Interaction, current: str):
+        names = await asyncio.to_thread(self.snapshots.names, interaction.guild_id)
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in reversed(names) if current in name
+        ][:25]
+
+    @app_commands.command(name="jugement-divin", description="⚖️ RESET COMPLET - Supprime tout et ne laisse qu'un canal de rédemption")
+    @app_commands.describe(confirmation="Tapez 'JE CONFIRME LE JUGEMENT DIVIN' pour confirmer")
+    @app_commands.default_permissions(administrator=True)
+    async def divine_judgment(self, interaction: discord.Interaction, confirmation: str):
+        """Commande de reset dramatique du serveur - Supprime tout sauf un canal de rédemption"""
+        
+        # Vérification de la confirmation
+        if confirmation != "JE CONFIRME LE JUGEMENT DIVIN":
+            await interaction.response.send_message(
+                "❌ **Confirmation Invalide**\n"
+                "Pour confirmer cette action destructrice, vous devez taper exactement :\n"
+                "```JE CONFIRME LE JUGEMENT DIVIN```\n"
+                "⚠️ **ATTENTION:** Cette commande supprime TOUT (rôles, canaux, etc.)",
+                ephemeral=True
+            )
+            return
+        
+        if interaction.guild and self.judgment.running(interaction.guild.id):
+            await interaction.response.send_message(
+                "⏳ Un Jugement Divin est déjà en cours sur ce serveur. Suivez sa progression dans **#rédemption**.",
+                ephemeral=True
+            )
+            return
+        
+        # Embed de confirmation finale
+        warning_embed = discord.Embed(
+            title="⚖️ JUGEMENT DIVIN IMMINENT",
+            description="🔥 **Dernière chance de reculer !** 🔥\n\n"
+                       "Cette action va :\n"
+                       "• 🗑️ Supprimer TOUS les canaux\n"
+                       "• 👥 Supprimer TOUS les rôles (sauf @everyone)\n"
+                       "• 🏛️ Créer uniquement un canal '#rédemption'\n"
+                       "• ⚰️ Effacer l'histoire du serveur\n\n"
+                       "**Cette action est IRRÉVERSIBLE !**",
+            color=0xFF0000,
+            timestamp=datetime.utcnow()
+        )
+        
+        warning_embed.add_field(
+            name="🔥 Citation Divine",
+            value="*« Et Thémis dit : Que la justice s'abatte sur ce royaume corrompu ! »*",
+            inline=False
+        )
+        
+        warning_embed.set_footer(text="Vous avez 10 secondes pour arrêter en supprimant cette interaction...")
+        
+        await interaction.response.send_message(embed=warning_embed)
+        
+        # Attendre 10 secondes
+        await asyncio.sleep(10)
+        
+        guild = interaction.guild
+        if guild is None:
+            await interaction.edit_original_response(content="❌ Erreur: Impossible d'accéder au serveur.")
+            return
+        
+        # Le reset tourne en tâche de fond : l'interaction expire bien avant la fin sur un gros serveur
+        self.judgment.start(guild, interaction.user)
+        
+        judgment_embed = discord.Embed(
+            title="⚖️ LE JUGEMENT DIVIN COMMENCE",
+            description="🔥 **Que la purification commence !** 🔥\n\n"
+                       "La progression sera publiée dans le canal **#rédemption**.\n"
+                       "Un snapshot de la structure est pris avant toute suppression.",
+            color=0x8B0000,
+            timestamp=datetime.utcnow()
+        )
+        
+        try:
+            await interaction.edit_original_response(embed=judgment_embed)
+        except discord.HTTPException:
+            # Le canal original a probablement déjà été supprimé
+            pass
+
+    @staticmethod
+    def _format_setting(value) -> str:
+        text = json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, bool)) else str(value)
+        return text if len(text) <= 200 else text[:197] + "..."
+
+    @config_group.command(name="get", description="🔎 Afficher les réglages de ce serveur")
+    @app_commands.describe(cle="Réglage à afficher (tous par défaut)")
+    @app_commands.choices(cle=[app_commands.Choice(name=key, value=key) for key in SETTINGS])
+    async def config_get(self, interaction: discord.Interaction, cle: str = None):
+        """Valeurs en vigueur, en distinguant celles propres au serveur des valeurs globales"""
+        overrides = await self.bot.guild_config.overrides(interaction.guild_id)
+        values = await self.bot.guild_config.get_all(interaction.guild_id)
+        
+        embed = discord.Embed(
+            title="🗂️ Configuration du serveur",
+            description="📌 valeur propre au serveur • 🌐 valeur globale",
+            color=0x9932CC,
+            timestamp=datetime.utcnow()
+        )
+        for key in [cle] if cle else SETTINGS:
+            source = "📌" if key in overrides else "🌐"
+            embed.add_field(
+                name=f"{source} {key}",
+                value=f"`{self._format_setting(values[key])}`\n*{SETTINGS[key].description}*",
+                inline=False
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @config_group.command(name="set", description="✏️ Modifier un réglage pour ce serveur")
+    @app_commands.describe(cle="Réglage à modifier", valeur="Nouvelle valeur (« défaut » pour revenir à la valeur globale)")
+    @app_commands.choices(cle=[app_commands.Choice(name=key, value=key) for key in SETTINGS])
+    async def config_set(self, interaction: discord.Interaction, cle: str, valeur: str):
+        """Enregistre une valeur propre au serveur, ou la retire"""
+        guild_config = self.bot.guild_config
+        if valeur.strip().lower() in ("défaut", "defaut", "default"):
+            await guild_config.reset(interaction.guild_id, cle)
+            value = await guild_config.get(interaction.guild_id, cle)
+            await interaction.response.send_message(
+                f"🌐 **{cle}** revient à la valeur globale : `{self._format_setting(value)}`", ephemeral=True
+            )
+            self.logger.info(f"🗂️ {interaction.user} a rétabli {cle} sur {interaction.guild.name}")
+            return
+        
+        try:
+            value = parse_value(cle, valeur)
+        except ValueError as e:
+            await interaction.response.send_message(f"❌ Valeur invalide pour **{cle}** : {e}", ephemeral=True)
+            return
+        
+        await guild_config.set(interaction.guild_id, cle, value)
+        await interaction.response.send_message(
+            f"📌 **{cle}** = `{self._format_setting(value)}` pour ce serveur", ephemeral=True
+        )
+        self.logger.info(f"🗂️ {interaction.user} a défini {cle} sur {interaction.guild.name}")
+
 async def setup(bot):
     """Charge le module d'administration avec permissions automatiques"""
-    await bot.add_cog(AdminCog(bot))
\ No newline at end of file
+    await bot.add_cog(AdminCog(bot))
@@ -46,7 +46,14 @@ class HelpCog(commands.Cog):
         
         # Commandes d'administration
         admin_commands = [
-            "`/setup` - 🏛️ Configuration initiale",
+            "`/setup appliquer` - 🏛️ Configuration initiale",
+            "`/setup plan` - 🔎 Aperçu des changements",
+            "`/snapshot` - 📸 Sauvegarder la structure du serveur",
+            "`/restore` - ♻️ Restaurer depuis un snapshot",
+            "`/config get` - 🗂️ Réglages de ce serveur",
+            "`/config set` - ✏️ Modifier un réglage du serveur",
+            "`/api-usage` - 💸 Coût des commandes en appels API",
+            "`/memory` - 🧠 Taille des caches par serveur",
             "`/configure channel` - ⚙️ Configurer un canal",
             "`/toggle` - 🔄 Activer/Désactiver fonctionnalités",
             "`/prefix` - 🔧 Changer le préfixe",
@@ -65,7 +72,7 @@ class HelpCog(commands.Cog):
             "`/userinfo` - 👤 Infos utilisateur",
             "`/serverinfo` - 🏰 Infos du serveur",
             "`/avatar` - 🖼️ Avatar d'un utilisateur",
-            "`/ping` - 🏓 Latence du bot"
+            "`/ping` - 🏓 Latence du bot (par shard)"
         ]
         
         embed.add_field(
@@ -36,8 +36,14 @@ class SecurityCog(commands.Cog):
         # Cache pour les IPs des utilisateurs (limité dans Discord)
         self.user_ip_cache: Dict[int, dict] = {}
         
-        # Configuration de sécurité
-        self.security_config = self._load_security_config()
+        # Configuration de sécurité (lue dans cog_load, hors de la boucle d'événements)
+        self.security_config: Dict[str, Any] = {}
+    
+    async def cog_load(self):
+        """Charge la configuration de sécurité sans bloquer le démarrage des autres modules"""
+        self.security_config = await asyncio.to_thread(self._load_security_config)
+        # Les réglages par serveur se replient sur cette configuration : cache à reconstruire
+        self.bot.guild_config.invalidate()
         
     def _load_security_config(self) -> dict:
         """Charge la configuration de sécurité"""
@@ -82,8 +88,8 @@ class SecurityCog(commands.Cog):
             ]
         }
     
-    def is_rate_limited(self, user_id: int) -> bool:
-        """Vérifie si un utilisateur est rate limité"""
+    def is_rate_limited(self, user_id: int, max_requests: Optional[int] = None) -> bool:
+        """Vérifie si un utilisateur est rate limité (limite du serveur si fournie)"""
         now = time.time()
         if user_id not in self.rate_limits:
             self.rate_limits[user_id] = []
@@ -95,7 +101,9 @@ class SecurityCog(commands.Cog):
         ]
         
         # Vérifier la limite
-        if len(self.rate_limits[user_id]) >= self.security_config['max_requests_per_minute']:
+        if max_requests is None:
+            max_requests = self.security_config['max_requests_per_minute']
+        if len(self.rate_limits[user_id]) >= max_requests:
             return True
         
         # Ajouter la nouvelle requête
@@ -138,7 +146,8 @@ class SecurityCog(commands.Cog):
         """Affiche les informations réseau disponibles pour un utilisateur"""
         
         # Rate limiting
-        if self.is_rate_limited(interaction.user.id):
+        settings = await self.bot.guild_config.get_all(interaction.guild_id)
+        if self.is_rate_limited(interaction.user.id, settings['security.max_requests_per_minute']):
             await interaction.response.send_message(
                 "⚠️ **Rate Limit Atteint**\nTrop de requêtes. Attendez une minute.",
                 ephemeral=True
@@ -314,7 +323,8 @@ class SecurityCog(commands.Cog):
         """Teste la connectivité vers une IP (réseaux privés uniquement)"""
         
         # Vérification des permissions et rate limiting
-        if self.is_rate_limited(interaction.user.id):
+        settings = await self.bot.guild_config.get_all(interaction.guild_id)
+        if self.is_rate_limited(interaction.user.id, settings['security.max_requests_per_minute']):
             await interaction.response.send_message(
                 "⚠️ **Rate Limit Atteint**\nTrop de requêtes. Attendez une minute.",
                 ephemeral=True
@@ -357,7 +367,7 @@ class SecurityCog(commands.Cog):
                 
                 # Test de connexion TCP
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(self.security_config['test_timeout'])
+                sock.settimeout(settings['security.test_timeout'])
                 result = sock.connect_ex((ip_clean, port))
                 sock.close()
                 
@@ -390,7 +400,7 @@ class SecurityCog(commands.Cog):
                 embed.color = 0xFFA500
                 embed.add_field(
                     name="⏰ Timeout",
-                    value=f"Pas de réponse après {self.security_config['test_timeout']}s",
+                    value=f"Pas de réponse après {settings['security.test_timeout']}s",
                     inline=False
                 )
             
@@ -413,7 +423,7 @@ class SecurityCog(commands.Cog):
                 name="🔧 Détails du Test",
                 value=(
                     f"**Port testé:** {port}\n"
-                    f"**Timeout:** {self.security_config['test_timeout']}s\n"
+                    f"**Timeout:** {settings['security.test_timeout']}s\n"
                     f"**Timestamp:** {datetime.now().strftime('%H:%M:%S')}"
                 ),
                 inline=True
@@ -442,7 +452,8 @@ class SecurityCog(commands.Cog):
         """Scan rapide d'un réseau local"""
         
         # Rate limiting strict pour cette commande
-        if self.is_rate_limited(interaction.user.id):
+        settings = await self.bot.guild_config.get_all(interaction.guild_id)
+        if self.is_rate_limited(interaction.user.id, settings['security.max_requests_per_minute']):
             await interaction.response.send_message(
                 "⚠️ **Rate Limit Atteint**\nCette commande est limitée.",
                 ephemeral=True
@@ -578,12 +589,13 @@ class SecurityCog(commands.Cog):
         active_limits = len([uid for uid, times in self.rate_limits.items() if len(times) > 0])
         security_checks.append(f"📊 Rate limiting: {active_limits} utilisateurs surveillés")
         
-        # Configuration de sécurité
+        # Configuration de sécurité (réglages de ce serveur)
+        settings = await self.bot.guild_config.get_all(interaction.guild_id)
         embed.add_field(
             name="🔧 Configuration",
             value=(
-                f"**Max requêtes/min:** {self.security_config['max_requests_per_minute']}\n"
-                f"**Timeout tests:** {self.security_config['test_timeout']}s\n"
+                f"**Max requêtes/min:** {settings['security.max_requests_per_minute']}\n"
+                f"**Timeout tests:** {settings['security.test_timeout']}s\n"
                 f"**Réseaux autorisés:** {len(self.security_config['allowed_ip_ranges'])}"
             ),
             inline=True
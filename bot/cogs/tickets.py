@@ -1,13 +1,51 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import asyncio
+import io
 import json
 import aiofiles
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
+import time
 import os
-from typing import Optional, Union
+from typing import Dict, Optional, Union
+
+from bot.utils.journal import TicketJournal
+from bot.utils.transcript_index import TranscriptIndex
+from bot.utils.transcript_archive import TranscriptArchive
+from bot.utils.timer_wheel import TimerWheel
+from bot.utils.verification_queue import VerificationQueue
+from bot.utils.ticket_categories import TicketCategoryPool
+from bot.utils.admission import AdmissionQueue
+from bot.utils.photo_store import IdentityPhotoStore, PhotoTooLarge
+from bot.utils.rest_scheduler import Priority
+from bot.utils import ticket_store
+
+# Rôles du staff autorisés à traiter les tickets
+STAFF_ROLES = ["🏛️ Gardien Suprême", "⚖️ Magistrat", "🛡️ Sentinel"]
+
+def is_staff(member) -> bool:
+    """Vérifie qu'un membre possède un rôle du staff"""
+    return isinstance(member, discord.Member) and any(role.name in STAFF_ROLES for role in member.roles)
+
+def format_duration(seconds) -> str:
+    """Durée lisible (« 2h05 », « 14 min », « 30 s »)"""
+    if seconds is None:
+        return "—"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}"
+    if seconds >= 60:
+        return f"{seconds // 60} min"
+    return f"{seconds} s"
+
+def utc_timestamp(value: str) -> float:
+    """Horodatage d'une date ISO ; une date sans fuseau (datetime.utcnow() des anciens tickets) est en UTC"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
 
 class TicketSystem(commands.Cog):
     """Système complet de tickets et vérification d'identité pour Themis-Bot"""
@@ -16,7 +54,43 @@ class TicketSystem(commands.Cog):
         self.bot = bot
         self.tickets_dir = "data/tickets/"
         self.tickets_data = {}
+        # Index canal -> utilisateur des tickets actifs (recherche en O(1))
+        self.channel_index: Dict[int, str] = {}
+        # Index ID de ticket -> utilisateur (résolution des boutons persistants)
+        self.ticket_index: Dict[str, str] = {}
         self._ensure_directories()
+        self.journal = TicketJournal(os.path.join(self.tickets_dir, "journals/"))
+        self.transcript_index = TranscriptIndex(bot.db)
+        self.archive = TranscriptArchive(self.tickets_dir)
+        self._background_tasks = set()
+        # Échéances d'inactivité des tickets (ID ticket -> prochaine action)
+        self.stale_wheel = TimerWheel(tick_seconds=bot.config.get('tickets.stale_sweep_seconds', 60))
+        self._activity_dirty = False
+        self.verification_queue = VerificationQueue()
+        # Contrôle d'admission : créations de canaux en file par serveur, au rythme du budget
+        # de la route de création annoncé par Discord
+        self.admission = AdmissionQueue(
+            maxsize=bot.config.get('tickets.creation_queue_size', 100),
+            pace=lambda guild_id: bot.ratelimits.wait_time("POST", f"/guilds/{guild_id}/channels")
+        )
+        # Utilisateurs dont le ticket est en cours de création
+        self._opening = set()
+        # Sauvegardes sérialisées (mode cluster : lecture-fusion-écriture du fichier commun)
+        self._save_lock = asyncio.Lock()
+        # Modèles de permissions des canaux de tickets, par serveur
+        self._overwrite_templates: Dict[int, dict] = {}
+        # Photos d'identité conservées le temps de la vérification
+        self.photos = IdentityPhotoStore(
+            "data/identity_photos/",
+            max_bytes=bot.config.get('tickets.photo_max_mb', 10) * 1024 * 1024,
+            key=bot.config.get('tickets.photo_encryption_key')
+        )
+        # Catégorie principale + débordements (50 canaux maximum par catégorie)
+        self.categories = TicketCategoryPool(
+            bot,
+            capacity=bot.config.get('tickets.category_capacity', 50),
+            cleanup_delay=bot.config.get('tickets.overflow_cleanup_minutes', 10) * 60
+        )
         
     def _ensure_directories(self):
         """Créer les dossiers nécessaires"""
@@ -25,7 +99,295 @@ class TicketSystem(commands.Cog):
         
     async def cog_load(self):
         """Charger les données des tickets au démarrage"""
-        await self.load_tickets_data()
+        # Sources indépendantes : lues en parallèle
+        await asyncio.gather(
+            self.load_tickets_data(),
+            self.transcript_index.setup(),
+            asyncio.to_thread(self.archive.load)
+        )
+        self._spawn(self._backfill_transcripts())
+        self._spawn(self._purge_orphan_photos())
+        self._spawn(self._upgrade_legacy_views())
+        self.bot.scheduler.register("ticket.close", self._scheduled_close)
+        self.categories.start()
+
+        interval = self.bot.config.get('tickets.compaction_interval_hours', 24)
+        self.compact_transcripts.change_interval(hours=interval)
+        self.compact_transcripts.start()
+
+        self._schedule_all_stale()
+        self.sweep_stale_tickets.change_interval(seconds=self.stale_wheel.tick_seconds)
+        self.sweep_stale_tickets.start()
+
+    async def cog_unload(self):
+        """Arrêter les tâches périodiques"""
+        self.compact_transcripts.cancel()
+        self.sweep_stale_tickets.cancel()
+        self.bot.scheduler.unregister("ticket.close")
+        self.categories.stop()
+        self.admission.close()
+        await self.photos.close()
+
+    async def schedule_close(self, channel, closer, reason, delay):
+        """Planifie la fermeture d'un ticket (persistée, survit à un redémarrage)"""
+        await self.bot.scheduler.schedule(
+            "ticket.close",
+            delay=delay,
+            payload={"channel_id": channel.id, "closer_id": closer.id, "reason": reason},
+            key=f"ticket.close:{channel.id}",
+            guild_id=channel.guild.id
+        )
+
+    async def _scheduled_close(self, payload):
+        """Tâche planifiée : fermeture d'un ticket"""
+        channel = self.bot.get_channel(payload["channel_id"])
+        if channel is None:
+            # Canal déjà supprimé : le journal a été finalisé par on_guild_channel_delete
+            return
+        closer = channel.guild.get_member(payload["closer_id"]) or self.bot.user
+        await self.close_ticket_internal(channel, closer, payload["reason"])
+
+    @tasks.loop(hours=24)
+    async def compact_transcripts(self):
+        """Compacte périodiquement les vieux transcripts dans des segments d'archive"""
+        if not self.bot.owns_guild(None):
+            # Mode cluster : l'archive est commune, un seul processus la réécrit
+            return
+        days = self.bot.config.get('tickets.archive_after_days', 30)
+        try:
+            await asyncio.to_thread(self.archive.compact, days)
+        except Exception as e:
+            print(f"Erreur compaction transcripts: {e}")
+
+    @compact_transcripts.before_loop
+    async def before_compact_transcripts(self):
+        # Laisser l'indexation initiale passer avant de déplacer des fichiers
+        await self.bot.wait_until_ready()
+
+    @staticmethod
+    def _last_activity(ticket_info):
+        """Horodatage de la dernière activité (date de création pour les anciens tickets)"""
+        if "last_activity" in ticket_info:
+            return ticket_info["last_activity"]
+        try:
+            return utc_timestamp(ticket_info["created_at"])
+        except (KeyError, ValueError):
+            return time.time()
+
+    def _schedule_stale(self, ticket_info):
+        """Planifie la prochaine étape d'inactivité d'un ticket : avertissement ou fermeture"""
+        stage = 'tickets.stale_close_hours' if ticket_info.get("stale_warned") else 'tickets.stale_warn_hours'
+        hours = self.bot.config.get(stage, 48 if ticket_info.get("stale_warned") else 24)
+        self.stale_wheel.schedule(ticket_info["ticket_id"], self._last_activity(ticket_info) + hours * 3600)
+
+    def _schedule_all_stale(self):
+        """Reconstruit la roue d'inactivité à partir des tickets actifs"""
+        for ticket_info in self.tickets_data.get("active_tickets", {}).values():
+            self._schedule_stale(ticket_info)
+
+    def _touch_ticket(self, ticket_info):
+        """Enregistre une activité sur un ticket et repousse son échéance"""
+        ticket_info["last_activity"] = time.time()
+        ticket_info.pop("stale_warned", None)
+        self._schedule_stale(ticket_info)
+        # Sauvegarde différée au prochain passage du balayeur
+        self._activity_dirty = True
+
+    @tasks.loop(seconds=60)
+    async def sweep_stale_tickets(self):
+        """Traite uniquement les tickets dont l'échéance d'inactivité est atteinte"""
+        expired = self.stale_wheel.advance()
+        if expired:
+            # Lots bornés pour ne pas saturer l'API quand beaucoup de tickets expirent ensemble
+            batch_size = self.bot.config.get('tickets.stale_batch_size', 5)
+            for start in range(0, len(expired), batch_size):
+                await asyncio.gather(
+                    *(self._handle_stale(ticket_id) for ticket_id in expired[start:start + batch_size])
+                )
+
+        if self._activity_dirty:
+            self._activity_dirty = False
+            await self.save_tickets_data()
+
+    @sweep_stale_tickets.before_loop
+    async def before_sweep_stale_tickets(self):
+        await self.bot.wait_until_ready()
+
+    async def _handle_stale(self, ticket_id):
+        """Avertit puis ferme un ticket inactif"""
+        found = self.ticket_by_id(ticket_id)
+        if not found:
+            return
+        user_id, ticket_info = found
+        channel = self.bot.get_channel(ticket_info["channel_id"])
+        if channel is None:
+            return
+
+        try:
+            if not ticket_info.get("stale_warned"):
+                close_hours = self.bot.config.get('tickets.stale_close_hours', 48)
+                warn_embed = discord.Embed(
+                    title="⏰ Ticket inactif",
+                    description=(
+                        f"Ce ticket n'a reçu aucun message depuis un moment.\n"
+                        f"Sans nouvelle activité, il sera **fermé automatiquement** "
+                        f"<t:{int(self._last_activity(ticket_info) + close_hours * 3600)}:R>."
+                    ),
+                    color=0xF39C12,
+                    timestamp=datetime.utcnow()
+                )
+                await self._send(channel, Priority.RESPONSE, content=f"<@{user_id}>", embed=warn_embed)
+                ticket_info["stale_warned"] = True
+                self._schedule_stale(ticket_info)
+                self._activity_dirty = True
+            else:
+                await self.close_ticket_internal(channel, self.bot.user, "Fermeture automatique pour inactivité")
+        except Exception as e:
+            print(f"Erreur traitement ticket inactif {ticket_id}: {e}")
+
+    async def _send(self, channel, priority, **kwargs):
+        """Envoi via la file REST du bot : les logs passent après la modération et les réponses"""
+        return await self.bot.rest.call(
+            priority, "POST", f"/channels/{channel.id}/messages",
+            lambda: channel.send(**kwargs), channel.guild.id
+        )
+
+    def _spawn(self, coro):
+        """Lancer une tâche de fond en gardant une référence jusqu'à sa fin"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _backfill_transcripts(self):
+        """Indexation unique des transcripts produits avant l'index plein texte"""
+        try:
+            if await self.bot.db.get_meta("transcripts_backfilled"):
+                return
+            await self.transcript_index.backfill(self.tickets_dir)
+            await self.bot.db.set_meta("transcripts_backfilled", datetime.utcnow().isoformat())
+        except Exception as e:
+            print(f"Erreur indexation transcripts: {e}")
+
+    async def _upgrade_legacy_views(self):
+        """
+        Remplace une fois les boutons des tickets ouverts avant les boutons persistants :
+        leur custom_id aléatoire ne correspond à aucun TicketButton après un redémarrage
+        """
+        await self.bot.wait_until_ready()
+        upgraded = False
+        for ticket_info in list(self.tickets_data.get("active_tickets", {}).values()):
+            if ticket_info.get("persistent_buttons") or not ticket_info.get("welcome_message_id"):
+                continue
+            if not self._owns_ticket(ticket_info):
+                continue
+            channel = self.bot.get_channel(ticket_info["channel_id"])
+            if channel is None:
+                continue
+
+            message = channel.get_partial_message(ticket_info["welcome_message_id"])
+            view = TicketView(ticket_info["ticket_id"])
+            try:
+                await self.bot.rest.call(
+                    Priority.BULK, "PATCH", f"/channels/{channel.id}/messages/{message.id}",
+                    lambda: message.edit(view=view), channel.guild.id
+                )
+            except discord.NotFound:
+                # Message d'accueil supprimé : rien à remplacer
+                pass
+            except discord.HTTPException as e:
+                print(f"Erreur mise à jour boutons ticket {ticket_info['ticket_id']}: {e}")
+                continue
+            ticket_info["persistent_buttons"] = True
+            upgraded = True
+
+        if upgraded:
+            await self.save_tickets_data()
+
+    async def _purge_orphan_photos(self):
+        """Supprimer les photos de tickets fermés pendant que le bot était arrêté"""
+        try:
+            active = [info["ticket_id"] for info in self.tickets_data.get("active_tickets", {}).values()]
+            await self.photos.purge_except(active)
+        except Exception as e:
+            print(f"Erreur purge photos: {e}")
+
+    async def _store_photo(self, ticket_info, message, attachment):
+        """Conserver une photo d'identité postée dans un ticket"""
+        try:
+            stored = await self.photos.save(ticket_info["ticket_id"], attachment.url, attachment.size)
+        except PhotoTooLarge:
+            await message.channel.send(
+                f"❌ {message.author.mention} Le fichier `{attachment.filename}` est trop volumineux "
+                f"(maximum {self.photos.max_bytes // (1024 * 1024)} Mo)."
+            )
+            return
+        except Exception as e:
+            print(f"Erreur sauvegarde photo {attachment.filename}: {e}")
+            return
+
+        if not stored["duplicate"]:
+            ticket_info.setdefault("photos", []).append({
+                "sha256": stored["sha256"],
+                "filename": attachment.filename,
+                "size": stored["size"]
+            })
+            self._activity_dirty = True
+
+    def _photo_batches(self, ticket_info, size_limit):
+        """
+        Photos conservées d'un ticket, groupées en messages de 10 pièces jointes au plus
+        dont la taille cumulée reste sous la limite d'envoi du serveur
+        Retourne (lots de (chemin, photo), noms des photos trop volumineuses pour être envoyées)
+        """
+        batches, current, current_size, too_large = [], [], 0, []
+        for photo in ticket_info.get("photos", []):
+            path = self.photos.path_for(ticket_info["ticket_id"], photo["sha256"])
+            if path is None:
+                continue
+            if photo["size"] > size_limit:
+                too_large.append(photo["filename"])
+                continue
+            if len(current) == 10 or current_size + photo["size"] > size_limit:
+                batches.append(current)
+                current, current_size = [], 0
+            current.append((path, photo))
+            current_size += photo["size"]
+        if current:
+            batches.append(current)
+        return batches, too_large
+
+    async def _send_photos(self, interaction, ticket_info):
+        """Envoie au modérateur les photos d'identité conservées, lues au fil de l'envoi"""
+        batches, too_large = self._photo_batches(ticket_info, interaction.guild.filesize_limit)
+        for batch in batches:
+            streams, files = [], []
+            try:
+                for path, photo in batch:
+                    streams.append(self.photos.open(path))
+                    files.append(discord.File(streams[-1], filename=photo["filename"]))
+                await interaction.followup.send(files=files, ephemeral=True)
+            except Exception as e:
+                print(f"Erreur envoi photos du ticket {ticket_info['ticket_id']}: {e}")
+            finally:
+                # discord.File ne ferme pas un flux qu'il n'a pas ouvert lui-même
+                for file in files:
+                    file.close()
+                for stream in streams:
+                    stream.close()
+        if too_large:
+            await interaction.followup.send(
+                f"⚠️ Trop volumineuse(s) pour être renvoyée(s) ici, à consulter dans le canal du ticket : "
+                f"{', '.join(too_large)}",
+                ephemeral=True
+            )
+
+    async def _index_transcript(self, transcript_path):
+        """Indexer un transcript fraîchement produit"""
+        try:
+            await self.transcript_index.index_file(transcript_path)
+        except Exception as e:
+            print(f"Erreur indexation transcript {transcript_path}: {e}")
         
     async def load_tickets_data(self):
         """Charger les données des tickets depuis le fichier"""
@@ -36,15 +398,108 @@ class TicketSystem(commands.Cog):
         except FileNotFoundError:
             self.tickets_data = {"active_tickets": {}, "verification_queue": {}}
             await self.save_tickets_data()
+        self._rebuild_indexes()
+        self.verification_queue.load(self.tickets_data.setdefault("verification_queue", {}))
+
+    def _rebuild_indexes(self):
+        """Reconstruire les index en mémoire à partir des tickets actifs"""
+        active = self.tickets_data.get("active_tickets", {})
+        self.channel_index = {ticket_info["channel_id"]: uid for uid, ticket_info in active.items()}
+        self.ticket_index = {ticket_info["ticket_id"]: uid for uid, ticket_info in active.items()}
+
+    def _ticket_for_channel(self, channel_id):
+        """Retourne (user_id, infos du ticket) pour un canal de ticket, sinon None"""
+        user_id = self.channel_index.get(channel_id)
+        if user_id is None:
+            return None
+        ticket_info = self.tickets_data.get("active_tickets", {}).get(user_id)
+        if ticket_info is None:
+            return None
+        return user_id, ticket_info
+
+    def ticket_by_id(self, ticket_id):
+        """Retourne (user_id, infos du ticket) à partir de l'ID du ticket, sinon None"""
+        user_id = self.ticket_index.get(ticket_id)
+        if user_id is None:
+            return None
+        ticket_info = self.tickets_data.get("active_tickets", {}).get(user_id)
+        if ticket_info is None:
+            return None
+        return user_id, ticket_info
             
+    async def enqueue_verification(self, user_id, ticket_info):
+        """Place un ticket dans la file de vérification. Retourne sa position (1 = prochain)"""
+        ticket_id = ticket_info["ticket_id"]
+        if self.verification_queue.push(ticket_id, user_id, ticket_info["channel_id"]):
+            ticket_info["status"] = "photo_envoyee"
+            await self.save_tickets_data()
+        pending = self.verification_queue.peek(len(self.verification_queue))
+        for position, entry in enumerate(pending, start=1):
+            if entry["ticket_id"] == ticket_id:
+                return position
+        return None
+
     async def save_tickets_data(self):
         """Sauvegarder les données des tickets"""
         try:
+            if self.bot.cluster is not None:
+                async with self._save_lock:
+                    await self._save_shared_tickets_data()
+                return
             async with aiofiles.open("data/tickets_data.json", "w", encoding="utf-8") as f:
                 await f.write(json.dumps(self.tickets_data, indent=2, ensure_ascii=False))
         except Exception as e:
             print(f"Erreur sauvegarde tickets: {e}")
 
+    def _owns_ticket(self, ticket_info):
+        """Le ticket appartient-il à un serveur géré par ce processus ?"""
+        if ticket_info.get("guild_id") is None:
+            # Ticket antérieur au mode cluster : rattaché à son serveur dès que son canal est visible
+            channel = self.bot.get_channel(ticket_info["channel_id"])
+            if channel is not None:
+                ticket_info["guild_id"] = channel.guild.id
+        return self.bot.owns_guild(ticket_info.get("guild_id"))
+
+    async def _save_shared_tickets_data(self):
+        """Mode cluster : fusion avec le fichier commun, puis reprise des tickets des autres processus"""
+        path = "data/tickets_data.json"
+        # Appartenance décidée ici (cache du bot) ; le thread ne fait que lire, fusionner et écrire
+        memory = {
+            **self.tickets_data,
+            "active_tickets": {
+                uid: info for uid, info in self.tickets_data.get("active_tickets", {}).items()
+                if self._owns_ticket(info)
+            },
+            "verification_queue": dict(self.tickets_data.get("verification_queue", {}))
+        }
+        payload = json.loads(json.dumps(memory))
+
+        def merge_and_write():
+            with ticket_store.locked(path):
+                disk = ticket_store.read(path) or {}
+                merged = ticket_store.merge(disk, payload, lambda info: self.bot.owns_guild(info.get("guild_id")))
+                ticket_store.write(path, merged)
+                return merged
+
+        merged = await asyncio.to_thread(merge_and_write)
+
+        # Tickets des autres processus : la vue locale suit le fichier (ouverture en double, /ticket-queue)
+        active = self.tickets_data.setdefault("active_tickets", {})
+        for uid in [uid for uid, info in active.items() if not self._owns_ticket(info)]:
+            del active[uid]
+        for uid, info in merged["active_tickets"].items():
+            if uid not in active:
+                active[uid] = info
+        owned_ids = {info["ticket_id"] for info in active.values() if self._owns_ticket(info)}
+        queue = self.tickets_data.setdefault("verification_queue", {})
+        for ticket_id in [ticket_id for ticket_id in queue if ticket_id not in owned_ids]:
+            del queue[ticket_id]
+        queue.update({
+            ticket_id: entry for ticket_id, entry in merged["verification_queue"].items() if ticket_id not in owned_ids
+        })
+        self._rebuild_indexes()
+        self.verification_queue.load(queue)
+
     @app_commands.command(name="ticket", description="🎫 Créer un ticket de vérification d'identité")
     @app_commands.describe(
         raison="Motif de votre demande de vérification",
@@ -62,17 +517,8 @@ class TicketSystem(commands.Cog):
             await interaction.response.send_message("❌ Erreur de type d'utilisateur !", ephemeral=True)
             return
         
-        # Vérifier si l'utilisateur a déjà un ticket actif
-        user_id = str(interaction.user.id)
-        if user_id in self.tickets_data.get("active_tickets", {}):
-            await interaction.response.send_message(
-                "❌ Vous avez déjà un ticket actif ! Fermez-le avant d'en créer un nouveau.",
-                ephemeral=True
-            )
-            return
-            
         # Vérifier si l'utilisateur est déjà vérifié
-        citoyen_role = discord.utils.get(interaction.guild.roles, name="🎭 Citoyen")
+        citoyen_role = self.bot.guild_index.role(interaction.guild, "🎭 Citoyen")
         if citoyen_role and citoyen_role in interaction.user.roles:
             await interaction.response.send_message(
                 "✅ Vous êtes déjà vérifié en tant que citoyen !",
@@ -88,139 +534,208 @@ class TicketSystem(commands.Cog):
             )
             return
             
-        await interaction.response.defer(ephemeral=True)
+        # Vérifier si l'utilisateur a déjà un ticket actif
+        user_id = str(interaction.user.id)
+        if user_id in self.tickets_data.get("active_tickets", {}) or user_id in self._opening:
+            await interaction.response.send_message(
+                "❌ Vous avez déjà un ticket actif ! Fermez-le avant d'en créer un nouveau.",
+                ephemeral=True
+            )
+            return
         
+        # Réservation avant le premier await : une seconde demande concurrente du même utilisateur est refusée
+        self._opening.add(user_id)
         try:
+            await interaction.response.defer(ephemeral=True)
+            
             # Générer un ID unique pour le ticket
             ticket_id = str(uuid.uuid4())[:8]
             
-            # Créer le canal de ticket
-            guild = interaction.guild
-            
-            # Permissions pour le canal de ticket
-            overwrites = {
-                guild.default_role: discord.PermissionOverwrite(view_channel=False),
-                interaction.user: discord.PermissionOverwrite(
-                    view_channel=True, send_messages=True, attach_files=True,
-                    read_message_history=True
-                ),
-                self.bot.user: discord.PermissionOverwrite(
-                    view_channel=True, send_messages=True, manage_messages=True
+            # Seule la création du canal passe par la file : c'est elle qui est limitée par Discord
+            try:
+                position, pending = self.admission.submit(
+                    interaction.guild.id,
+                    lambda: self._create_ticket_channel(interaction.guild, interaction.user, ticket_id)
                 )
-            }
-            
-            # Ajouter les permissions pour les modérateurs
-            for role_name in ["🏛️ Gardien Suprême", "⚖️ Magistrat", "🛡️ Sentinel"]:
-                role = discord.utils.get(guild.roles, name=role_name)
-                if role:
-                    overwrites[role] = discord.PermissionOverwrite(
-                        view_channel=True, send_messages=True, manage_messages=True
-                    )
-            
-            # Trouver ou créer la catégorie tickets
-            category = discord.utils.get(guild.categories, name="🎫 TICKETS")
-            if not category:
-                category = await guild.create_category(
-                    "🎫 TICKETS",
-                    overwrites={
-                        guild.default_role: discord.PermissionOverwrite(view_channel=False)
-                    }
+            except asyncio.QueueFull:
+                await interaction.followup.send(
+                    "🚦 Trop de demandes de tickets en ce moment. Réessayez dans quelques minutes.",
+                    ephemeral=True
                 )
+                return
             
-            # Créer le canal
-            channel = await guild.create_text_channel(
-                f"ticket-{interaction.user.name}-{ticket_id}",
-                category=category,
-                overwrites=overwrites,
-                topic=f"Ticket de vérification pour {interaction.user.display_name}"
-            )
-            
-            # Créer l'embed d'accueil du ticket
-            welcome_embed = discord.Embed(
-                title="🎫 Nouveau Ticket de Vérification",
-                description=f"**Bienvenue {interaction.user.mention} !**\n\nVotre ticket a été créé avec succès.",
-                color=0x3498DB,
-                timestamp=datetime.utcnow()
-            )
-            
-            welcome_embed.add_field(
-                name="📋 Informations du ticket",
-                value=f"**ID:** `{ticket_id}`\n**Motif:** {raison}\n**Âge déclaré:** {age if age else 'Non précisé'}",
-                inline=False
-            )
-            
-            welcome_embed.add_field(
-                name="📸 Processus de vérification",
-                value=(
-                    "**Étapes à suivre :**\n"
-                    "1️⃣ Envoyez une photo de votre pièce d'identité\n"
-                    "2️⃣ **IMPORTANT:** Masquez TOUT sauf votre âge/date de naissance\n"
-                    "3️⃣ Attendez la validation par un modérateur\n"
-                    "4️⃣ Recevez votre rôle 'Citoyen' une fois approuvé"
-                ),
-                inline=False
-            )
-            
-            welcome_embed.add_field(
-                name="⚠️ Règles importantes",
-                value=(
-                    "• Ne montrez QUE votre âge sur la pièce d'identité\n"
-                    "• Masquez nom, adresse, numéro, photo, etc.\n"
-                    "• Photo claire et lisible obligatoire\n"
-                    "• Respectez les modérateurs\n"
-                    "• Un seul ticket par personne"
-                ),
-                inline=False
-            )
-            
-            welcome_embed.set_footer(
-                text="Utilisez les boutons ci-dessous pour interagir avec votre ticket"
-            )
-            
-            # Créer les boutons d'interaction
-            view = TicketView(self.bot, ticket_id, user_id)
-            
-            message = await channel.send(embed=welcome_embed, view=view)
-            
-            # Enregistrer les données du ticket
-            self.tickets_data.setdefault("active_tickets", {})[user_id] = {
-                "ticket_id": ticket_id,
-                "channel_id": channel.id,
-                "user_id": interaction.user.id,
-                "created_at": datetime.utcnow().isoformat(),
-                "reason": raison,
-                "age": age,
-                "status": "en_attente",
-                "welcome_message_id": message.id
-            }
-            
-            await self.save_tickets_data()
-            
-            # Log dans le canal de logs si disponible
-            logs_channel = discord.utils.get(guild.text_channels, name="🎫-logs-tickets")
-            if logs_channel and isinstance(logs_channel, discord.TextChannel):
-                log_embed = discord.Embed(
-                    title="📝 Nouveau Ticket Créé",
-                    color=0x00FF00,
-                    timestamp=datetime.utcnow()
+            if position > 1:
+                await interaction.followup.send(
+                    f"⏳ Forte affluence : vous êtes **#{position}** dans la file de création. "
+                    "Votre ticket sera ouvert automatiquement.",
+                    ephemeral=True
                 )
-                log_embed.add_field(name="Utilisateur", value=f"{interaction.user.mention} ({interaction.user.id})", inline=True)
-                log_embed.add_field(name="Canal", value=channel.mention, inline=True)
-                log_embed.add_field(name="ID Ticket", value=f"`{ticket_id}`", inline=True)
-                log_embed.add_field(name="Motif", value=raison, inline=False)
-                
-                await logs_channel.send(embed=log_embed)
             
+            channel = await pending
+            await self._open_ticket(interaction, channel, ticket_id, raison, age)
             await interaction.followup.send(
                 f"✅ Votre ticket a été créé ! Rendez-vous dans {channel.mention}",
                 ephemeral=True
             )
             
+        except discord.Forbidden:
+            await interaction.followup.send(
+                "❌ Le bot n'a pas les permissions nécessaires pour créer votre ticket. Prévenez un administrateur.",
+                ephemeral=True
+            )
+        except discord.HTTPException as e:
+            print(f"Erreur création ticket: {e}")
+            await interaction.followup.send(
+                "❌ Discord est momentanément surchargé. Réessayez dans quelques instants.",
+                ephemeral=True
+            )
         except Exception as e:
+            print(f"Erreur création ticket: {e}")
             await interaction.followup.send(
-                f"❌ Erreur lors de la création du ticket : {str(e)}",
+                "❌ Une erreur inattendue est survenue lors de la création du ticket. Réessayez plus tard.",
                 ephemeral=True
             )
+        finally:
+            self._opening.discard(user_id)
+
+    def _ticket_overwrites(self, guild, member):
+        """Permissions d'un canal de ticket : modèle précalculé par serveur + le demandeur"""
+        template = self._overwrite_templates.get(guild.id)
+        if template is None:
+            template = {
+                guild.default_role: discord.PermissionOverwrite(view_channel=False),
+                guild.me or self.bot.user: discord.PermissionOverwrite(
+                    view_channel=True, send_messages=True, manage_messages=True
+                )
+            }
+            # Ajouter les permissions pour les modérateurs
+            for role in self.bot.guild_index.roles(guild, STAFF_ROLES):
+                template[role] = discord.PermissionOverwrite(
+                    view_channel=True, send_messages=True, manage_messages=True
+                )
+            self._overwrite_templates[guild.id] = template
+        
+        overwrites = dict(template)
+        overwrites[member] = discord.PermissionOverwrite(
+            view_channel=True, send_messages=True, attach_files=True,
+            read_message_history=True
+        )
+        return overwrites
+
+    async def _create_ticket_channel(self, guild, member, ticket_id):
+        """Crée le canal d'un ticket (exécuté par la file d'admission du serveur)"""
+        # Permissions pour le canal de ticket
+        overwrites = self._ticket_overwrites(guild, member)
+        
+        # Réserver une place dans une catégorie tickets (débordement si elle est pleine)
+        category = await self.categories.acquire(guild)
+        
+        # Créer le canal (budget de la route suivi par l'ordonnanceur REST)
+        try:
+            return await self.bot.rest.call(
+                Priority.RESPONSE, "POST", f"/guilds/{guild.id}/channels",
+                lambda: guild.create_text_channel(
+                    f"ticket-{member.name}-{ticket_id}",
+                    category=category,
+                    overwrites=overwrites,
+                    topic=f"Ticket de vérification pour {member.display_name}"
+                ),
+                guild_id=guild.id
+            )
+        except Exception:
+            self.categories.cancel(category.id, guild)
+            raise
+
+    async def _open_ticket(self, interaction: discord.Interaction, channel, ticket_id, raison, age):
+        """Enregistre le ticket et publie son message d'accueil"""
+        guild = interaction.guild
+        user_id = str(interaction.user.id)
+        
+        # Créer l'embed d'accueil du ticket
+        welcome_embed = discord.Embed(
+            title="🎫 Nouveau Ticket de Vérification",
+            description=f"**Bienvenue {interaction.user.mention} !**\n\nVotre ticket a été créé avec succès.",
+            color=0x3498DB,
+            timestamp=datetime.utcnow()
+        )
+        
+        welcome_embed.add_field(
+            name="📋 Informations du ticket",
+            value=f"**ID:** `{ticket_id}`\n**Motif:** {raison}\n**Âge déclaré:** {age if age else 'Non précisé'}",
+            inline=False
+        )
+        
+        welcome_embed.add_field(
+            name="📸 Processus de vérification",
+            value=(
+                "**Étapes à suivre :**\n"
+                "1️⃣ Envoyez une photo de votre pièce d'identité\n"
+                "2️⃣ **IMPORTANT:** Masquez TOUT sauf votre âge/date de naissance\n"
+                "3️⃣ Attendez la validation par un modérateur\n"
+                "4️⃣ Recevez votre rôle 'Citoyen' une fois approuvé"
+            ),
+            inline=False
+        )
+        
+        welcome_embed.add_field(
+            name="⚠️ Règles importantes",
+            value=(
+                "• Ne montrez QUE votre âge sur la pièce d'identité\n"
+                "• Masquez nom, adresse, numéro, photo, etc.\n"
+                "• Photo claire et lisible obligatoire\n"
+                "• Respectez les modérateurs\n"
+                "• Un seul ticket par personne"
+            ),
+            inline=False
+        )
+        
+        welcome_embed.set_footer(
+            text="Utilisez les boutons ci-dessous pour interagir avec votre ticket"
+        )
+        
+        # Enregistrer les données du ticket avant le premier message
+        # pour que le journal capture aussi le message d'accueil
+        ticket_info = {
+            "ticket_id": ticket_id,
+            "channel_id": channel.id,
+            "guild_id": channel.guild.id,
+            "user_id": interaction.user.id,
+            "created_at": datetime.utcnow().isoformat(),
+            "reason": raison,
+            "age": age,
+            "status": "en_attente",
+            "welcome_message_id": None,
+            "persistent_buttons": True,
+            "last_activity": time.time()
+        }
+        self.tickets_data.setdefault("active_tickets", {})[user_id] = ticket_info
+        self.channel_index[channel.id] = user_id
+        self.ticket_index[ticket_id] = user_id
+        self._schedule_stale(ticket_info)
+        await self.journal.open(ticket_id, channel.name, user_id)
+
+        # Créer les boutons d'interaction
+        view = TicketView(ticket_id)
+
+        message = await channel.send(embed=welcome_embed, view=view)
+        ticket_info["welcome_message_id"] = message.id
+
+        await self.save_tickets_data()
+        
+        # Log dans le canal de logs si disponible
+        logs_channel = self.bot.guild_index.text_channel(guild, "🎫-logs-tickets")
+        if logs_channel:
+            log_embed = discord.Embed(
+                title="📝 Nouveau Ticket Créé",
+                color=0x00FF00,
+                timestamp=datetime.utcnow()
+            )
+            log_embed.add_field(name="Utilisateur", value=f"{interaction.user.mention} ({interaction.user.id})", inline=True)
+            log_embed.add_field(name="Canal", value=channel.mention, inline=True)
+            log_embed.add_field(name="ID Ticket", value=f"`{ticket_id}`", inline=True)
+            log_embed.add_field(name="Motif", value=raison, inline=False)
+            
+            await self._send(logs_channel, Priority.LOGGING, embed=log_embed)
 
     @app_commands.command(name="verify-identity", description="🔍 Valider l'identité d'un utilisateur (Staff uniquement)")
     @app_commands.describe(
@@ -240,8 +755,7 @@ class TicketSystem(commands.Cog):
             return
         
         # Vérifier les permissions
-        required_roles = ["🏛️ Gardien Suprême", "⚖️ Magistrat", "🛡️ Sentinel"]
-        if not any(role.name in required_roles for role in interaction.user.roles):
+        if not is_staff(interaction.user):
             await interaction.response.send_message(
                 "❌ Vous n'avez pas les permissions pour effectuer cette action !",
                 ephemeral=True
@@ -262,115 +776,435 @@ class TicketSystem(commands.Cog):
         
         try:
             ticket_info = self.tickets_data["active_tickets"][user_id]
+            await self._process_verification(interaction.guild, interaction.user, user, ticket_info, approved)
             
-            if approved:
-                # Approuver la vérification
-                citoyen_role = discord.utils.get(interaction.guild.roles, name="🎭 Citoyen")
-                en_attente_role = discord.utils.get(interaction.guild.roles, name="🎫 En Attente")
-                
-                if citoyen_role:
-                    await user.add_roles(citoyen_role, reason=f"Vérification approuvée par {interaction.user}")
-                    
-                if en_attente_role and en_attente_role in user.roles:
-                    await user.remove_roles(en_attente_role, reason="Vérification réussie")
-                
-                # Envoyer un message de confirmation dans le ticket
-                channel = self.bot.get_channel(ticket_info["channel_id"])
-                if channel:
-                    success_embed = discord.Embed(
-                        title="✅ Vérification Approuvée !",
-                        description=f"Félicitations {user.mention} ! Votre identité a été vérifiée avec succès.",
-                        color=0x00FF00,
-                        timestamp=datetime.utcnow()
-                    )
-                    success_embed.add_field(
-                        name="🎭 Nouveau statut",
-                        value="Vous êtes maintenant un **Citoyen** vérifié !\nVous avez accès à tous les canaux du serveur.",
-                        inline=False
-                    )
-                    success_embed.add_field(
-                        name="📋 Prochaines étapes",
-                        value="• Lisez les règles dans <#rules-channel>\n• Présentez-vous si vous le souhaitez\n• Profitez de votre séjour !",
-                        inline=False
-                    )
-                    success_embed.set_footer(text=f"Vérifié par {interaction.user.display_name}")
-                    
-                    await channel.send(embed=success_embed)
-                    await asyncio.sleep(10)  # Laisser le temps de lire
-                    
-                    # Fermer le ticket automatiquement après approbation
-                    await self.close_ticket_internal(channel, interaction.user, "Vérification réussie - fermeture automatique")
+            # Log de l'action
+            logs_channel = self.bot.guild_index.text_channel(interaction.guild, "🎫-logs-tickets")
+            if logs_channel:
+                log_embed = discord.Embed(
+                    title="🔍 Vérification Traitée",
+                    color=0x00FF00 if approved else 0xFF0000,
+                    timestamp=datetime.utcnow()
+                )
+                log_embed.add_field(name="Utilisateur", value=f"{user.mention} ({user.id})", inline=True)
+                log_embed.add_field(name="Modérateur", value=f"{interaction.user.mention}", inline=True)
+                log_embed.add_field(name="Résultat", value="✅ Approuvé" if approved else "❌ Rejeté", inline=True)
+                log_embed.add_field(name="Ticket ID", value=f"`{ticket_info['ticket_id']}`", inline=False)
                 
+                await self._send(logs_channel, Priority.LOGGING, embed=log_embed)
+            
+            if approved:
                 result_msg = f"✅ Vérification de {user.mention} **approuvée** avec succès !"
-                
             else:
-                # Rejeter la vérification
-                channel = self.bot.get_channel(ticket_info["channel_id"])
-                if channel:
-                    reject_embed = discord.Embed(
-                        title="❌ Vérification Rejetée",
-                        description=f"Désolé {user.mention}, votre vérification a été rejetée.",
-                        color=0xFF0000,
-                        timestamp=datetime.utcnow()
-                    )
-                    reject_embed.add_field(
-                        name="🔄 Que faire maintenant ?",
-                        value=(
-                            "• Vérifiez que votre photo est claire\n"
-                            "• Assurez-vous que seul votre âge est visible\n"
-                            "• Contactez un modérateur pour plus d'informations\n"
-                            "• Vous pouvez soumettre une nouvelle photo"
-                        ),
-                        inline=False
-                    )
-                    reject_embed.set_footer(text=f"Rejeté par {interaction.user.display_name}")
-                    
-                    await channel.send(embed=reject_embed)
-                
                 result_msg = f"❌ Vérification de {user.mention} **rejetée**."
-            
-            # Log de l'action
-            if interaction.guild:
-                logs_channel = discord.utils.get(interaction.guild.text_channels, name="🎫-logs-tickets")
-                if logs_channel and isinstance(logs_channel, discord.TextChannel):
-                    log_embed = discord.Embed(
-                        title="🔍 Vérification Traitée",
-                        color=0x00FF00 if approved else 0xFF0000,
-                        timestamp=datetime.utcnow()
-                    )
-                    log_embed.add_field(name="Utilisateur", value=f"{user.mention} ({user.id})", inline=True)
-                    log_embed.add_field(name="Modérateur", value=f"{interaction.user.mention}", inline=True)
-                    log_embed.add_field(name="Résultat", value="✅ Approuvé" if approved else "❌ Rejeté", inline=True)
-                    log_embed.add_field(name="Ticket ID", value=f"`{ticket_info['ticket_id']}`", inline=False)
-                    
-                    await logs_channel.send(embed=log_embed)
-            
             await interaction.followup.send(result_msg)
             
         except Exception as e:
             await interaction.followup.send(f"❌ Erreur lors de la vérification : {str(e)}")
 
+    async def _process_verification(self, guild, moderator, user, ticket_info, approved, save=True):
+        """Applique une décision de vérification : rôles, message dans le ticket, fermeture planifiée"""
+        channel = self.bot.get_channel(ticket_info["channel_id"])
+        
+        if approved:
+            citoyen_role = self.bot.guild_index.role(guild, "🎭 Citoyen")
+            en_attente_role = self.bot.guild_index.role(guild, "🎫 En Attente")
+            
+            # Un seul appel à l'API pour ajouter et retirer les rôles
+            roles = [role for role in user.roles if not role.is_default() and role != en_attente_role]
+            if citoyen_role and citoyen_role not in roles:
+                roles.append(citoyen_role)
+            if roles != [role for role in user.roles if not role.is_default()]:
+                await self.bot.rest.call(
+                    Priority.ENFORCEMENT, "PATCH", f"/guilds/{guild.id}/members/{user.id}",
+                    lambda: user.edit(roles=roles, reason=f"Vérification approuvée par {moderator}"), guild.id
+                )
+            
+            # Envoyer un message de confirmation dans le ticket
+            if channel:
+                success_embed = discord.Embed(
+                    title="✅ Vérification Approuvée !",
+                    description=f"Félicitations {user.mention} ! Votre identité a été vérifiée avec succès.",
+                    color=0x00FF00,
+                    timestamp=datetime.utcnow()
+                )
+                success_embed.add_field(
+                    name="🎭 Nouveau statut",
+                    value="Vous êtes maintenant un **Citoyen** vérifié !\nVous avez accès à tous les canaux du serveur.",
+                    inline=False
+                )
+                success_embed.add_field(
+                    name="📋 Prochaines étapes",
+                    value="• Lisez les règles dans <#rules-channel>\n• Présentez-vous si vous le souhaitez\n• Profitez de votre séjour !",
+                    inline=False
+                )
+                success_embed.set_footer(text=f"Vérifié par {moderator.display_name}")
+                
+                await self._send(channel, Priority.RESPONSE, embed=success_embed)
+                
+                # Fermer le ticket automatiquement après approbation (laisser le temps de lire)
+                await self.schedule_close(
+                    channel,
+                    moderator,
+                    "Vérification réussie - fermeture automatique",
+                    delay=self.bot.config.get('tickets.auto_close_delay', 10)
+                )
+            
+        else:
+            # Rejeter la vérification
+            if channel:
+                reject_embed = discord.Embed(
+                    title="❌ Vérification Rejetée",
+                    description=f"Désolé {user.mention}, votre vérification a été rejetée.",
+                    color=0xFF0000,
+                    timestamp=datetime.utcnow()
+                )
+                reject_embed.add_field(
+                    name="🔄 Que faire maintenant ?",
+                    value=(
+                        "• Vérifiez que votre photo est claire\n"
+                        "• Assurez-vous que seul votre âge est visible\n"
+                        "• Contactez un modérateur pour plus d'informations\n"
+                        "• Vous pouvez soumettre une nouvelle photo"
+                    ),
+                    inline=False
+                )
+                reject_embed.set_footer(text=f"Rejeté par {moderator.display_name}")
+                
+                await self._send(channel, Priority.RESPONSE, embed=reject_embed)
+        
+        # Décision rendue : le ticket quitte la file (une nouvelle photo le remettra en file)
+        if approved:
+            # Plus besoin du document une fois l'identité validée
+            await self.photos.purge(ticket_info["ticket_id"])
+            ticket_info.pop("photos", None)
+        
+        if self.verification_queue.remove(ticket_info["ticket_id"]) and save:
+            await self.save_tickets_data()
+
+    async def bulk_verify(self, interaction: discord.Interaction, ticket_ids, approved):
+        """
+        Traite plusieurs vérifications en parallèle (concurrence bornée)
+        La progression est affichée dans un seul embed, mis à jour au plus une fois par seconde
+        """
+        guild = interaction.guild
+        moderator = interaction.user
+        verb = "Approbation" if approved else "Rejet"
+        done, failures = [], []
+        last_update = 0.0
+
+        def progress_embed(finished=False):
+            embed = discord.Embed(
+                title=f"{'✅' if approved else '❌'} {verb} groupé{' terminé' if finished else ' en cours...'}",
+                description=f"**{len(done) + len(failures)}/{len(ticket_ids)}** tickets traités",
+                color=(0x00FF00 if approved else 0xFF0000) if finished else 0xFFA500,
+                timestamp=datetime.utcnow()
+            )
+            if done:
+                embed.add_field(name=f"Réussis ({len(done)})", value=", ".join(done)[:1024], inline=False)
+            if failures:
+                embed.add_field(name=f"Échecs ({len(failures)})", value="\n".join(failures)[:1024], inline=False)
+            return embed
+
+        async def refresh(finished=False):
+            nonlocal last_update
+            if finished or time.monotonic() - last_update >= 1:
+                last_update = time.monotonic()
+                try:
+                    await interaction.edit_original_response(embed=progress_embed(finished), view=None)
+                except discord.HTTPException:
+                    pass
+
+        semaphore = asyncio.Semaphore(self.bot.config.get('tickets.bulk_concurrency', 5))
+
+        async def process(ticket_id):
+            async with semaphore:
+                found = self.ticket_by_id(ticket_id)
+                if found is None:
+                    failures.append(f"`{ticket_id}` : ticket fermé")
+                    return
+                user_id, ticket_info = found
+                try:
+                    member = guild.get_member(int(user_id)) or await guild.fetch_member(int(user_id))
+                    await self._process_verification(guild, moderator, member, ticket_info, approved, save=False)
+                    done.append(f"<@{user_id}>")
+                except Exception as e:
+                    failures.append(f"`{ticket_id}` : {e}")
+                await refresh()
+
+        await asyncio.gather(*(process(ticket_id) for ticket_id in ticket_ids))
+        await self.save_tickets_data()
+        await refresh(finished=True)
+
+        logs_channel = self.bot.guild_index.text_channel(guild, "🎫-logs-tickets")
+        if logs_channel:
+            log_embed = discord.Embed(
+                title="🔍 Vérifications Traitées en Groupe",
+                color=0x00FF00 if approved else 0xFF0000,
+                timestamp=datetime.utcnow()
+            )
+            log_embed.add_field(name="Modérateur", value=moderator.mention, inline=True)
+            log_embed.add_field(name="Résultat", value="✅ Approuvé" if approved else "❌ Rejeté", inline=True)
+            log_embed.add_field(name="Tickets", value=f"{len(done)} traités, {len(failures)} échecs", inline=True)
+            if done:
+                log_embed.add_field(name="Utilisateurs", value=", ".join(done)[:1024], inline=False)
+            await self._send(logs_channel, Priority.LOGGING, embed=log_embed)
+
+    @app_commands.command(name="queue", description="📥 File des vérifications en attente (Staff uniquement)")
+    @app_commands.describe(
+        action="Action à effectuer sur la file",
+        nombre="Nombre de tickets à afficher (1-25)",
+        ticket_id="ID du ticket visé (prendre, libérer, prioriser)"
+    )
+    @app_commands.choices(action=[
+        app_commands.Choice(name="Voir les prochains tickets", value="voir"),
+        app_commands.Choice(name="Prendre en charge", value="prendre"),
+        app_commands.Choice(name="Traiter en groupe", value="traiter"),
+        app_commands.Choice(name="Libérer un ticket pris", value="liberer"),
+        app_commands.Choice(name="Prioriser un ticket", value="prioriser"),
+        app_commands.Choice(name="Statistiques", value="stats")
+    ])
+    @app_commands.default_permissions(manage_messages=True)
+    async def verification_queue_command(
+        self,
+        interaction: discord.Interaction,
+        action: str = "voir",
+        nombre: app_commands.Range[int, 1, 25] = 5,
+        ticket_id: Optional[str] = None
+    ):
+        """Consulter et traiter la file de vérification"""
+        if not is_staff(interaction.user):
+            await interaction.response.send_message(
+                "❌ Vous n'avez pas les permissions pour effectuer cette action !",
+                ephemeral=True
+            )
+            return
+
+        queue = self.verification_queue
+
+        if action == "voir":
+            entries = queue.peek(nombre)
+            embed = discord.Embed(
+                title="📥 File de vérification",
+                color=0x3498DB,
+                timestamp=datetime.utcnow()
+            )
+            if not entries:
+                embed.description = "✅ Aucun ticket en attente."
+            now = time.time()
+            for position, entry in enumerate(entries, start=1):
+                boost = f" • ⬆️ +{entry['priority']}" if entry.get("priority") else ""
+                embed.add_field(
+                    name=f"{position}. Ticket `{entry['ticket_id']}`",
+                    value=f"<@{entry['user_id']}> • <#{entry['channel_id']}>\n⏳ {format_duration(now - entry['submitted_at'])}{boost}",
+                    inline=False
+                )
+            embed.set_footer(text=f"{len(queue)} en attente")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        elif action == "traiter":
+            entries = queue.peek(nombre)
+            if not entries:
+                await interaction.response.send_message("✅ Aucun ticket en attente.", ephemeral=True)
+                return
+            await interaction.response.send_message(
+                f"📥 Sélectionnez les tickets à traiter ({len(entries)} prochains de la file) :",
+                view=BulkVerificationView(self, entries),
+                ephemeral=True
+            )
+
+        elif action == "prendre":
+            # Attribution sans point d'attente : aucun autre modérateur ne peut obtenir ce ticket
+            entry = queue.claim(interaction.user.id, ticket_id)
+            if entry is None:
+                message = "✅ Aucun ticket en attente." if ticket_id is None else f"❌ Le ticket `{ticket_id}` n'est pas disponible."
+                await interaction.response.send_message(message, ephemeral=True)
+                return
+            # Réponse immédiate : sauvegarde, annonce et photos suivent
+            await interaction.response.send_message(
+                f"✅ Ticket `{entry['ticket_id']}` attribué : <#{entry['channel_id']}> "
+                f"(attente : {format_duration(entry['claimed_at'] - entry['submitted_at'])})",
+                ephemeral=True
+            )
+            await self.save_tickets_data()
+
+            channel = self.bot.get_channel(entry["channel_id"])
+            if channel:
+                await self._send(
+                    channel, Priority.RESPONSE,
+                    content=f"🧑‍⚖️ Vérification prise en charge par {interaction.user.mention}."
+                )
+            # Les photos conservées suivent le modérateur, même si le message d'origine a été supprimé
+            found = self.ticket_by_id(entry["ticket_id"])
+            if found:
+                await self._send_photos(interaction, found[1])
+
+        elif action in ("liberer", "prioriser"):
+            if ticket_id is None:
+                await interaction.response.send_message("❌ Précisez l'ID du ticket.", ephemeral=True)
+                return
+            entry = queue.release(ticket_id) if action == "liberer" else queue.boost(ticket_id)
+            if entry is None:
+                await interaction.response.send_message(f"❌ Le ticket `{ticket_id}` n'est pas dans la file.", ephemeral=True)
+                return
+            await self.save_tickets_data()
+            message = "🔄 remis dans la file" if action == "liberer" else f"⬆️ priorité portée à {entry['priority']}"
+            await interaction.response.send_message(f"✅ Ticket `{ticket_id}` {message}.", ephemeral=True)
+
+        else:
+            stats = queue.stats()
+            embed = discord.Embed(
+                title="📊 Statistiques de la file",
+                color=0x9B59B6,
+                timestamp=datetime.utcnow()
+            )
+            embed.add_field(name="En attente", value=str(stats["depth"]), inline=True)
+            embed.add_field(name="Pris en charge", value=str(stats["claimed"]), inline=True)
+            embed.add_field(name="Plus ancien", value=format_duration(stats["oldest"]), inline=True)
+            embed.add_field(
+                name=f"Temps d'attente ({stats['samples']} prises en charge)",
+                value=(
+                    f"p50 : {format_duration(stats['p50'])}\n"
+                    f"p90 : {format_duration(stats['p90'])}\n"
+                    f"p99 : {format_duration(stats['p99'])}"
+                ),
+                inline=False
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="transcript-search", description="🔎 Rechercher dans les transcripts de tickets (Staff uniquement)")
+    @app_commands.describe(
+        requete="Mots ou phrase à rechercher (syntaxe FTS5 acceptée)",
+        utilisateur="Limiter aux tickets de cet utilisateur",
+        depuis="Date de début (AAAA-MM-JJ)",
+        jusqua="Date de fin (AAAA-MM-JJ)",
+        limite="Nombre de résultats (1-10)"
+    )
+    @app_commands.default_permissions(manage_messages=True)
+    async def transcript_search(
+        self,
+        interaction: discord.Interaction,
+        requete: str,
+        utilisateur: Optional[discord.User] = None,
+        depuis: Optional[str] = None,
+        jusqua: Optional[str] = None,
+        limite: app_commands.Range[int, 1, 10] = 5
+    ):
+        """Recherche plein texte dans les transcripts indexés"""
+
+        if not is_staff(interaction.user):
+            await interaction.response.send_message(
+                "❌ Vous n'avez pas les permissions pour effectuer cette action !",
+                ephemeral=True
+            )
+            return
+
+        for value in (depuis, jusqua):
+            if value:
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    await interaction.response.send_message(
+                        f"❌ Date invalide : `{value}` (format attendu AAAA-MM-JJ)",
+                        ephemeral=True
+                    )
+                    return
+
+        await interaction.response.defer(ephemeral=True)
+
+        start = time.perf_counter()
+        results = await self.transcript_index.search(
+            requete,
+            user_id=str(utilisateur.id) if utilisateur else None,
+            since=depuis,
+            until=jusqua,
+            limit=limite
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        embed = discord.Embed(
+            title="🔎 Recherche dans les transcripts",
+            description=f"**Requête :** `{requete}`\n**Résultats :** {len(results)}",
+            color=0x3498DB,
+            timestamp=datetime.utcnow()
+        )
+
+        for result in results:
+            extract = result["extract"].replace("\n", " ")
+            embed.add_field(
+                name=f"🎫 {result['ticket_id'] or 'ID inconnu'} • {result['closed_at']}",
+                value=f"<@{result['user_id']}> • `{os.path.basename(result['path'])}`\n{extract[:900]}",
+                inline=False
+            )
+
+        if not results:
+            embed.add_field(name="Aucun résultat", value="Aucun transcript ne correspond à cette recherche.", inline=False)
+
+        embed.set_footer(text=f"⏱️ {elapsed_ms:.1f} ms")
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="transcript", description="📜 Récupérer le transcript d'un ticket fermé (Staff uniquement)")
+    @app_commands.describe(ticket_id="ID du ticket (8 caractères)")
+    @app_commands.default_permissions(manage_messages=True)
+    async def get_transcript(self, interaction: discord.Interaction, ticket_id: str):
+        """Retrouve un transcript, qu'il soit encore sur disque ou compacté dans une archive"""
+
+        if not is_staff(interaction.user):
+            await interaction.response.send_message(
+                "❌ Vous n'avez pas les permissions pour effectuer cette action !",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        ticket_id = ticket_id.strip().lower()
+        row = await self.bot.db.fetchone(
+            "SELECT path FROM transcripts WHERE ticket_id = ? ORDER BY closed_at DESC LIMIT 1",
+            (ticket_id,)
+        )
+        if row:
+            path = row["path"]
+        else:
+            path = self.archive.name_for_ticket(ticket_id)
+
+        content = None
+        if path:
+            # Le chemin d'origine reste valide : resolve() bascule sur l'archive si le fichier a été compacté
+            path = os.path.join(self.tickets_dir, os.path.basename(path))
+            content = await asyncio.to_thread(self.archive.resolve, path)
+
+        if content is None:
+            await interaction.followup.send(f"❌ Aucun transcript trouvé pour le ticket `{ticket_id}`.", ephemeral=True)
+            return
+
+        transcript_file = discord.File(io.BytesIO(content.encode("utf-8")), filename=os.path.basename(path))
+        await interaction.followup.send(
+            f"📜 Transcript du ticket `{ticket_id}`",
+            file=transcript_file,
+            ephemeral=True
+        )
+
     async def close_ticket_internal(self, channel, closer, reason="Ticket fermé"):
         """Fonction interne pour fermer un ticket"""
+        async with self.bot.ratelimits.track("ticket.close"):
+            await self._close_ticket(channel, closer, reason)
+
+    async def _close_ticket(self, channel, closer, reason):
+        """Transcript, logs, données actives puis suppression du canal"""
         try:
             # Trouver l'utilisateur du ticket
-            user_id = None
-            for uid, ticket_info in self.tickets_data.get("active_tickets", {}).items():
-                if ticket_info["channel_id"] == channel.id:
-                    user_id = uid
-                    break
-                    
+            found = self._ticket_for_channel(channel.id)
+            user_id = found[0] if found else None
+
             if user_id:
-                # Créer un transcript du ticket
-                transcript = await self.create_transcript(channel)
-                
-                # Sauvegarder le transcript
-                transcript_path = f"{self.tickets_dir}transcript_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-                async with aiofiles.open(transcript_path, "w", encoding="utf-8") as f:
-                    await f.write(transcript)
+                transcript_path = await self.finalize_transcript(
+                    user_id, found[1], channel, f"{closer} ({closer.id})", reason
+                )
                 
                 # Envoyer le transcript aux logs
-                logs_channel = discord.utils.get(channel.guild.channels, name="🎫-logs-tickets")
+                logs_channel = self.bot.guild_index.text_channel(channel.guild, "🎫-logs-tickets")
                 if logs_channel:
                     close_embed = discord.Embed(
                         title="🔒 Ticket Fermé",
@@ -384,21 +1218,103 @@ class TicketSystem(commands.Cog):
                     try:
                         with open(transcript_path, "rb") as f:
                             transcript_file = discord.File(f, filename=f"transcript_{user_id}.txt")
-                            await logs_channel.send(embed=close_embed, file=transcript_file)
+                            await self._send(logs_channel, Priority.LOGGING, embed=close_embed, file=transcript_file)
                     except:
-                        await logs_channel.send(embed=close_embed)
+                        await self._send(logs_channel, Priority.LOGGING, embed=close_embed)
                 
                 # Supprimer des données actives
-                if user_id in self.tickets_data.get("active_tickets", {}):
-                    del self.tickets_data["active_tickets"][user_id]
-                    await self.save_tickets_data()
+                await self._forget_ticket(user_id, channel.id)
             
             # Supprimer le canal
-            await channel.delete(reason=reason)
+            await self.bot.rest.call(
+                Priority.RESPONSE, "DELETE", f"/channels/{channel.id}",
+                lambda: channel.delete(reason=reason), channel.guild.id
+            )
             
         except Exception as e:
             print(f"Erreur fermeture ticket: {e}")
 
+    async def finalize_transcript(self, user_id, ticket_info, channel, closer, reason):
+        """Finalise le journal du ticket en transcript et retourne son chemin"""
+        transcript_path = f"{self.tickets_dir}transcript_{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+
+        if not await self.journal.finalize(ticket_info["ticket_id"], transcript_path, closer, reason):
+            # Ticket ouvert avant la capture incrémentale : relecture de l'historique
+            transcript = await self.create_transcript(channel)
+            async with aiofiles.open(transcript_path, "w", encoding="utf-8") as f:
+                await f.write(transcript)
+
+        # Indexation hors du chemin de fermeture
+        self._spawn(self._index_transcript(transcript_path))
+        return transcript_path
+
+    async def _forget_ticket(self, user_id, channel_id):
+        """Retirer un ticket des données actives et des index"""
+        self.channel_index.pop(channel_id, None)
+        if user_id in self.tickets_data.get("active_tickets", {}):
+            ticket_info = self.tickets_data["active_tickets"].pop(user_id)
+            self.ticket_index.pop(ticket_info["ticket_id"], None)
+            self.verification_queue.remove(ticket_info["ticket_id"])
+            await self.photos.purge(ticket_info["ticket_id"])
+            self.stale_wheel.cancel(ticket_info["ticket_id"])
+            await self.save_tickets_data()
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """Capture incrémentale des messages des canaux de tickets"""
+        if not message.guild:
+            return
+        found = self._ticket_for_channel(message.channel.id)
+        if found:
+            if not message.author.bot:
+                self._touch_ticket(found[1])
+            if str(message.author.id) == found[0]:
+                for attachment in message.attachments:
+                    if (attachment.content_type or "").startswith("image/"):
+                        self._spawn(self._store_photo(found[1], message, attachment))
+            await self.journal.append_message(found[1]["ticket_id"], message)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self._overwrite_templates.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if before.name != after.name:
+            self._overwrite_templates.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self._overwrite_templates.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        """Capture des modifications de messages, même hors du cache"""
+        found = self._ticket_for_channel(payload.channel_id)
+        if found:
+            await self.journal.append_edit(found[1]["ticket_id"], payload)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        """Capture des suppressions de messages"""
+        found = self._ticket_for_channel(payload.channel_id)
+        if found:
+            await self.journal.append_delete(found[1]["ticket_id"], payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        """Finaliser le transcript si un canal de ticket est supprimé manuellement"""
+        found = self._ticket_for_channel(channel.id)
+        if not found:
+            return
+        user_id, ticket_info = found
+        try:
+            if self.journal.exists(ticket_info["ticket_id"]):
+                await self.finalize_transcript(user_id, ticket_info, channel, None, "Canal supprimé manuellement")
+        except Exception as e:
+            print(f"Erreur finalisation transcript: {e}")
+        await self._forget_ticket(user_id, channel.id)
+
     async def create_transcript(self, channel):
         """Créer un transcript du canal"""
         transcript = f"=== TRANSCRIPT DU TICKET ===\n"
@@ -427,21 +1343,121 @@ class TicketSystem(commands.Cog):
             
         return transcript
 
+class BulkVerificationView(discord.ui.View):
+    """Sélection multiple de tickets de la file, puis approbation ou rejet groupé"""
+
+    def __init__(self, ticket_system, entries):
+        super().__init__(timeout=300)
+        self.ticket_system = ticket_system
+        self.selected = []
+
+        self.select = discord.ui.Select(
+            placeholder="Tickets à traiter",
+            row=0,
+            min_values=1,
+            max_values=len(entries),
+            options=[
+                discord.SelectOption(
+                    label=f"Ticket {entry['ticket_id']}",
+                    value=entry["ticket_id"],
+                    description=f"Utilisateur {entry['user_id']}"
+                )
+                for entry in entries
+            ]
+        )
+        self.select.callback = self.on_select
+        self.add_item(self.select)
+
+    async def on_select(self, interaction: discord.Interaction):
+        self.selected = list(self.select.values)
+        await interaction.response.defer()
+
+    async def _run(self, interaction: discord.Interaction, approved):
+        if not self.selected:
+            await interaction.response.send_message("❌ Sélectionnez au moins un ticket.", ephemeral=True)
+            return
+        self.stop()
+        await interaction.response.edit_message(content=None, view=None, embed=discord.Embed(
+            title="⏳ Traitement groupé en cours...",
+            description=f"**0/{len(self.selected)}** tickets traités",
+            color=0xFFA500
+        ))
+        await self.ticket_system.bulk_verify(interaction, self.selected, approved)
+
+    @discord.ui.button(label="Approuver", emoji="✅", style=discord.ButtonStyle.success, row=1)
+    async def approve(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._run(interaction, True)
+
+    @discord.ui.button(label="Rejeter", emoji="❌", style=discord.ButtonStyle.danger, row=1)
+    async def reject(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._run(interaction, False)
+
 class TicketView(discord.ui.View):
-    """Vue avec boutons pour interagir avec les tickets"""
+    """
+    Vue avec boutons pour interagir avec les tickets
+    Sans état : les boutons sont des TicketButton dont le custom_id encode l'ID du ticket
+    """
     
-    def __init__(self, bot, ticket_id, user_id):
+    def __init__(self, ticket_id):
         super().__init__(timeout=None)
-        self.bot = bot
+        for action in TicketButton.ACTIONS:
+            self.add_item(TicketButton(action, ticket_id))
+
+
+class TicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r"themis:ticket:(?P<action>photo|close|help):(?P<ticket_id>[0-9a-f]{8})"):
+    """
+    Bouton persistant de ticket, résolu à partir de son custom_id après un redémarrage
+    Enregistré une seule fois via bot.add_dynamic_items : aucune vue n'est gardée en mémoire par ticket
+    """
+
+    ACTIONS = {
+        "photo": ("📸 J'ai envoyé ma photo", discord.ButtonStyle.green, "📸"),
+        "close": ("🔒 Fermer le ticket", discord.ButtonStyle.red, "🔒"),
+        "help": ("❓ Aide", discord.ButtonStyle.secondary, "❓")
+    }
+
+    def __init__(self, action: str, ticket_id: str):
+        label, style, emoji = self.ACTIONS[action]
+        super().__init__(
+            discord.ui.Button(
+                label=label,
+                style=style,
+                emoji=emoji,
+                custom_id=f"themis:ticket:{action}:{ticket_id}"
+            )
+        )
+        self.action = action
         self.ticket_id = ticket_id
-        self.user_id = user_id
-        
-    @discord.ui.button(label="📸 J'ai envoyé ma photo", style=discord.ButtonStyle.green, emoji="📸")
-    async def photo_sent(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if str(interaction.user.id) != self.user_id:
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], match["ticket_id"])
+
+    async def callback(self, interaction: discord.Interaction):
+        if self.action == "help":
+            await self.help_button(interaction)
+            return
+
+        # Résolution de l'état du ticket depuis le store (index ID -> utilisateur)
+        ticket_system = interaction.client.get_cog('TicketSystem')
+        found = ticket_system.ticket_by_id(self.ticket_id) if ticket_system else None
+        if found is None:
+            await interaction.response.send_message("❌ Ce ticket n'est plus actif.", ephemeral=True)
+            return
+
+        user_id, ticket_info = found
+        if self.action == "photo":
+            await self.photo_sent(interaction, ticket_system, user_id, ticket_info)
+        else:
+            await self.close_ticket(interaction, ticket_system, user_id)
+
+    async def photo_sent(self, interaction: discord.Interaction, ticket_system, user_id: str, ticket_info):
+        if str(interaction.user.id) != user_id:
             await interaction.response.send_message("❌ Seul le créateur du ticket peut utiliser ce bouton !", ephemeral=True)
             return
             
+        position = await ticket_system.enqueue_verification(user_id, ticket_info)
+        
         embed = discord.Embed(
             title="📸 Photo reçue !",
             description="Merci ! Un modérateur va examiner votre photo sous peu.",
@@ -452,42 +1468,37 @@ class TicketView(discord.ui.View):
             value="Un membre du staff va vérifier votre document d'identité. Patientez svp.",
             inline=False
         )
+        if position:
+            embed.add_field(name="📥 Position dans la file", value=f"#{position}", inline=False)
         
         await interaction.response.send_message(embed=embed)
         
         # Notifier les modérateurs
         if interaction.guild:
-            for role_name in ["🏛️ Gardien Suprême", "⚖️ Magistrat", "🛡️ Sentinel"]:
-                role = discord.utils.get(interaction.guild.roles, name=role_name)
-                if role:
-                    await interaction.followup.send(
-                        f"🔔 {role.mention} - Nouvelle photo d'identité à vérifier dans ce ticket !",
-                        ephemeral=False
-                    )
-                    break
+            staff_roles = interaction.client.guild_index.roles(interaction.guild, STAFF_ROLES)
+            if staff_roles:
+                await interaction.followup.send(
+                    f"🔔 {staff_roles[0].mention} - Nouvelle photo d'identité à vérifier dans ce ticket !",
+                    ephemeral=False
+                )
     
-    @discord.ui.button(label="🔒 Fermer le ticket", style=discord.ButtonStyle.red, emoji="🔒")
-    async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
+    async def close_ticket(self, interaction: discord.Interaction, ticket_system, user_id: str):
         # Vérifier les permissions
-        if str(interaction.user.id) != self.user_id:
-            required_roles = ["🏛️ Gardien Suprême", "⚖️ Magistrat", "🛡️ Sentinel"]
+        if str(interaction.user.id) != user_id:
             # Vérifier que c'est un membre et qu'il a les bonnes permissions
-            if not isinstance(interaction.user, discord.Member) or not any(role.name in required_roles for role in interaction.user.roles):
+            if not is_staff(interaction.user):
                 await interaction.response.send_message("❌ Vous n'avez pas les permissions pour fermer ce ticket !", ephemeral=True)
                 return
         
         await interaction.response.send_message("🔒 Fermeture du ticket en cours...", ephemeral=True)
         
-        ticket_system = self.bot.get_cog('TicketSystem')
-        if ticket_system:
-            await ticket_system.close_ticket_internal(
-                interaction.channel, 
-                interaction.user, 
-                f"Fermé par {interaction.user.display_name}"
-            )
+        await ticket_system.close_ticket_internal(
+            interaction.channel, 
+            interaction.user, 
+            f"Fermé par {interaction.user.display_name}"
+        )
     
-    @discord.ui.button(label="❓ Aide", style=discord.ButtonStyle.secondary, emoji="❓")
-    async def help_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+    async def help_button(self, interaction: discord.Interaction):
         help_embed = discord.Embed(
             title="❓ Aide - Vérification d'Identité",
             description="Guide pour réussir votre vérification",
@@ -515,4 +1526,9 @@ class TicketView(discord.ui.View):
         await interaction.response.send_message(embed=help_embed, ephemeral=True)
 
 async def setup(bot):
+    # Boutons persistants : valables pour tous les tickets, y compris après un redémarrage
+    bot.add_dynamic_items(TicketButton)
     await bot.add_cog(TicketSystem(bot))
+
+async def teardown(bot):
+    bot.remove_dynamic_items(TicketButton)
@@ -10,6 +10,8 @@ import logging
 from datetime import datetime
 from typing import Optional
 
+from bot.utils.cache_report import format_bytes, guild_cache_report, process_memory
+
 class UtilitiesCog(commands.Cog):
     """Module de commandes slash utilitaires"""
     
@@ -178,10 +180,15 @@ class UtilitiesCog(commands.Cog):
         voice_channels = len(guild.voice_channels)
         categories = len(guild.categories)
         
+        # Répartition humains/bots seulement si la liste des membres est chargée
+        stats = self.bot.member_stats
+        split = f"**Humains / Bots:** {stats.humans(guild)} / {stats.bots(guild)}\n" if stats.complete(guild) else ""
+        
         embed.add_field(
             name="📊 Statistiques",
             value=(
                 f"**Membres:** {guild.member_count}\n"
+                f"{split}"
                 f"**Rôles:** {len(guild.roles)}\n"
                 f"**Canaux:** {text_channels + voice_channels}\n"
                 f"**Catégories:** {categories}"
@@ -257,12 +264,87 @@ class UtilitiesCog(commands.Cog):
         await interaction.response.send_message(embed=embed)
         self.logger.info(f"🏛️ {interaction.user} a consulté les infos du serveur {guild.name}")
     
+    @app_commands.command(name="roleinfo", description="📋 Affiche les détails et permissions d'un rôle")
+    @app_commands.describe(role="Rôle à analyser")
+    async def role_info(self, interaction: discord.Interaction, role: discord.Role):
+        """Affiche les informations détaillées d'un rôle"""
+        
+        if not self.bot.member_stats.complete(role.guild):
+            # Liste des membres chargée à la demande (peut prendre quelques secondes)
+            await interaction.response.defer()
+            await self.bot.ensure_chunked(role.guild)
+        
+        member_count = self.bot.member_stats.role_count(role)
+        embed = discord.Embed(
+            title=f"📋 Informations du Rôle: {role.name}",
+            color=role.color,
+            timestamp=datetime.utcnow()
+        )
+        
+        # Informations de base
+        embed.add_field(
+            name="🆔 Informations Générales",
+            value=f"**ID:** `{role.id}`\n"
+                  f"**Couleur:** `{role.color}`\n"
+                  f"**Position:** `{role.position}`\n"
+                  f"**Membres:** `{member_count}`\n"
+                  f"**Mentionnable:** {'✅' if role.mentionable else '❌'}\n"
+                  f"**Affiché séparément:** {'✅' if role.hoist else '❌'}",
+            inline=False
+        )
+        
+        # Permissions importantes
+        important_perms = []
+        if role.permissions.administrator:
+            important_perms.append("👑 Administrateur")
+        if role.permissions.manage_guild:
+            important_perms.append("🏛️ Gérer le serveur")
+        if role.permissions.manage_channels:
+            important_perms.append("📝 Gérer les canaux")
+        if role.permissions.manage_roles:
+            important_perms.append("🔄 Gérer les rôles")
+        if role.permissions.ban_members:
+            important_perms.append("🔨 Bannir")
+        if role.permissions.kick_members:
+            important_perms.append("👢 Expulser")
+        if role.permissions.moderate_members:
+            important_perms.append("⏰ Timeout")
+        if role.permissions.manage_messages:
+            important_perms.append("🗑️ Gérer les messages")
+        
+        if important_perms:
+            embed.add_field(
+                name="⚡ Permissions Importantes",
+                value="\n".join(important_perms),
+                inline=True
+            )
+        
+        # Membres avec ce rôle (limité à 10)
+        if member_count:
+            member_list = [member.display_name for member in self.bot.member_stats.role_sample(role, 10)]
+            if member_count > 10:
+                member_list.append(f"... et {member_count - 10} autres")
+            
+            embed.add_field(
+                name="👥 Membres (Top 10)",
+                value="\n".join(member_list),
+                inline=True
+            )
+        
+        embed.set_footer(text="Themis-Bot • Gestion des Rôles")
+        
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
+
     @app_commands.command(name="ping", description="🏓 Affiche la latence du bot")
     async def ping(self, interaction: discord.Interaction):
         """Affiche la latence du bot"""
         
-        # Calculer la latence avant de répondre
-        latency = round(self.bot.latency * 1000)
+        # Calculer la latence avant de répondre : celle du shard qui gère ce serveur
+        shard = self.bot.get_shard(interaction.guild.shard_id) if interaction.guild else None
+        latency = round((shard.latency if shard else self.bot.latency) * 1000)
         
         embed = discord.Embed(
             title="🏓 Pong !",
@@ -291,11 +373,107 @@ class UtilitiesCog(commands.Cog):
             inline=True
         )
         
-        embed.set_footer(text="Que la vitesse de Hermès soit avec nous !")
+        # Détail par shard : latence, débit d'événements, connexions / reprises / déconnexions
+        stats = self.bot.shard_stats.shards
+        lines = ["shard latence    débit  co/rep/déco"]
+        for shard_id, shard_latency in sorted(self.bot.latencies)[:15]:
+            counters = stats.get(shard_id)
+            rate = counters.rate() if counters else 0.0
+            sessions = f"{counters.connects}/{counters.resumes}/{counters.disconnects}" if counters else "0/0/0"
+            lines.append(f"#{shard_id:<3} {round(shard_latency * 1000):>5}ms {rate:>7.1f} év/s  {sessions}")
+        if len(self.bot.latencies) > 15:
+            lines.append(f"... et {len(self.bot.latencies) - 15} autres shards")
+        if len(lines) > 1:
+            embed.add_field(
+                name=f"🛰️ Shards ({len(self.bot.shards)} sur {self.bot.shard_count})",
+                value="```\n" + "\n".join(lines) + "\n```",
+                inline=False
+            )
+        
+        footer = "Que la vitesse de Hermès soit avec nous !"
+        if shard:
+            footer = f"Shard {shard.id} • {footer}"
+        if self.bot.cluster is not None:
+            footer = f"Cluster {self.bot.cluster.id} • {footer}"
+        embed.set_footer(text=footer)
         
         await interaction.response.send_message(embed=embed)
         self.logger.info(f"🏓 {interaction.user} a testé la latence ({latency}ms)")
     
+    @app_commands.command(name="api-usage", description="💸 Coût en appels API de chaque commande et événement")
+    @app_commands.default_permissions(administrator=True)
+    async def api_usage(self, interaction: discord.Interaction):
+        """Appels REST cumulés par commande et par événement depuis le démarrage"""
+        
+        ratelimits = self.bot.ratelimits
+        embed = discord.Embed(
+            title="💸 Consommation de l'API",
+            description=(
+                f"**Total :** {ratelimits.total} appels • **429 :** {ratelimits.rate_limited}\n"
+                f"**En file :** " + ", ".join(f"{name} {count}" for name, count in self.bot.rest.pending().items())
+            ),
+            color=0x3498DB,
+            timestamp=datetime.utcnow()
+        )
+        
+        top = sorted(ratelimits.usage.items(), key=lambda item: item[1].calls, reverse=True)[:10]
+        for label, totals in top:
+            route, count = totals.routes.most_common(1)[0] if totals.routes else ("—", 0)
+            embed.add_field(
+                name=f"{label}",
+                value=(
+                    f"{totals.calls} appels / {totals.invocations} invocations "
+                    f"(moy. {totals.calls / totals.invocations:.1f}, max {totals.max_calls})\n"
+                    f"{totals.bytes / 1024:.0f} Ko • {totals.rate_limited} × 429 • {totals.waited:.1f}s d'attente\n"
+                    f"`{route}` ×{count}"
+                ),
+                inline=False
+            )
+        if not top:
+            embed.add_field(name="📭 Aucune donnée", value="Aucune commande suivie depuis le démarrage.", inline=False)
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="memory", description="🧠 Taille approximative des caches par serveur")
+    @app_commands.default_permissions(administrator=True)
+    async def memory(self, interaction: discord.Interaction):
+        """Empreinte mémoire des caches (membres, canaux, rôles, messages) pour régler la configuration"""
+        
+        report = await guild_cache_report(self.bot)
+        # Réglages tels que configurés au démarrage (voir ThemisBot.__init__)
+        flags = self.bot.member_cache_flags
+        max_messages = self.bot.config.get('cache.max_messages', 1000)
+        
+        embed = discord.Embed(
+            title="🧠 Mémoire et Caches",
+            description=(
+                f"**Processus :** {format_bytes(process_memory())}\n"
+                f"**Caches estimés :** {format_bytes(sum(entry['bytes'] for entry in report))}\n"
+                f"**Utilisateurs en cache :** {len(self.bot.users)}\n"
+                f"**Messages en cache :** {len(self.bot.cached_messages)} / {max_messages or 'désactivé'}\n"
+                f"**Cache membres :** voice={flags.voice}, joined={flags.joined}"
+            ),
+            color=0x3498DB,
+            timestamp=datetime.utcnow()
+        )
+        
+        for entry in report[:10]:
+            sizes = entry["sizes"]
+            embed.add_field(
+                name=f"{entry['guild'].name} • {format_bytes(entry['bytes'])}",
+                value=(
+                    f"👥 {entry['members']}/{entry['member_count']} membres "
+                    f"{'(complet)' if entry['chunked'] else '(partiel)'} : {format_bytes(sizes['members'])}\n"
+                    f"💬 {entry['messages']} messages : {format_bytes(sizes['messages'])} • "
+                    f"📺 {format_bytes(sizes['channels'])} • 🎭 {format_bytes(sizes['roles'])}"
+                ),
+                inline=False
+            )
+        if len(report) > 10:
+            embed.set_footer(text=f"... et {len(report) - 10} autre(s) serveur(s)")
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @app_commands.command(name="avatar", description="🖼️ Affiche l'avatar d'un utilisateur")
     @app_commands.describe(user="L'utilisateur dont afficher l'avatar (optionnel)")
     async def avatar(self, interaction: discord.Interaction, user: Optional[discord.Member] = None):
@@ -5,20 +5,53 @@
 
 import discord
 from discord.ext import commands
+import asyncio
+import hashlib
 import logging
 import json
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 
-class ThemisBot(commands.Bot):
+from bot.utils.cluster import ClusterInfo, shard_for_guild
+from bot.utils.database import Database
+from bot.utils.guild_config import GuildConfig
+from bot.utils.guild_index import GuildIndex
+from bot.utils.member_stats import MemberStats
+from bot.utils.scheduler import Scheduler
+from bot.utils.shard_stats import ShardStats
+from bot.utils.ratelimit import RateLimitTracker, TrackedCommandTree
+from bot.utils.rest_scheduler import Priority, RestScheduler
+
+# Modules du bot ; ceux listés dans `bot.lazy_cogs` sont chargés après la connexion
+COGS = [
+    'bot.cogs.admin',
+    'bot.cogs.help',
+    'bot.cogs.utilities',
+    'bot.cogs.fun',
+    'bot.cogs.security',  # Module de sécurité avec tests IP
+    'bot.cogs.tickets'    # Module de tickets et vérification d'identité
+]
+
+# Tâche planifiée : retrait des avertissements de modération
+WARNING_DELETE_JOB = "moderation.warning_delete"
+
+class ThemisBot(commands.AutoShardedBot):
     """
     Bot Discord gardien de l'ordre et de la justice
     Incarne l'esprit de Thémis, déesse de la justice divine
     """
     
-    def __init__(self, config):
+    def __init__(self, config, cluster: Optional[ClusterInfo] = None):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        # Place de ce processus en mode cluster (None : processus unique)
+        self.cluster = cluster
+        
+        # Mesures du démarrage : phases globales et détail par module
+        self.startup: Dict[str, Any] = {"started": time.monotonic(), "phases": {}, "cogs": {}, "reported": False}
+        self._cog_load_times: Dict[str, float] = {}
+        self._chunk_locks: Dict[int, asyncio.Lock] = {}
         
         # Configuration des intents
         intents = discord.Intents.default()
@@ -26,12 +59,73 @@ class ThemisBot(commands.Bot):
         intents.members = True
         intents.guilds = True
         
+        # Empreinte mémoire : quels membres garder en cache, combien de messages,
+        # et pas de chargement complet des membres au démarrage (voir ensure_chunked)
+        member_flags = config.get('cache.member_flags')
+        member_cache_flags = (
+            discord.MemberCacheFlags(**member_flags) if member_flags
+            else discord.MemberCacheFlags.from_intents(intents)
+        )
+        
+        # Suivi des limites de l'API (en-têtes X-RateLimit-*) et comptage des appels par commande
+        # En mode cluster, la limite globale de Discord est partagée à parts égales entre processus
+        global_rate = config.get('ratelimits.global_per_second', 50 if cluster else None)
+        self.ratelimits = RateLimitTracker(
+            budgets=config.get('ratelimits.budgets', {}),
+            default_budget=config.get('ratelimits.default_budget'),
+            global_rate=global_rate / cluster.count if cluster and global_rate else global_rate
+        )
+        
+        # Sharding : nombre de shards imposé (sinon celui recommandé par Discord)
+        # et sous-ensemble des shards gérés par ce processus (imposé par le superviseur en mode cluster)
+        shard_ids = cluster.shard_ids if cluster else config.get('bot.shard_ids')
+        
         # Initialisation du bot
         super().__init__(
-            command_prefix=config.get('bot.prefix', '!'),
+            shard_count=cluster.shard_count if cluster else config.get('bot.shard_count'),
+            shard_ids=list(shard_ids) if shard_ids is not None else None,
+            command_prefix=self._command_prefix,
             intents=intents,
             help_command=None,  # On créera notre propre commande help
-            case_insensitive=True
+            member_cache_flags=member_cache_flags,
+            chunk_guilds_at_startup=config.get('cache.chunk_at_startup', False),
+            max_messages=config.get('cache.max_messages', 1000),
+            case_insensitive=True,
+            http_trace=self.ratelimits.trace_config,
+            tree_cls=TrackedCommandTree
+        )
+        # Conservé pour /memory (discord.py ne l'expose pas publiquement)
+        self.member_cache_flags = member_cache_flags
+        
+        # File à priorités des écritures REST (modération > réponses > logs > masse)
+        self.rest = RestScheduler(
+            self.ratelimits,
+            workers=config.get('rest.workers', 10),
+            reserved=config.get('rest.reserved_workers', 2),
+            bulk_limit=config.get('rest.bulk_limit')
+        )
+        
+        # Base de données partagée entre les modules
+        self.db = Database(config.get('database.path', 'data/themis.db'))
+        
+        # Réglages par serveur (préfixe, modération, règles, sécurité) avec repli sur les valeurs globales
+        self.guild_config = GuildConfig(self, capacity=config.get('guild_config.cache_size', 500))
+        
+        # Index nom -> rôle/canal partagé par les modules
+        self.guild_index = GuildIndex(self, config.get('guild_index.aliases', {}))
+        
+        # Compteurs de membres (par serveur et par rôle) tenus à jour par les événements
+        self.member_stats = MemberStats(self)
+        
+        # Débit d'événements et reconnexions de chaque shard
+        self.shard_stats = ShardStats(self)
+        
+        # Tâches différées persistantes (fermetures de tickets, expirations...)
+        self.scheduler = Scheduler(
+            self.db,
+            batch_size=config.get('scheduler.batch_size', 10),
+            wait_ready=self.wait_until_ready,
+            owns=self.owns_guild
         )
         
         # Chargement des règles
@@ -44,6 +138,21 @@ class ThemisBot(commands.Bot):
             'redirections': 0
         }
     
+    def owns_guild(self, guild_id: Optional[int]) -> bool:
+        """
+        Ce processus gère-t-il ce serveur ? Toujours vrai hors mode cluster
+        Ce qui n'est rattaché à aucun serveur revient au cluster 0
+        """
+        if self.cluster is None:
+            return True
+        if guild_id is None:
+            return self.cluster.id == 0
+        return self.cluster.owns_shard(shard_for_guild(guild_id, self.cluster.shard_count))
+    
+    async def _command_prefix(self, bot, message) -> str:
+        """Préfixe des commandes textuelles, propre à chaque serveur"""
+        return await self.guild_config.get(message.guild.id if message.guild else None, 'prefix')
+    
     def load_rules(self) -> Dict[str, Any]:
         """Charge les règles de modération"""
         try:
@@ -62,42 +171,140 @@ class ThemisBot(commands.Bot):
         """Configuration initiale du bot"""
         self.logger.info("⚖️ Configuration de Themis-Bot...")
         
+        # Ouverture de la base de données avant les modules qui l'utilisent
+        await self.db.connect()
+        await self.guild_config.setup()
+        
+        self.scheduler.register(WARNING_DELETE_JOB, self._delete_warning)
+        
         # Chargement des cogs (modules)
-        await self.load_cogs()
+        lazy = set(self.config.get('bot.lazy_cogs', []))
+        await self.load_cogs([cog for cog in COGS if cog not in lazy])
         
-        # Synchronisation des commandes slash
-        try:
-            synced = await self.tree.sync()
-            self.logger.info(f"📜 {len(synced)} commandes slash synchronisées")
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la synchronisation: {e}")
-    
-    async def load_cogs(self):
-        """Charge les modules (cogs) du bot"""
-        cogs_to_load = [
-            'bot.cogs.admin',
-            'bot.cogs.help',
-            'bot.cogs.utilities',
-            'bot.cogs.fun',
-            'bot.cogs.security',  # Module de sécurité avec tests IP
-            'bot.cogs.tickets'    # Module de tickets et vérification d'identité
-        ]
-        
-        for cog in cogs_to_load:
+        # Les modules ont enregistré leurs tâches : reprise des tâches en attente
+        await self.scheduler.start()
+        
+        # Modules différés et synchronisation ne retardent pas la connexion à la gateway
+        self._startup_task = asyncio.create_task(self._finish_startup([cog for cog in COGS if cog in lazy]))
+    
+    async def _finish_startup(self, lazy_cogs):
+        """Charge les modules différés puis synchronise les commandes (l'arbre doit être complet)"""
+        if lazy_cogs:
+            await self.load_cogs(lazy_cogs, phase="lazy_cogs")
+        
+        # Synchronisation des commandes slash (seulement si l'arbre a changé)
+        # En mode cluster, l'arbre est le même partout : le cluster 0 s'en charge seul
+        started = time.monotonic()
+        if self.owns_guild(None):
             try:
-                await self.load_extension(cog)
-                self.logger.info(f"📚 Module chargé: {cog}")
+                await self.sync_commands()
             except Exception as e:
-                self.logger.error(f"❌ Erreur lors du chargement de {cog}: {e}")
+                self.logger.error(f"Erreur lors de la synchronisation: {e}")
+        # Phase enregistrée partout (0 hors du cluster 0) : le rapport de démarrage en dépend
+        self.startup["phases"]["sync"] = time.monotonic() - started
+        
+        if self.is_ready():
+            self._log_startup_report()
+    
+    def command_tree_hash(self, guild=None) -> str:
+        """Empreinte stable de l'arbre de commandes tel qu'il serait envoyé à Discord"""
+        payload = sorted(
+            (command.to_dict(self.tree) for command in self.tree.get_commands(guild=guild)),
+            key=lambda command: (command.get("type", 1), command["name"])
+        )
+        serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    
+    async def sync_commands(self, force: bool = False) -> bool:
+        """
+        Synchronise les commandes slash si leur empreinte diffère de la dernière synchronisation
+        Avec `bot.dev_guild_id`, la synchronisation vise ce seul serveur (effet immédiat)
+        Retourne True si une synchronisation a eu lieu
+        """
+        started = time.monotonic()
+        dev_guild_id = self.config.get('bot.dev_guild_id')
+        guild = discord.Object(id=int(dev_guild_id)) if dev_guild_id else None
+        if guild is not None:
+            self.tree.copy_global_to(guild=guild)
+        
+        scope = f"guild:{guild.id}" if guild is not None else "global"
+        meta_key = f"command_tree_hash:{self.application_id}:{scope}"
+        fingerprint = self.command_tree_hash(guild)
+        force = force or self.config.get('bot.force_command_sync', False)
+        
+        if not force and await self.db.get_meta(meta_key) == fingerprint:
+            self.logger.info(
+                f"📜 Commandes slash inchangées ({scope}, {fingerprint[:12]}) : synchronisation ignorée "
+                f"({(time.monotonic() - started) * 1000:.0f}ms)"
+            )
+            return False
+        
+        synced = await self.tree.sync(guild=guild)
+        await self.db.set_meta(meta_key, fingerprint)
+        self.logger.info(
+            f"📜 {len(synced)} commandes slash synchronisées ({scope}, {fingerprint[:12]}"
+            f"{', forcée' if force else ''}) en {time.monotonic() - started:.1f}s"
+        )
+        return True
+    
+    async def load_cogs(self, cogs=None, phase: str = "cogs"):
+        """Charge les modules (cogs) du bot en parallèle : ils sont indépendants les uns des autres"""
+        cogs = COGS if cogs is None else cogs
+        started = time.monotonic()
+        await asyncio.gather(*(self._load_cog(cog) for cog in cogs))
+        self.startup["phases"][phase] = time.monotonic() - started
+    
+    async def _load_cog(self, cog):
+        """Charge un module en mesurant import, initialisation et cog_load"""
+        timings = self.startup["cogs"].setdefault(cog, {})
+        try:
+            # load_extension exécute le module lui-même : un import préalable le chargerait deux fois
+            started = time.monotonic()
+            await self.load_extension(cog)
+            timings["cog_load"] = self._cog_load_times.pop(cog, 0.0)
+            # Import du module et setup(), hors cog_load
+            timings["import"] = time.monotonic() - started - timings["cog_load"]
+            self.logger.info(
+                f"📚 Module chargé: {cog} ({sum(timings.values()) * 1000:.0f}ms)"
+            )
+        except Exception as e:
+            self.logger.error(f"❌ Erreur lors du chargement de {cog}: {e}")
+    
+    async def add_cog(self, cog, /, **kwargs):
+        """Ajoute un cog en mesurant son cog_load"""
+        started = time.monotonic()
+        await super().add_cog(cog, **kwargs)
+        elapsed = time.monotonic() - started
+        self._cog_load_times[cog.__module__] = self._cog_load_times.get(cog.__module__, 0.0) + elapsed
+    
+    def _log_startup_report(self):
+        """Rapport de démarrage : une ligne par phase, puis le détail des modules"""
+        phases = self.startup["phases"]
+        if self.startup["reported"] or "sync" not in phases or "ready" not in phases:
+            return
+        self.startup["reported"] = True
+        
+        summary = " • ".join(f"{name} {seconds:.2f}s" for name, seconds in phases.items())
+        self.logger.info(f"⏱️ Démarrage : {summary}")
+        for cog, timings in sorted(self.startup["cogs"].items(), key=lambda item: -sum(item[1].values())):
+            detail = " • ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items())
+            self.logger.info(f"⏱️   {cog} : {detail}")
     
     async def on_ready(self):
         """Événement déclenché quand le bot est prêt"""
+        self.startup["phases"].setdefault("ready", time.monotonic() - self.startup["started"])
+        self._log_startup_report()
+        
         self.logger.info("🏛️" + "="*50)
         self.logger.info(f"🏛️ Themis-Bot est maintenant en ligne!")
         if self.user:
             self.logger.info(f"🏛️ Connecté en tant que: {self.user.name} (ID: {self.user.id})")
         self.logger.info(f"🏛️ Serveurs: {len(self.guilds)}")
-        self.logger.info(f"🏛️ Utilisateurs: {len(set(self.get_all_members()))}")
+        self.logger.info(f"🏛️ Shards: {sorted(self.shards)} sur {self.shard_count}")
+        if self.cluster is not None:
+            self.logger.info(f"🏛️ Cluster: {self.cluster.id + 1}/{self.cluster.count}")
+        estimate = " (estimation)" if self.member_stats.partial() else ""
+        self.logger.info(f"🏛️ Utilisateurs: {self.member_stats.unique_users()}{estimate}")
         self.logger.info("🏛️" + "="*50)
         
         # Définition de l'activité
@@ -111,10 +318,36 @@ class ThemisBot(commands.Bot):
         )
         
         self.logger.info("⚖️ « La justice est la vérité en action »")
+        
+        # Serveurs dont la liste complète des membres est nécessaire en permanence
+        for guild_id in self.config.get('cache.chunk_guilds', []):
+            guild = self.get_guild(int(guild_id))
+            if guild is not None and not guild.chunked:
+                asyncio.create_task(self.ensure_chunked(guild))
+    
+    def dispatch(self, event_name: str, /, *args, **kwargs) -> None:
+        """Impute chaque événement à son shard avant de le distribuer"""
+        self.shard_stats.record(event_name, args)
+        super().dispatch(event_name, *args, **kwargs)
+    
+    async def ensure_chunked(self, guild: discord.Guild) -> None:
+        """Charge la liste complète des membres d'un serveur, une seule fois et à la demande"""
+        if guild.chunked:
+            return
+        lock = self._chunk_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if guild.chunked:
+                return
+            started = time.monotonic()
+            await guild.chunk(cache=True)
+            self.member_stats.refresh(guild)
+            self.logger.info(
+                f"👥 Membres de {guild.name} chargés : {len(guild.members)} en {time.monotonic() - started:.1f}s"
+            )
     
     async def on_guild_join(self, guild):
         """Événement lors de l'ajout à un nouveau serveur"""
-        self.logger.info(f"🏛️ Themis-Bot a rejoint: {guild.name} (ID: {guild.id})")
+        self.logger.info(f"🏛️ [shard {guild.shard_id}] Themis-Bot a rejoint: {guild.name} (ID: {guild.id})")
         
         # Message de bienvenue dans le canal système
         if guild.system_channel:
@@ -142,25 +375,28 @@ class ThemisBot(commands.Bot):
         if message.author.bot or not message.guild:
             return
         
-        # Vérifier si la modération automatique est activée
-        if not self.config.get('moderation.auto_delete', True):
+        # Vérifier si la modération automatique est activée pour ce serveur
+        settings = await self.guild_config.get_all(message.guild.id)
+        if not settings['moderation.auto_delete']:
             await self.process_commands(message)
             return
         
-        # Analyser le message selon les règles
-        await self.moderate_message(message)
+        # Analyser le message selon les règles du serveur
+        async with self.ratelimits.track("message.moderation"):
+            await self.moderate_message(message, settings['channel_rules'])
         
         # Traiter les commandes
         await self.process_commands(message)
     
-    async def moderate_message(self, message):
+    async def moderate_message(self, message, channel_rules: Optional[Dict[str, Any]] = None):
         """Analyse et modère un message selon les règles définies"""
         try:
             channel_name = message.channel.name.lower()
             content = message.content.lower()
             
-            # Récupérer les règles pour ce canal
-            channel_rules = self.rules.get('channel_rules', {})
+            # Récupérer les règles pour ce canal (règles globales par défaut)
+            if channel_rules is None:
+                channel_rules = self.rules.get('channel_rules', {})
             
             for rule_channel, rules in channel_rules.items():
                 if rule_channel in channel_name:
@@ -191,7 +427,10 @@ class ThemisBot(commands.Bot):
         """Gère une violation des règles"""
         try:
             # Supprimer le message offensant
-            await message.delete()
+            await self.rest.call(
+                Priority.ENFORCEMENT, "DELETE", f"/channels/{message.channel.id}/messages/{message.id}",
+                message.delete, message.guild.id
+            )
             self.stats['messages_moderated'] += 1
             
             # Créer l'embed d'avertissement
@@ -207,11 +446,16 @@ class ThemisBot(commands.Bot):
             )
             embed.set_footer(text=f"Utilisateur: {message.author.display_name}")
             
-            # Envoyer l'avertissement
-            warning_msg = await message.channel.send(
-                f"{message.author.mention}",
-                embed=embed,
-                delete_after=30
+            # Envoyer l'avertissement ; son retrait passe aussi par la file REST (delete_after l'éviterait)
+            warning_msg = await self.rest.call(
+                Priority.RESPONSE, "POST", f"/channels/{message.channel.id}/messages",
+                lambda: message.channel.send(f"{message.author.mention}", embed=embed),
+                message.guild.id
+            )
+            await self.scheduler.schedule(
+                WARNING_DELETE_JOB,
+                delay=30,
+                payload={"guild_id": message.guild.id, "channel_id": message.channel.id, "message_id": warning_msg.id}
             )
             
             self.stats['warnings_issued'] += 1
@@ -225,6 +469,19 @@ class ThemisBot(commands.Bot):
         except Exception as e:
             self.logger.error(f"Erreur lors de la gestion de violation: {e}")
     
+    async def _delete_warning(self, payload):
+        """Retire un avertissement de modération une fois son délai écoulé"""
+        channel = self.get_channel(payload["channel_id"])
+        if channel is None:
+            return
+        try:
+            await self.rest.call(
+                Priority.RESPONSE, "DELETE", f"/channels/{channel.id}/messages/{payload['message_id']}",
+                channel.get_partial_message(payload["message_id"]).delete, payload["guild_id"]
+            )
+        except discord.NotFound:
+            pass
+    
     async def on_command_error(self, ctx, error):
         """Gestion des erreurs de commandes"""
         if isinstance(error, commands.CommandNotFound):
@@ -240,4 +497,7 @@ class ThemisBot(commands.Bot):
     async def close(self):
         """Fermeture propre du bot"""
         self.logger.info("🏛️ Fermeture de Themis-Bot...")
+        await self.scheduler.stop()
+        self.rest.close()
         await super().close()
+        await self.db.close()
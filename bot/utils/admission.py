@@ -0,0 +1,90 @@
+"""
+🚦 Contrôle d'admission pour Themis-Bot
+File bornée par serveur, exécutée au rythme du budget annoncé par les limites de l'API
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+Job = Callable[[], Awaitable[Any]]
+# serveur -> secondes à attendre avant la prochaine tâche (0 = budget disponible)
+Pace = Callable[[int], float]
+
+
+class AdmissionQueue:
+    """
+    Une file FIFO et un worker par serveur : les tâches d'un même serveur sont exécutées
+    une par une, chacune lancée quand `pace` annonce du budget (typiquement
+    RateLimitTracker.wait_time sur la route visée) ; au-delà de `maxsize`
+    tâches en attente, les nouvelles demandes sont refusées (asyncio.QueueFull)
+    """
+
+    def __init__(self, maxsize: int = 100, pace: Optional[Pace] = None):
+        self.maxsize = maxsize
+        self.pace = pace
+        self.logger = logging.getLogger(__name__)
+        self._queues: Dict[int, Deque[Tuple[Job, asyncio.Future]]] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        # Serveurs dont une tâche est en cours d'exécution
+        self._busy: Set[int] = set()
+
+    def submit(self, key: int, job: Job) -> Tuple[int, asyncio.Future]:
+        """
+        Ajoute une tâche à la file du serveur
+        Retourne (position, futur du résultat) ; position 1 = exécutée dès que possible
+        """
+        queue = self._queues.setdefault(key, deque())
+        if len(queue) >= self.maxsize:
+            raise asyncio.QueueFull()
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append((job, future))
+        position = len(queue) + (1 if key in self._busy else 0)
+
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._work(key))
+        return position, future
+
+    async def _work(self, key: int) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                # Attendre le budget avant de sortir la tâche : sa place dans la file reste exacte
+                await self._wait_budget(key)
+                job, future = queue.popleft()
+                if not future.cancelled():
+                    self._busy.add(key)
+                    try:
+                        result = await job()
+                        if not future.cancelled():
+                            future.set_result(result)
+                    except Exception as e:
+                        if not future.cancelled():
+                            future.set_exception(e)
+                    finally:
+                        self._busy.discard(key)
+        finally:
+            self._workers.pop(key, None)
+            self._busy.discard(key)
+            if not queue:
+                self._queues.pop(key, None)
+
+    async def _wait_budget(self, key: int) -> None:
+        if self.pace is None:
+            return
+        wait = self.pace(key)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.pace(key)
+
+    def close(self) -> None:
+        """Annule les workers et les demandes en attente"""
+        for worker in self._workers.values():
+            worker.cancel()
+        for queue in self._queues.values():
+            for _, future in queue:
+                future.cancel()
+        self._workers.clear()
+        self._queues.clear()
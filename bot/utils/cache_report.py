@@ -0,0 +1,102 @@
+"""
+🧠 Estimation de l'empreinte mémoire des caches pour Themis-Bot
+Tailles approximatives par échantillonnage : on mesure quelques objets et on extrapole
+"""
+
+import asyncio
+import os
+import sys
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+# Types dont la taille propre compte (les références vers le serveur ou l'état sont partagées)
+OWNED_TYPES = (str, bytes, list, tuple, dict, set, frozenset)
+
+
+def _shallow_size(obj: Any) -> int:
+    """Taille de l'objet et de ses conteneurs directs (attributs __slots__ ou __dict__)"""
+    size = sys.getsizeof(obj)
+    slots = [slot for cls in type(obj).__mro__ for slot in getattr(cls, "__slots__", ())]
+    values = [getattr(obj, slot, None) for slot in slots]
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+        values.extend(obj.__dict__.values())
+    for value in values:
+        if isinstance(value, OWNED_TYPES) or type(value).__name__ == "SnowflakeList":
+            size += sys.getsizeof(value)
+    return size
+
+
+def estimate_size(objects: Sequence[Any], sample: int = 50) -> int:
+    """Taille approximative d'une collection d'objets homogènes, en octets"""
+    if not objects:
+        return 0
+    step = max(1, len(objects) // sample)
+    picked = objects[::step][:sample]
+    return int(sum(_shallow_size(obj) for obj in picked) / len(picked) * len(objects))
+
+
+def process_memory() -> Optional[int]:
+    """Mémoire résidente du processus en octets (None si indisponible)"""
+    try:
+        with open(f"/proc/{os.getpid()}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        # Pic plutôt que valeur courante, en Ko sous Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+async def guild_cache_report(bot) -> List[Dict[str, Any]]:
+    """Tailles approximatives des caches de chaque serveur, de la plus grosse à la plus petite
+
+    Seules les copies des listes sont prises sur la boucle ; le regroupement des messages et
+    l'échantillonnage tournent dans un thread pour ne pas bloquer les événements.
+    """
+    guilds = [(guild, guild.members, guild.channels, guild.roles) for guild in bot.guilds]
+    messages = list(bot.cached_messages)
+    return await asyncio.to_thread(_build_report, guilds, messages)
+
+
+def _build_report(guilds: Sequence[tuple], cached_messages: Sequence[Any]) -> List[Dict[str, Any]]:
+    messages_by_guild: Dict[int, list] = {}
+    for message in cached_messages:
+        if message.guild is not None:
+            messages_by_guild.setdefault(message.guild.id, []).append(message)
+
+    report = []
+    for guild, members, channels, roles in guilds:
+        messages = messages_by_guild.get(guild.id, [])
+        sizes = Counter(
+            members=estimate_size(members),
+            channels=estimate_size(channels),
+            roles=estimate_size(roles),
+            messages=estimate_size(messages)
+        )
+        report.append({
+            "guild": guild,
+            "members": len(members),
+            "member_count": guild.member_count or 0,
+            "chunked": guild.chunked,
+            "messages": len(messages),
+            "sizes": sizes,
+            "bytes": sum(sizes.values())
+        })
+
+    return sorted(report, key=lambda entry: entry["bytes"], reverse=True)
+
+
+def format_bytes(size: Optional[int]) -> str:
+    if size is None:
+        return "?"
+    for unit in ("o", "Ko", "Mo"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} Go"
@@ -0,0 +1,333 @@
+"""
+🧩 Mode cluster pour Themis-Bot
+Un superviseur lance N processus, chacun propriétaire d'une plage de shards ; il relance
+les processus tombés et agrège les métriques qu'ils lui envoient par un tube
+"""
+
+import asyncio
+import json
+import os
+import time
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import discord
+
+from bot.utils.cache_report import process_memory
+
+
+@dataclass(frozen=True)
+class ClusterInfo:
+    """Place d'un processus dans le cluster"""
+    id: int
+    count: int
+    shard_ids: List[int]
+    shard_count: int
+
+    def owns_shard(self, shard_id: int) -> bool:
+        return shard_id in self.shard_ids
+
+
+def shard_ranges(shard_count: int, clusters: int) -> List[List[int]]:
+    """Découpe les shards en plages contiguës, une par processus"""
+    clusters = max(1, min(clusters, shard_count))
+    base, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for index in range(clusters):
+        size = base + (1 if index < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Shard d'un serveur (règle de Discord)"""
+    return (guild_id >> 22) % shard_count
+
+
+async def recommended_shards(token: str) -> int:
+    """Nombre de shards recommandé par Discord pour ce bot"""
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shards, _, _ = await http.get_bot_gateway()
+        return shards
+    finally:
+        await http.close()
+
+
+# ---- Côté processus de travail ------------------------------------------
+
+def collect_metrics(bot) -> Dict[str, Any]:
+    """Métriques d'un processus, envoyées au superviseur"""
+    shards = {}
+    for shard_id, latency in bot.latencies:
+        counters = bot.shard_stats.shards.get(shard_id)
+        shards[shard_id] = {
+            "latency_ms": round(latency * 1000) if latency == latency else None,
+            "events": counters.events if counters else 0,
+            "rate": round(counters.rate(), 2) if counters else 0.0,
+            "connects": counters.connects if counters else 0,
+            "resumes": counters.resumes if counters else 0,
+            "disconnects": counters.disconnects if counters else 0
+        }
+    return {
+        "cluster": bot.cluster.id,
+        "pid": os.getpid(),
+        "ready": bot.is_ready(),
+        "guilds": len(bot.guilds),
+        "users": bot.member_stats.unique_users(),
+        "users_partial": bot.member_stats.partial(),
+        "shards": shards,
+        "stats": dict(bot.stats),
+        "rest": dict(bot.rest.completed),
+        "memory": process_memory(),
+        "sent_at": time.time()
+    }
+
+
+class ClusterLink:
+    """Envoie périodiquement les métriques du processus au superviseur"""
+
+    def __init__(self, bot, conn: Connection, interval: float = 15.0):
+        self.bot = bot
+        self.conn = conn
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Envoi dans un thread : un tube plein ne doit pas bloquer la boucle
+                await asyncio.to_thread(self.conn.send, collect_metrics(self.bot))
+            except (BrokenPipeError, EOFError, OSError):
+                self.logger.warning("🧩 Superviseur injoignable, envoi des métriques arrêté")
+                return
+            except Exception as e:
+                self.logger.error(f"Erreur lors de l'envoi des métriques: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+def run_worker(cluster: ClusterInfo, conn: Connection) -> None:
+    """Point d'entrée d'un processus de travail (lancé par le superviseur)"""
+    from bot.themis import ThemisBot
+    from bot.utils.config import Config
+    from bot.utils.logger import setup_logger
+
+    setup_logger(cluster_id=cluster.id)
+    logger = logging.getLogger(__name__)
+    config = Config()
+
+    async def main():
+        bot = ThemisBot(config, cluster=cluster)
+        link = ClusterLink(bot, conn, config.get('cluster.metrics_interval', 15))
+        link.start()
+        try:
+            logger.info(f"🧩 Cluster {cluster.id} : shards {cluster.shard_ids} sur {cluster.shard_count}")
+            await bot.start(config.get('bot.token'))
+        finally:
+            link.stop()
+            await bot.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+# ---- Superviseur ----------------------------------------------------------
+
+@dataclass
+class _Worker:
+    cluster: ClusterInfo
+    process: Optional[multiprocessing.Process] = None
+    conn: Optional[Connection] = None
+    started_at: float = 0.0
+    restarts: int = 0
+    # Relance différée après un arrêt (0 : aucune relance prévue)
+    restart_at: float = 0.0
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+def aggregate(metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Vue d'ensemble du cluster à partir des métriques de chaque processus"""
+    shards = {}
+    stats: Dict[str, int] = {}
+    rest: Dict[str, int] = {}
+    for entry in metrics:
+        shards.update(entry.get("shards", {}))
+        for key, value in entry.get("stats", {}).items():
+            stats[key] = stats.get(key, 0) + value
+        for key, value in entry.get("rest", {}).items():
+            rest[key] = rest.get(key, 0) + value
+    latencies = [shard["latency_ms"] for shard in shards.values() if shard["latency_ms"] is not None]
+    return {
+        "processes": len(metrics),
+        "ready": sum(1 for entry in metrics if entry.get("ready")),
+        "guilds": sum(entry.get("guilds", 0) for entry in metrics),
+        # Somme par processus : un utilisateur présent sur deux clusters compte deux fois
+        "users": sum(entry.get("users", 0) for entry in metrics),
+        "users_partial": any(entry.get("users_partial") for entry in metrics),
+        "shards": len(shards),
+        "events_per_second": round(sum(shard["rate"] for shard in shards.values()), 2),
+        "reconnects": sum(shard["connects"] + shard["resumes"] for shard in shards.values()) - len(shards),
+        "max_latency_ms": max(latencies, default=None),
+        "memory": sum(entry.get("memory") or 0 for entry in metrics),
+        "stats": stats,
+        "rest": rest
+    }
+
+
+class Supervisor:
+    """
+    Lance un processus par plage de shards et les surveille
+    Un processus tombé est relancé, après un délai croissant s'il tombe en boucle ;
+    les métriques agrégées sont journalisées et écrites dans `metrics_path`
+    """
+
+    def __init__(self, clusters: List[ClusterInfo], metrics_path: str = "data/cluster_metrics.json",
+                 report_interval: float = 60.0, max_backoff: float = 60.0, stable_after: float = 300.0,
+                 target=run_worker):
+        self.metrics_path = metrics_path
+        self.target = target
+        self.report_interval = report_interval
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.logger = logging.getLogger(__name__)
+        # spawn : chaque processus repart d'un interpréteur neuf (pas de boucle asyncio héritée)
+        self._context = multiprocessing.get_context("spawn")
+        self.workers = {cluster.id: _Worker(cluster) for cluster in clusters}
+        self._stopping = False
+
+    def _start(self, worker: _Worker) -> None:
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=self.target,
+            args=(worker.cluster, child_conn),
+            name=f"themis-cluster-{worker.cluster.id}"
+        )
+        process.start()
+        child_conn.close()
+        worker.process, worker.conn = process, parent_conn
+        worker.started_at = time.monotonic()
+        worker.restart_at = 0.0
+        self.logger.info(
+            f"🧩 Cluster {worker.cluster.id} démarré (PID {process.pid}, shards {worker.cluster.shard_ids})"
+        )
+
+    def _exited(self, worker: _Worker) -> None:
+        code = worker.process.exitcode
+        worker.conn.close()
+        worker.process, worker.conn = None, None
+        worker.metrics = {}
+        if self._stopping:
+            return
+
+        # Un processus resté en vie longtemps repart immédiatement ; sinon délai croissant
+        if time.monotonic() - worker.started_at >= self.stable_after:
+            worker.restarts = 0
+        delay = min(self.max_backoff, 2 ** worker.restarts) if worker.restarts else 0
+        worker.restarts += 1
+        worker.restart_at = time.monotonic() + delay
+        self.logger.error(
+            f"💥 Cluster {worker.cluster.id} arrêté (code {code}), relance dans {delay:.0f}s"
+        )
+
+    def _poll(self, timeout: float) -> None:
+        handles = {}
+        for worker in self.workers.values():
+            if worker.process is not None:
+                handles[worker.conn] = worker
+                handles[worker.process.sentinel] = worker
+
+        for handle in wait(list(handles), timeout=timeout) if handles else []:
+            worker = handles[handle]
+            if worker.process is None:
+                continue
+            if handle is worker.conn:
+                try:
+                    while worker.conn.poll():
+                        worker.metrics = worker.conn.recv()
+                except (EOFError, OSError):
+                    pass
+            else:
+                worker.process.join()
+                self._exited(worker)
+
+        now = time.monotonic()
+        for worker in self.workers.values():
+            if worker.process is None and worker.restart_at and worker.restart_at <= now:
+                self._start(worker)
+
+    def report(self) -> Dict[str, Any]:
+        """Journalise et écrit la vue d'ensemble du cluster"""
+        metrics = [worker.metrics for worker in self.workers.values() if worker.metrics]
+        summary = aggregate(metrics)
+        summary["clusters"] = {
+            worker.cluster.id: {
+                "alive": worker.process is not None,
+                "restarts": worker.restarts,
+                "shard_ids": worker.cluster.shard_ids,
+                **worker.metrics
+            }
+            for worker in self.workers.values()
+        }
+        summary["updated_at"] = time.time()
+
+        self.logger.info(
+            f"🧩 Cluster : {summary['ready']}/{len(self.workers)} processus prêts • "
+            f"{summary['guilds']} serveurs • {summary['shards']} shards • "
+            f"{summary['events_per_second']} év/s • {summary['stats'].get('messages_moderated', 0)} modérés"
+        )
+        try:
+            os.makedirs(os.path.dirname(self.metrics_path) or ".", exist_ok=True)
+            with open(self.metrics_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
+            os.replace(self.metrics_path + ".tmp", self.metrics_path)
+        except OSError as e:
+            self.logger.error(f"Erreur lors de l'écriture des métriques du cluster: {e}")
+        return summary
+
+    def run(self) -> None:
+        """Démarre les processus et les surveille jusqu'à l'arrêt (Ctrl+C)"""
+        for worker in self.workers.values():
+            self._start(worker)
+
+        next_report = time.monotonic() + self.report_interval
+        try:
+            while True:
+                self._poll(timeout=min(1.0, max(0.0, next_report - time.monotonic())))
+                if time.monotonic() >= next_report:
+                    self.report()
+                    next_report = time.monotonic() + self.report_interval
+        except KeyboardInterrupt:
+            self.logger.info("⚖️ Arrêt du cluster demandé")
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 15.0) -> None:
+        """Arrête les processus : arrêt propre attendu, puis forcé"""
+        self._stopping = True
+        deadline = time.monotonic() + timeout
+        for worker in self.workers.values():
+            if worker.process is None:
+                continue
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                self.logger.warning(f"⚠️ Cluster {worker.cluster.id} ne répond pas, arrêt forcé")
+                worker.process.terminate()
+                worker.process.join()
+            worker.conn.close()
+            worker.process, worker.conn = None, None
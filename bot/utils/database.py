@@ -0,0 +1,89 @@
+"""
+🏛️ Base de données pour Themis-Bot
+Connexion SQLite partagée entre les modules (aiosqlite)
+"""
+
+import os
+import logging
+from typing import Any, Iterable, List, Optional
+
+import aiosqlite
+
+
+class Database:
+    """Gestionnaire de la base SQLite partagée (data/themis.db)"""
+
+    def __init__(self, db_path: str = "data/themis.db"):
+        self.db_path = db_path
+        self.logger = logging.getLogger(__name__)
+        self._conn: Optional[aiosqlite.Connection] = None
+
+    async def connect(self) -> None:
+        """Ouvre la connexion et crée les tables communes"""
+        if self._conn is not None:
+            return
+
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = await aiosqlite.connect(self.db_path)
+        self._conn.row_factory = aiosqlite.Row
+
+        # WAL : lectures concurrentes pendant les écritures, commits moins coûteux
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        await self._conn.execute("PRAGMA synchronous=NORMAL")
+        await self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        await self._conn.commit()
+        self.logger.info(f"🗄️ Base de données ouverte: {self.db_path}")
+
+    async def close(self) -> None:
+        """Ferme la connexion"""
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    @property
+    def conn(self) -> aiosqlite.Connection:
+        """Connexion active (connect() doit avoir été appelé)"""
+        if self._conn is None:
+            raise RuntimeError("Base de données non connectée")
+        return self._conn
+
+    async def executescript(self, script: str) -> None:
+        """Exécute un script SQL (création de schéma)"""
+        await self.conn.executescript(script)
+        await self.conn.commit()
+
+    async def execute(self, sql: str, params: Iterable[Any] = ()) -> int:
+        """Exécute une requête d'écriture et retourne le rowid inséré"""
+        cursor = await self.conn.execute(sql, tuple(params))
+        await self.conn.commit()
+        return cursor.lastrowid
+
+    async def executemany(self, sql: str, rows: Iterable[Iterable[Any]]) -> None:
+        """Exécute une requête d'écriture pour plusieurs lignes dans une transaction"""
+        await self.conn.executemany(sql, [tuple(row) for row in rows])
+        await self.conn.commit()
+
+    async def fetchall(self, sql: str, params: Iterable[Any] = ()) -> List[aiosqlite.Row]:
+        """Exécute une requête de lecture et retourne toutes les lignes"""
+        async with self.conn.execute(sql, tuple(params)) as cursor:
+            return list(await cursor.fetchall())
+
+    async def fetchone(self, sql: str, params: Iterable[Any] = ()) -> Optional[aiosqlite.Row]:
+        """Exécute une requête de lecture et retourne la première ligne"""
+        async with self.conn.execute(sql, tuple(params)) as cursor:
+            return await cursor.fetchone()
+
+    async def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Lit une valeur de la table meta"""
+        row = await self.fetchone("SELECT value FROM meta WHERE key = ?", (key,))
+        return row["value"] if row else default
+
+    async def set_meta(self, key: str, value: str) -> None:
+        """Écrit une valeur dans la table meta"""
+        await self.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
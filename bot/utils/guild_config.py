@@ -0,0 +1,170 @@
+"""
+🗂️ Configuration par serveur pour Themis-Bot
+Valeurs propres à chaque serveur en base, servies par un cache LRU en mémoire ;
+une valeur absente retombe sur la configuration globale (config.json, rules.json, sécurité)
+"""
+
+import json
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_config (
+    guild_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (guild_id, key)
+);
+"""
+
+TRUE_VALUES = {"true", "1", "oui", "on", "vrai"}
+FALSE_VALUES = {"false", "0", "non", "off", "faux"}
+
+
+@dataclass(frozen=True)
+class Setting:
+    """Réglage modifiable par serveur : type attendu et valeur globale par défaut"""
+    type: type
+    default: Callable[[Any], Any]
+    description: str
+
+
+def _security_default(key: str, fallback: Any) -> Callable[[Any], Any]:
+    def default(bot):
+        cog = bot.get_cog("SecurityCog")
+        return cog.security_config.get(key, fallback) if cog is not None else fallback
+    return default
+
+
+SETTINGS: Dict[str, Setting] = {
+    "prefix": Setting(str, lambda bot: bot.config.get('bot.prefix', '!'), "Préfixe des commandes textuelles"),
+    "moderation.auto_delete": Setting(
+        bool, lambda bot: bot.config.get('moderation.auto_delete', True),
+        "Modération automatique des messages"
+    ),
+    "channel_rules": Setting(
+        dict, lambda bot: bot.rules.get('channel_rules', {}),
+        "Règles par canal (JSON, même format que rules.json)"
+    ),
+    "security.max_requests_per_minute": Setting(
+        int, _security_default('max_requests_per_minute', 10),
+        "Commandes de sécurité par utilisateur et par minute"
+    ),
+    "security.test_timeout": Setting(
+        int, _security_default('test_timeout', 30),
+        "Délai des tests de connectivité (secondes)"
+    )
+}
+
+
+def parse_value(key: str, raw: str) -> Any:
+    """Convertit la saisie d'un administrateur vers le type du réglage (ValueError si invalide)"""
+    setting = SETTINGS.get(key)
+    if setting is None:
+        raise ValueError(f"Réglage inconnu : {key}")
+    raw = raw.strip()
+    if setting.type is bool:
+        if raw.lower() in TRUE_VALUES:
+            return True
+        if raw.lower() in FALSE_VALUES:
+            return False
+        raise ValueError("Valeur attendue : oui/non, true/false, on/off")
+    if setting.type is int:
+        try:
+            return int(raw)
+        except ValueError:
+            raise ValueError("Nombre entier attendu") from None
+    if setting.type is dict:
+        try:
+            value = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"JSON invalide ({e.msg}, position {e.pos})") from None
+        if not isinstance(value, dict):
+            raise ValueError("Un objet JSON est attendu")
+        return value
+    if not raw:
+        raise ValueError("Une valeur non vide est attendue")
+    return raw
+
+
+class GuildConfig:
+    """
+    Réglages par serveur
+    Chaque entrée du cache est le dict complet (valeurs globales + surcharges du serveur) :
+    une lecture en cache se résume à une recherche dans un dict. Le cache est invalidé
+    par /config set, au départ d'un serveur, et en entier par invalidate() (valeurs globales changées)
+    """
+
+    def __init__(self, bot, capacity: int = 500):
+        self.bot = bot
+        self.db = bot.db
+        self.capacity = capacity
+        self.logger = logging.getLogger(__name__)
+        # serveur -> réglages résolus, du moins au plus récemment utilisé
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        bot.add_listener(self.on_guild_remove, "on_guild_remove")
+
+    async def setup(self) -> None:
+        await self.db.executescript(SCHEMA)
+
+    def defaults(self) -> Dict[str, Any]:
+        """Valeurs globales de chaque réglage"""
+        return {key: setting.default(self.bot) for key, setting in SETTINGS.items()}
+
+    async def overrides(self, guild_id: int) -> Dict[str, Any]:
+        """Valeurs propres à ce serveur"""
+        rows = await self.db.fetchall("SELECT key, value FROM guild_config WHERE guild_id = ?", (guild_id,))
+        return {row["key"]: json.loads(row["value"]) for row in rows if row["key"] in SETTINGS}
+
+    async def get_all(self, guild_id: Optional[int]) -> Dict[str, Any]:
+        """Réglages résolus d'un serveur (valeurs globales hors serveur)"""
+        if guild_id is None:
+            return self.defaults()
+        values = self._cache.get(guild_id)
+        if values is not None:
+            self.hits += 1
+            self._cache.move_to_end(guild_id)
+            return values
+
+        self.misses += 1
+        values = {**self.defaults(), **await self.overrides(guild_id)}
+        self._cache[guild_id] = values
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+        return values
+
+    async def get(self, guild_id: Optional[int], key: str) -> Any:
+        return (await self.get_all(guild_id))[key]
+
+    async def set(self, guild_id: int, key: str, value: Any) -> None:
+        """Enregistre une valeur propre au serveur"""
+        if key not in SETTINGS:
+            raise ValueError(f"Réglage inconnu : {key}")
+        await self.db.execute(
+            "INSERT INTO guild_config (guild_id, key, value, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (guild_id, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            (guild_id, key, json.dumps(value, ensure_ascii=False), time.time())
+        )
+        self._cache.pop(guild_id, None)
+
+    async def reset(self, guild_id: int, key: str) -> None:
+        """Retire la valeur propre au serveur : la valeur globale s'applique de nouveau"""
+        await self.db.execute("DELETE FROM guild_config WHERE guild_id = ? AND key = ?", (guild_id, key))
+        self._cache.pop(guild_id, None)
+
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """Vide le cache d'un serveur, ou de tous (après un changement des valeurs globales)"""
+        if guild_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(guild_id, None)
+
+    async def on_guild_remove(self, guild):
+        self._cache.pop(guild.id, None)
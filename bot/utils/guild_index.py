@@ -0,0 +1,148 @@
+"""
+🗂️ Index des rôles et canaux par serveur pour Themis-Bot
+Résolution nom -> objet en O(1), maintenue par les événements Discord
+"""
+
+import logging
+from typing import Dict, List, Optional, Type
+
+import discord
+
+# serveur -> nom -> IDs (homonymes départagés à la lecture, par position)
+NameIndex = Dict[int, Dict[str, List[int]]]
+
+
+class GuildIndex:
+    """
+    Service partagé de résolution des rôles et canaux par nom
+    Chaque serveur est indexé une fois, puis mis à jour de façon incrémentale
+    à partir des événements de création, modification et suppression
+    """
+
+    def __init__(self, bot, aliases: Optional[Dict[str, str]] = None):
+        self.bot = bot
+        self.logger = logging.getLogger(__name__)
+        # Alias configurés : nom canonique utilisé par le code -> nom réel sur le serveur
+        self.aliases: Dict[str, str] = dict(aliases or {})
+        self._roles: NameIndex = {}
+        self._channels: NameIndex = {}
+
+        for event in (
+            "on_guild_available", "on_guild_join", "on_guild_remove",
+            "on_guild_role_create", "on_guild_role_update", "on_guild_role_delete",
+            "on_guild_channel_create", "on_guild_channel_update", "on_guild_channel_delete"
+        ):
+            bot.add_listener(getattr(self, event), event)
+
+    # ---- Construction -------------------------------------------------
+
+    def _build(self, guild: discord.Guild) -> None:
+        roles: Dict[str, List[int]] = {}
+        for role in guild.roles:
+            roles.setdefault(role.name, []).append(role.id)
+
+        channels: Dict[str, List[int]] = {}
+        for channel in guild.channels:
+            channels.setdefault(channel.name, []).append(channel.id)
+
+        self._roles[guild.id] = roles
+        self._channels[guild.id] = channels
+
+    def _ensure(self, guild: discord.Guild) -> None:
+        if guild.id not in self._roles:
+            self._build(guild)
+
+    @staticmethod
+    def _add(index: Dict[str, List[int]], name: str, object_id: int) -> None:
+        ids = index.setdefault(name, [])
+        if object_id not in ids:
+            ids.append(object_id)
+
+    @staticmethod
+    def _remove(index: Dict[str, List[int]], name: str, object_id: int) -> None:
+        ids = index.get(name)
+        if ids and object_id in ids:
+            ids.remove(object_id)
+            if not ids:
+                del index[name]
+
+    def _resolve_name(self, name: str) -> str:
+        return self.aliases.get(name, name)
+
+    @staticmethod
+    def _first(candidates):
+        """Homonymes : le plus bas dans la liste du serveur, comme discord.utils.get sur guild.roles"""
+        return min(candidates, key=lambda obj: (obj.position, obj.id), default=None)
+
+    # ---- Recherches ---------------------------------------------------
+
+    def role(self, guild: discord.Guild, name: str) -> Optional[discord.Role]:
+        """Retourne le rôle portant ce nom (ou cet alias)"""
+        self._ensure(guild)
+        return self._first(
+            role for role in map(guild.get_role, self._roles[guild.id].get(self._resolve_name(name), ()))
+            if role is not None
+        )
+
+    def roles(self, guild: discord.Guild, names) -> List[discord.Role]:
+        """Retourne les rôles existants parmi une liste de noms, dans l'ordre de la liste"""
+        return [role for role in (self.role(guild, name) for name in names) if role is not None]
+
+    def channel(
+        self,
+        guild: discord.Guild,
+        name: str,
+        channel_type: Optional[Type[discord.abc.GuildChannel]] = None
+    ) -> Optional[discord.abc.GuildChannel]:
+        """Retourne le canal portant ce nom (ou cet alias), éventuellement filtré par type"""
+        self._ensure(guild)
+        return self._first(
+            channel for channel in map(guild.get_channel, self._channels[guild.id].get(self._resolve_name(name), ()))
+            if channel is not None and (channel_type is None or isinstance(channel, channel_type))
+        )
+
+    def text_channel(self, guild: discord.Guild, name: str) -> Optional[discord.TextChannel]:
+        """Raccourci pour un canal textuel"""
+        return self.channel(guild, name, discord.TextChannel)
+
+    def category(self, guild: discord.Guild, name: str) -> Optional[discord.CategoryChannel]:
+        """Raccourci pour une catégorie"""
+        return self.channel(guild, name, discord.CategoryChannel)
+
+    # ---- Événements ---------------------------------------------------
+
+    async def on_guild_available(self, guild: discord.Guild):
+        self._build(guild)
+
+    async def on_guild_join(self, guild: discord.Guild):
+        self._build(guild)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._roles.pop(guild.id, None)
+        self._channels.pop(guild.id, None)
+
+    async def on_guild_role_create(self, role: discord.Role):
+        if role.guild.id in self._roles:
+            self._add(self._roles[role.guild.id], role.name, role.id)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name and after.guild.id in self._roles:
+            self._remove(self._roles[after.guild.id], before.name, before.id)
+            self._add(self._roles[after.guild.id], after.name, after.id)
+
+    async def on_guild_role_delete(self, role: discord.Role):
+        if role.guild.id in self._roles:
+            self._remove(self._roles[role.guild.id], role.name, role.id)
+
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if channel.guild.id in self._channels:
+            self._add(self._channels[channel.guild.id], channel.name, channel.id)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if before.name != after.name and after.guild.id in self._channels:
+            self._remove(self._channels[after.guild.id], before.name, before.id)
+            self._add(self._channels[after.guild.id], after.name, after.id)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.guild.id in self._channels:
+            self._remove(self._channels[channel.guild.id], channel.name, channel.id)
@@ -0,0 +1,141 @@
+"""
+📜 Journal des tickets pour Themis-Bot
+Capture incrémentale des messages des canaux de tickets
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+import aiofiles
+
+# Nombre de tickets finalisés mémorisés pour ignorer les écritures tardives
+CLOSED_MEMORY = 1024
+
+
+class TicketJournal:
+    """
+    Journal append-only par ticket
+    Chaque message est écrit au fil de l'eau, la fermeture ne fait que finaliser le fichier
+    """
+
+    def __init__(self, journal_dir: str = "data/tickets/journals/"):
+        self.journal_dir = journal_dir
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Derniers tickets finalisés (ordre de fermeture) : un message arrivé entre la fermeture
+        # et l'oubli du ticket ne doit pas recréer de journal
+        self._closed: Dict[str, None] = {}
+        os.makedirs(self.journal_dir, exist_ok=True)
+
+    def path_for(self, ticket_id: str) -> str:
+        """Chemin du journal d'un ticket"""
+        return os.path.join(self.journal_dir, f"journal_{ticket_id}.log")
+
+    def exists(self, ticket_id: str) -> bool:
+        """Indique si un journal est ouvert pour ce ticket"""
+        return os.path.exists(self.path_for(ticket_id))
+
+    def _lock(self, ticket_id: str) -> asyncio.Lock:
+        lock = self._locks.get(ticket_id)
+        if lock is None:
+            lock = self._locks[ticket_id] = asyncio.Lock()
+        return lock
+
+    async def _append(self, ticket_id: str, text: str) -> None:
+        """Ajoute du texte au journal (les écritures d'un même ticket restent ordonnées)"""
+        async with self._lock(ticket_id):
+            if ticket_id in self._closed:
+                return
+            async with aiofiles.open(self.path_for(ticket_id), "a", encoding="utf-8") as f:
+                await f.write(text)
+
+    async def open(self, ticket_id: str, channel_name: str, user_id: str) -> None:
+        """Ouvre le journal d'un nouveau ticket avec l'en-tête du transcript"""
+        header = "=== TRANSCRIPT DU TICKET ===\n"
+        header += f"Canal: #{channel_name}\n"
+        header += f"ID Ticket: {ticket_id}\n"
+        header += f"Utilisateur: {user_id}\n"
+        header += f"Ouvert le: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        header += "=" * 50 + "\n\n"
+        await self._append(ticket_id, header)
+
+    async def append_message(self, ticket_id: str, message) -> None:
+        """Enregistre un message publié dans le canal du ticket"""
+        timestamp = message.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        author = f"{message.author.display_name} ({message.author.id})"
+        content = message.content or "[Message sans contenu]"
+
+        entry = f"[{timestamp}] {author}: {content}\n"
+
+        for attachment in message.attachments:
+            entry += (
+                f"  📎 Pièce jointe: {attachment.filename} "
+                f"({attachment.size} octets, {attachment.content_type or 'type inconnu'}) "
+                f"({attachment.url})\n"
+            )
+
+        for embed in message.embeds:
+            entry += f"  📋 Embed: {embed.title or 'Sans titre'}\n"
+
+        await self._append(ticket_id, entry)
+
+    async def append_edit(self, ticket_id: str, payload) -> None:
+        """Enregistre la modification d'un message (événement brut, cache non requis)"""
+        data = payload.data
+        if "content" not in data:
+            # Mise à jour sans changement de contenu (embed déplié, épinglage...)
+            return
+
+        edited_at = data.get("edited_timestamp")
+        if edited_at:
+            timestamp = datetime.fromisoformat(edited_at).strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+        author = data.get("author", {})
+        author_text = f"{author.get('global_name') or author.get('username', 'Inconnu')} ({author.get('id', '?')})"
+        content = data.get("content") or "[Message sans contenu]"
+
+        entry = f"[{timestamp}] ✏️ {author_text} a modifié le message {payload.message_id}: {content}\n"
+
+        for attachment in data.get("attachments", []):
+            entry += (
+                f"  📎 Pièce jointe: {attachment.get('filename')} "
+                f"({attachment.get('size', 0)} octets, {attachment.get('content_type') or 'type inconnu'}) "
+                f"({attachment.get('url')})\n"
+            )
+
+        await self._append(ticket_id, entry)
+
+    async def append_delete(self, ticket_id: str, message_id: int) -> None:
+        """Enregistre la suppression d'un message"""
+        timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        await self._append(ticket_id, f"[{timestamp}] 🗑️ Message {message_id} supprimé\n")
+
+    async def finalize(self, ticket_id: str, transcript_path: str, closer: Optional[str], reason: str) -> bool:
+        """
+        Clôt le journal et le renomme en transcript
+        Coût constant quelle que soit la longueur du ticket
+        """
+        if not self.exists(ticket_id):
+            return False
+
+        footer = "\n" + "=" * 50 + "\n"
+        footer += f"Fermé le: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        if closer:
+            footer += f"Fermé par: {closer}\n"
+        footer += f"Raison: {reason}\n"
+
+        async with self._lock(ticket_id):
+            if ticket_id in self._closed:
+                return False
+            async with aiofiles.open(self.path_for(ticket_id), "a", encoding="utf-8") as f:
+                await f.write(footer)
+            os.replace(self.path_for(ticket_id), transcript_path)
+            self._closed[ticket_id] = None
+            if len(self._closed) > CLOSED_MEMORY:
+                del self._closed[next(iter(self._closed))]
+
+        self._locks.pop(ticket_id, None)
+        return True
@@ -0,0 +1,270 @@
+"""
+⚖️ Exécution du Jugement Divin pour Themis-Bot
+Reset du serveur en tâche de fond : suppressions parallèles rythmées par les limites de l'API,
+point de reprise sur disque et progression affichée dans le canal de rédemption
+"""
+
+import asyncio
+import json
+import os
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import discord
+
+CHANNEL_REASON = "⚖️ Jugement Divin - Purification totale"
+ROLE_REASON = "⚖️ Jugement Divin - Abolition des privilèges"
+REDEMPTION_TOPIC = "🕊️ Seul canal survivant au Jugement Divin. Ici commence votre rédemption."
+
+
+class DivineJudgment:
+    """
+    Un jugement par serveur, décrit par un fichier de reprise dans `directory`
+    Les suppressions sont idempotentes : à la reprise, il suffit de supprimer ce qui existe encore
+    Le fichier n'est effacé qu'une fois le jugement terminé
+    """
+
+    def __init__(self, bot, directory: str = "data/judgment/", concurrency: int = 5, batch_size: int = 25,
+                 snapshots=None):
+        self.bot = bot
+        self.directory = directory
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.snapshots = snapshots
+        self.logger = logging.getLogger(__name__)
+        self._tasks: Dict[int, asyncio.Task] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    # ---- Points de reprise ----
+
+    def _path(self, guild_id: int) -> str:
+        return os.path.join(self.directory, f"{guild_id}.json")
+
+    def _load(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(guild_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        path = self._path(state["guild_id"])
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def _clear(self, guild_id: int) -> None:
+        try:
+            os.remove(self._path(guild_id))
+        except FileNotFoundError:
+            pass
+
+    # ---- Cycle de vie ----
+
+    def running(self, guild_id: int) -> bool:
+        task = self._tasks.get(guild_id)
+        return task is not None and not task.done()
+
+    def start(self, guild: discord.Guild, moderator: discord.abc.User) -> None:
+        """Lance un jugement (ou reprend celui en cours pour ce serveur)"""
+        state = self._load(guild.id) or {
+            "guild_id": guild.id,
+            "moderator": str(moderator),
+            "started_at": datetime.utcnow().isoformat(),
+            "phase": "snapshot",
+            "redemption_channel_id": None,
+            "progress_message_id": None,
+            "deleted_channels": 0,
+            "deleted_roles": 0,
+            "errors": []
+        }
+        self._spawn(guild, state)
+
+    def resume_all(self) -> int:
+        """Reprend les jugements interrompus (redémarrage du bot). Retourne le nombre de reprises"""
+        resumed = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            guild = self.bot.get_guild(int(name[:-len(".json")]))
+            state = self._load(int(name[:-len(".json")]))
+            if guild is None or state is None or self.running(guild.id):
+                continue
+            self.logger.warning(f"⚖️ Reprise du Jugement Divin sur {guild.name} (phase {state['phase']})")
+            self._spawn(guild, state)
+            resumed += 1
+        return resumed
+
+    def _spawn(self, guild: discord.Guild, state: Dict[str, Any]) -> None:
+        if self.running(guild.id):
+            return
+        task = asyncio.create_task(self._run(guild, state))
+        self._tasks[guild.id] = task
+        task.add_done_callback(lambda t: self._tasks.pop(guild.id, None))
+
+    def cancel_all(self) -> None:
+        """Interrompt les jugements en cours ; les fichiers de reprise sont conservés"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    # ---- Exécution ----
+
+    async def _run(self, guild: discord.Guild, state: Dict[str, Any]) -> None:
+        try:
+            if state["phase"] == "snapshot":
+                if self.snapshots is not None:
+                    # Dernière chance de revenir en arrière avec /restore
+                    try:
+                        await self.snapshots.capture(guild)
+                    except Exception as e:
+                        state["errors"].append(f"Snapshot: {e}")
+                state["phase"] = "channels"
+                await asyncio.to_thread(self._save, state)
+
+            redemption = await self._redemption_channel(guild, state)
+
+            if state["phase"] == "channels":
+                await self._delete_channels(guild, state, redemption)
+                state["phase"] = "roles"
+                await asyncio.to_thread(self._save, state)
+
+            if state["phase"] == "roles":
+                await self._delete_roles(guild, state, redemption)
+                state["phase"] = "done"
+
+            await self._post_progress(redemption, state)
+            await redemption.send(embed=self._final_embed(state))
+            await asyncio.to_thread(self._clear, guild.id)
+            self.logger.warning(
+                f"⚖️ JUGEMENT DIVIN exécuté par {state['moderator']} - Serveur {guild.name} purifié "
+                f"({state['deleted_channels']} canaux, {state['deleted_roles']} rôles)"
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Le fichier de reprise reste en place : la prochaine exécution reprendra ici
+            self.logger.error(f"Erreur lors du Jugement Divin sur {guild.name}: {e}")
+
+    async def _redemption_channel(self, guild: discord.Guild, state: Dict[str, Any]) -> discord.TextChannel:
+        """Canal de rédemption créé dès le début pour y suivre la progression ; jamais supprimé"""
+        channel = guild.get_channel(state["redemption_channel_id"] or 0)
+        if channel is None:
+            channel = await guild.create_text_channel(
+                name="rédemption",
+                topic=REDEMPTION_TOPIC,
+                reason="⚖️ Jugement Divin - Canal de la dernière chance"
+            )
+            state["redemption_channel_id"] = channel.id
+            state["progress_message_id"] = None
+            await asyncio.to_thread(self._save, state)
+        return channel
+
+    async def _delete_channels(self, guild, state, redemption) -> None:
+        channels = [channel for channel in guild.channels if channel.id != redemption.id]
+        # Chaque canal a son propre compteur côté Discord : la concurrence est bornée par `concurrency`
+        await self._delete_batches(
+            state, redemption, "deleted_channels", "Canal",
+            [(channel, "DELETE", f"/channels/{channel.id}", lambda c=channel: c.delete(reason=CHANNEL_REASON))
+             for channel in channels]
+        )
+
+    async def _delete_roles(self, guild, state, redemption) -> None:
+        roles = [role for role in guild.roles if not role.is_default() and not role.managed]
+        await self._delete_batches(
+            state, redemption, "deleted_roles", "Rôle",
+            [(role, "DELETE", f"/guilds/{guild.id}/roles/{role.id}", lambda r=role: r.delete(reason=ROLE_REASON))
+             for role in roles]
+        )
+
+    async def _delete_batches(self, state, redemption, counter, label, requests) -> None:
+        """Suppressions par lots ; point de reprise et progression enregistrés après chaque lot"""
+        for start in range(0, len(requests), self.batch_size):
+            batch = requests[start:start + self.batch_size]
+            results = await self.bot.rest.run_many(
+                [(method, path, job) for _, method, path, job in batch],
+                self.concurrency, guild_id=state["guild_id"]
+            )
+            for (target, *_), result in zip(batch, results):
+                if isinstance(result, discord.NotFound):
+                    continue
+                if isinstance(result, Exception):
+                    state["errors"].append(f"{label} {target.name}: {result}")
+                else:
+                    state[counter] += 1
+
+            await asyncio.to_thread(self._save, state)
+            await self._post_progress(redemption, state, remaining=len(requests) - start - len(batch))
+
+    async def _post_progress(self, redemption, state, remaining: Optional[int] = None) -> None:
+        """Met à jour (ou crée) le message de progression dans le canal de rédemption"""
+        phases = {
+            "channels": "🗑️ Phase 1 : Purification des Canaux",
+            "roles": "👥 Phase 2 : Abolition de la Hiérarchie",
+            "done": "🕊️ Phase 3 : Création de l'Espoir"
+        }
+        embed = discord.Embed(
+            title="⚖️ LE JUGEMENT DIVIN EST EN COURS",
+            description=f"**{phases.get(state['phase'], state['phase'])}**",
+            color=0x8B0000,
+            timestamp=datetime.utcnow()
+        )
+        embed.add_field(name="🗑️ Canaux supprimés", value=f"`{state['deleted_channels']}`", inline=True)
+        embed.add_field(name="👥 Rôles abolis", value=f"`{state['deleted_roles']}`", inline=True)
+        if remaining is not None:
+            embed.add_field(name="⏳ Restants (phase)", value=f"`{remaining}`", inline=True)
+
+        try:
+            if state["progress_message_id"]:
+                await redemption.get_partial_message(state["progress_message_id"]).edit(embed=embed)
+                return
+            message = await redemption.send(embed=embed)
+            state["progress_message_id"] = message.id
+            await asyncio.to_thread(self._save, state)
+        except discord.NotFound:
+            state["progress_message_id"] = None
+        except discord.HTTPException as e:
+            self.logger.warning(f"Progression du Jugement Divin non publiée: {e}")
+
+    @staticmethod
+    def _final_embed(state: Dict[str, Any]) -> discord.Embed:
+        elapsed = (datetime.utcnow() - datetime.fromisoformat(state["started_at"])).total_seconds()
+        final_embed = discord.Embed(
+            title="⚖️ LE JUGEMENT DIVIN EST RENDU",
+            description="🔥 **La purification est accomplie** 🔥\n\n"
+                       f"📊 **Bilan de la Justice :**\n"
+                       f"• 🗑️ Canaux supprimés : `{state['deleted_channels']}`\n"
+                       f"• 👥 Rôles abolis : `{state['deleted_roles']}`\n"
+                       f"• 🕊️ Canaux de rédemption : `1`\n"
+                       f"• ⏱️ Durée : `{elapsed:.0f}s`\n\n"
+                       "🌅 **Nouveau Commencement :**\n"
+                       "Ce serveur a été purifié par la justice divine.\n"
+                       "Seul ce canal demeure pour permettre la rédemption.\n"
+                       "Utilisez `/setup appliquer` pour reconstruire un royaume juste, "
+                       "ou `/restore` pour revenir à l'état d'avant le jugement.",
+            color=0x9932CC,
+            timestamp=datetime.utcnow()
+        )
+
+        final_embed.add_field(
+            name="📜 Décret Divin",
+            value="*« Que cette destruction serve de leçon. »*\n"
+                  "*« De ces cendres renaîtra un royaume plus juste. »*\n"
+                  "*« Car telle est la volonté de Thémis. »*",
+            inline=False
+        )
+
+        errors = state["errors"]
+        if errors:
+            error_text = "\n".join(errors[:5])
+            if len(errors) > 5:
+                error_text += f"\n... et {len(errors) - 5} autres erreurs"
+            final_embed.add_field(
+                name="⚠️ Résistances Mineures",
+                value=f"```{error_text[:1000]}```",
+                inline=False
+            )
+
+        final_embed.set_footer(text="Themis-Bot • Justice Divine Accomplie")
+        return final_embed
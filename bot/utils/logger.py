@@ -7,12 +7,18 @@ import logging
 import os
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
+from typing import Optional
 
-def setup_logger() -> None:
-    """Configure le système de logging pour Themis-Bot"""
+def setup_logger(cluster_id: Optional[int] = None) -> None:
+    """
+    Configure le système de logging pour Themis-Bot
+    En mode cluster, chaque processus a son propre fichier et préfixe ses lignes
+    """
     
     # Création du dossier logs s'il n'existe pas
     os.makedirs("logs", exist_ok=True)
+    suffix = f"_c{cluster_id}" if cluster_id is not None else ""
+    prefix = f"[c{cluster_id}] " if cluster_id is not None else ""
     
     # Configuration du logger principal
     logger = logging.getLogger()
@@ -20,13 +26,13 @@ def setup_logger() -> None:
     
     # Formatter pour les logs
     formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)8s | %(name)s | %(message)s',
+        prefix + '%(asctime)s | %(levelname)8s | %(name)s | %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
     # Handler pour fichier avec rotation
     file_handler = RotatingFileHandler(
-        f"logs/themis_{datetime.now().strftime('%Y%m%d')}.log",
+        f"logs/themis_{datetime.now().strftime('%Y%m%d')}{suffix}.log",
         maxBytes=10*1024*1024,  # 10 MB
         backupCount=5,
         encoding='utf-8'
@@ -37,7 +43,7 @@ def setup_logger() -> None:
     # Handler pour console avec couleurs
     console_handler = logging.StreamHandler()
     console_formatter = ColoredFormatter(
-        '%(log_color)s%(asctime)s | %(levelname)8s | %(name)s | %(message)s%(reset)s',
+        '%(log_color)s' + prefix + '%(asctime)s | %(levelname)8s | %(name)s | %(message)s%(reset)s',
         datefmt='%H:%M:%S'
     )
     console_handler.setFormatter(console_formatter)
@@ -0,0 +1,173 @@
+"""
+📈 Compteurs de membres pour Themis-Bot
+Membres, bots et porteurs de chaque rôle comptés une fois, puis tenus à jour par les événements
+"""
+
+import logging
+from collections import Counter
+from itertools import islice
+from typing import Dict, List
+
+import discord
+
+
+class GuildCounters:
+    """Compteurs d'un serveur"""
+
+    __slots__ = ("humans", "bots", "roles")
+
+    def __init__(self):
+        self.humans = 0
+        self.bots = 0
+        # rôle -> nombre de membres qui le portent (@everyone exclu : c'est le total)
+        self.roles: Counter = Counter()
+
+    def add(self, member: discord.Member, sign: int = 1) -> None:
+        if member.bot:
+            self.bots += sign
+        else:
+            self.humans += sign
+        for role in member.roles:
+            self.roles[role.id] += sign
+
+
+class MemberStats:
+    """
+    Service partagé de statistiques de membres
+    Chaque serveur est parcouru une fois (dès que sa liste de membres est complète), puis les
+    compteurs suivent les arrivées, départs et changements de rôles : les lectures sont en O(1)
+    Sans liste complète (chargement à la demande, voir ThemisBot.ensure_chunked), complete() est faux
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.logger = logging.getLogger(__name__)
+        self._guilds: Dict[int, GuildCounters] = {}
+        # utilisateur -> nombre de serveurs en commun (pour le nombre d'utilisateurs distincts)
+        self._users: Counter = Counter()
+
+        for event in (
+            "on_guild_available", "on_guild_join", "on_guild_remove",
+            "on_member_join", "on_member_remove", "on_member_update",
+            "on_guild_role_delete"
+        ):
+            bot.add_listener(getattr(self, event), event)
+
+    # ---- Construction -------------------------------------------------
+
+    def _build(self, guild: discord.Guild) -> GuildCounters:
+        if guild.id in self._guilds:
+            self._forget(guild)
+        counters = GuildCounters()
+        for member in guild.members:
+            counters.add(member)
+            self._users[member.id] += 1
+        self._guilds[guild.id] = counters
+        return counters
+
+    def _forget(self, guild: discord.Guild) -> None:
+        if self._guilds.pop(guild.id, None) is None:
+            return
+        for member in guild.members:
+            self._users[member.id] -= 1
+            if self._users[member.id] <= 0:
+                del self._users[member.id]
+
+    def refresh(self, guild: discord.Guild) -> None:
+        """Recompte un serveur dont la liste des membres vient d'être chargée"""
+        self._build(guild)
+
+    def complete(self, guild: discord.Guild) -> bool:
+        """Les compteurs couvrent-ils tous les membres du serveur ?"""
+        return guild.chunked
+
+    def _counters(self, guild: discord.Guild) -> GuildCounters:
+        counters = self._guilds.get(guild.id)
+        if counters is not None:
+            return counters
+        if guild.chunked:
+            return self._build(guild)
+        # Liste incomplète : décompte ponctuel du cache, jamais conservé (le serveur reste
+        # compté par son member_count dans unique_users() et signalé par partial())
+        counters = GuildCounters()
+        for member in guild.members:
+            counters.add(member)
+        return counters
+
+    # ---- Lectures -----------------------------------------------------
+
+    def humans(self, guild: discord.Guild) -> int:
+        return self._counters(guild).humans
+
+    def bots(self, guild: discord.Guild) -> int:
+        return self._counters(guild).bots
+
+    def role_count(self, role: discord.Role) -> int:
+        """Nombre de membres portant ce rôle (équivalent de len(role.members))"""
+        counters = self._counters(role.guild)
+        if role.is_default():
+            return counters.humans + counters.bots
+        return counters.roles.get(role.id, 0)
+
+    def unique_users(self) -> int:
+        """
+        Utilisateurs distincts sur l'ensemble des serveurs
+        Un serveur pas encore parcouru compte pour son member_count annoncé par Discord :
+        ses membres ne sont pas dédoublonnés avec ceux des autres serveurs (voir partial())
+        """
+        uncounted = sum(
+            guild.member_count or 0 for guild in self.bot.guilds if guild.id not in self._guilds
+        )
+        return len(self._users) + uncounted
+
+    def partial(self) -> bool:
+        """unique_users() est-il une estimation (au moins un serveur sans liste complète) ?"""
+        return any(guild.id not in self._guilds for guild in self.bot.guilds)
+
+    @staticmethod
+    def role_sample(role: discord.Role, limit: int = 10) -> List[discord.Member]:
+        """Premiers porteurs d'un rôle, sans construire la liste complète de role.members"""
+        return list(islice((member for member in role.guild.members if member.get_role(role.id)), limit))
+
+    # ---- Événements ---------------------------------------------------
+
+    async def on_guild_available(self, guild: discord.Guild):
+        if guild.chunked:
+            self._build(guild)
+
+    async def on_guild_join(self, guild: discord.Guild):
+        if guild.chunked:
+            self._build(guild)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._forget(guild)
+
+    async def on_member_join(self, member: discord.Member):
+        counters = self._guilds.get(member.guild.id)
+        if counters is not None:
+            counters.add(member)
+            self._users[member.id] += 1
+
+    async def on_member_remove(self, member: discord.Member):
+        counters = self._guilds.get(member.guild.id)
+        if counters is not None:
+            counters.add(member, -1)
+            self._users[member.id] -= 1
+            if self._users[member.id] <= 0:
+                del self._users[member.id]
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        counters = self._guilds.get(after.guild.id)
+        if counters is None:
+            return
+        before_roles = {role.id for role in before.roles}
+        after_roles = {role.id for role in after.roles}
+        for role_id in after_roles - before_roles:
+            counters.roles[role_id] += 1
+        for role_id in before_roles - after_roles:
+            counters.roles[role_id] -= 1
+
+    async def on_guild_role_delete(self, role: discord.Role):
+        counters = self._guilds.get(role.guild.id)
+        if counters is not None:
+            counters.roles.pop(role.id, None)
@@ -0,0 +1,221 @@
+"""
+🪪 Stockage des photos d'identité pour Themis-Bot
+Téléchargement par blocs, plafond de taille, déduplication par empreinte et chiffrement optionnel
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import struct
+import uuid
+import logging
+from typing import AsyncIterator, Iterable, Optional
+
+import aiofiles
+import aiohttp
+
+try:
+    import nacl.secret
+    import nacl.utils
+except ImportError:  # PyNaCl est optionnel : sans lui, pas de chiffrement
+    nacl = None
+
+CHUNK_SIZE = 64 * 1024
+# Chaque bloc chiffré est précédé de sa longueur (4 octets, big-endian)
+FRAME_HEADER = struct.Struct(">I")
+
+
+class PhotoTooLarge(Exception):
+    """La pièce jointe dépasse la taille autorisée"""
+
+
+class _DecryptingReader(io.RawIOBase):
+    """
+    Lecture d'une photo chiffrée, déchiffrée bloc par bloc à la demande
+    Utilisable par discord.File : aiohttp la lit par morceaux dans un thread
+    """
+
+    def __init__(self, path: str, box):
+        self._file = open(path, "rb")
+        self._box = box
+        self._buffer = b""
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            header = self._file.read(FRAME_HEADER.size)
+            if not header:
+                return 0
+            (length,) = FRAME_HEADER.unpack(header)
+            self._buffer = self._box.decrypt(self._file.read(length))
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # Pas d'accès direct dans un flux chiffré : retour au début puis avance par blocs
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Recherche depuis la fin non prise en charge")
+        if offset < self._position:
+            self._file.seek(0)
+            self._buffer = b""
+            self._position = 0
+        while self._position < offset and self.read(min(CHUNK_SIZE, offset - self._position)):
+            pass
+        return self._position
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class IdentityPhotoStore:
+    """
+    Un dossier par ticket, un fichier par contenu distinct (nommé d'après son SHA-256)
+    Le fichier n'est jamais chargé entièrement en mémoire, ni au téléchargement ni à la lecture
+    """
+
+    def __init__(self, directory: str = "data/identity_photos/", max_bytes: int = 10 * 1024 * 1024,
+                 key: Optional[str] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        self._box = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        os.makedirs(directory, exist_ok=True)
+
+        if key:
+            if nacl is None:
+                raise RuntimeError("PyNaCl est requis pour chiffrer les photos d'identité")
+            self._box = nacl.secret.SecretBox(bytes.fromhex(key))
+
+    @property
+    def encrypted(self) -> bool:
+        return self._box is not None
+
+    def ticket_dir(self, ticket_id: str) -> str:
+        return os.path.join(self.directory, ticket_id)
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def save(self, ticket_id: str, url: str, declared_size: Optional[int] = None) -> Optional[dict]:
+        """
+        Télécharge une pièce jointe dans le dossier du ticket
+        Retourne {"sha256", "size", "path", "duplicate"} ; lève PhotoTooLarge au-delà du plafond
+        """
+        if declared_size is not None and declared_size > self.max_bytes:
+            raise PhotoTooLarge(f"{declared_size} octets (max {self.max_bytes})")
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+
+        folder = self.ticket_dir(ticket_id)
+        os.makedirs(folder, exist_ok=True)
+        temp_path = os.path.join(folder, f".tmp-{uuid.uuid4().hex}")
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            async with self._session.get(url) as response:
+                response.raise_for_status()
+                async with aiofiles.open(temp_path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            raise PhotoTooLarge(f"plus de {self.max_bytes} octets")
+                        digest.update(chunk)
+                        if self._box is not None:
+                            chunk = self._box.encrypt(chunk)
+                            chunk = FRAME_HEADER.pack(len(chunk)) + chunk
+                        await f.write(chunk)
+        except BaseException:
+            await asyncio.to_thread(self._remove, temp_path)
+            raise
+
+        sha256 = digest.hexdigest()
+        final_path = os.path.join(folder, sha256 + (".enc" if self._box is not None else ".bin"))
+        duplicate = os.path.exists(final_path)
+        if duplicate:
+            # Même contenu déjà reçu pour ce ticket
+            await asyncio.to_thread(self._remove, temp_path)
+        else:
+            os.replace(temp_path, final_path)
+
+        return {"sha256": sha256, "size": size, "path": final_path, "duplicate": duplicate}
+
+    def path_for(self, ticket_id: str, sha256: str) -> Optional[str]:
+        """Chemin d'une photo conservée, chiffrée ou non (None si elle n'existe plus)"""
+        extensions = (".enc", ".bin") if self.encrypted else (".bin", ".enc")
+        for extension in extensions:
+            path = os.path.join(self.ticket_dir(ticket_id), sha256 + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    async def iter_chunks(self, path: str) -> AsyncIterator[bytes]:
+        """Relit une photo bloc par bloc, déchiffrée si nécessaire"""
+        async with aiofiles.open(path, "rb") as f:
+            if not path.endswith(".enc"):
+                while chunk := await f.read(CHUNK_SIZE):
+                    yield chunk
+                return
+
+            if self._box is None:
+                raise RuntimeError("Clé de chiffrement des photos absente")
+            while header := await f.read(FRAME_HEADER.size):
+                (length,) = FRAME_HEADER.unpack(header)
+                yield self._box.decrypt(await f.read(length))
+
+    def open(self, path: str) -> io.IOBase:
+        """
+        Fichier lisible d'une photo (déchiffrée si nécessaire), à joindre avec discord.File
+        Le contenu est lu bloc par bloc pendant l'envoi, jamais chargé entièrement
+        """
+        if not path.endswith(".enc"):
+            return open(path, "rb")
+        if self._box is None:
+            raise RuntimeError("Clé de chiffrement des photos absente")
+        return _DecryptingReader(path, self._box)
+
+    async def purge(self, ticket_id: str) -> None:
+        """Supprime toutes les photos d'un ticket"""
+        await asyncio.to_thread(shutil.rmtree, self.ticket_dir(ticket_id), True)
+
+    async def purge_except(self, active_ticket_ids: Iterable[str]) -> int:
+        """Supprime les photos des tickets qui ne sont plus actifs. Retourne le nombre de dossiers purgés"""
+        keep = set(active_ticket_ids)
+
+        def purge_orphans():
+            purged = 0
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if name not in keep and os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                    purged += 1
+            return purged
+
+        return await asyncio.to_thread(purge_orphans)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,261 @@
+"""
+🚥 Suivi des limites de l'API Discord pour Themis-Bot
+Lit les en-têtes X-RateLimit-* de chaque réponse et rythme les rafales d'appels en conséquence
+"""
+
+import asyncio
+import re
+import time
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
+
+import aiohttp
+from discord import InteractionType, app_commands
+
+API_PREFIX = re.compile(r"^/api(/v\d+)?")
+SNOWFLAKE = re.compile(r"/\d{15,21}")
+# Paramètres majeurs : Discord leur attribue des compteurs distincts
+MAJOR = re.compile(r"^/(channels|guilds|webhooks)/(\d{15,21})")
+
+
+def route_key(method: str, path: str) -> str:
+    """Clé de route à la manière de Discord : « POST /guilds/123/channels », IDs mineurs masqués"""
+    path = API_PREFIX.sub("", path)
+    major = MAJOR.match(path)
+    prefix = ""
+    if major:
+        prefix = major.group(0)
+        path = path[len(prefix):]
+    return f"{method.upper()} {prefix}{SNOWFLAKE.sub('/{id}', path)}"
+
+
+@dataclass
+class ApiUsage:
+    """Appels REST provoqués par une invocation (commande, événement) ; imbricable"""
+    label: str
+    parent: Optional["ApiUsage"] = None
+    calls: int = 0
+    routes: Counter = field(default_factory=Counter)
+    bytes: int = 0
+    rate_limited: int = 0
+    waited: float = 0.0
+
+    def chain(self) -> Iterator["ApiUsage"]:
+        """Cette invocation puis celles qui l'englobent"""
+        usage: Optional[ApiUsage] = self
+        while usage is not None:
+            yield usage
+            usage = usage.parent
+
+    def add_wait(self, seconds: float) -> None:
+        for usage in self.chain():
+            usage.waited += seconds
+
+
+@dataclass
+class UsageTotals:
+    """Cumul par commande ou événement"""
+    invocations: int = 0
+    calls: int = 0
+    max_calls: int = 0
+    bytes: int = 0
+    rate_limited: int = 0
+    waited: float = 0.0
+    routes: Counter = field(default_factory=Counter)
+
+
+# Invocation en cours dans la tâche asyncio courante (suivie à travers les await)
+current_usage: ContextVar[Optional[ApiUsage]] = ContextVar("current_usage", default=None)
+# Clé de l'invocation d'une commande slash dans interaction.extras
+USAGE_EXTRA = "themis.api_usage"
+
+
+class RateLimitTracker:
+    """
+    Branché sur la session HTTP du bot (paramètre `http_trace`) :
+    compte les appels et retient, par route, le budget restant annoncé par Discord
+    Les rafales passent par RestScheduler, qui consulte ce budget avant chaque appel
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None, default_budget: Optional[int] = None,
+                 global_rate: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.total = 0
+        self.by_route: Counter = Counter()
+        self.rate_limited = 0
+        # route -> (requêtes restantes, fin de fenêtre en temps monotone)
+        self._budgets: Dict[str, Tuple[int, float]] = {}
+        # route -> requêtes lancées via acquire() et pas encore terminées
+        self._in_flight: Counter = Counter()
+        # Comptabilité par commande/événement et budgets d'appels (avertissement au-delà)
+        self.usage: Dict[str, UsageTotals] = {}
+        self.budgets = budgets or {}
+        self.default_budget = default_budget
+        # Part de la limite globale de Discord (requêtes/s, tous processus confondus) réservée
+        # à ce processus ; seau à jetons appliqué aux appels passés par acquire()
+        self.global_rate = global_rate
+        self._global_tokens = global_rate or 0.0
+        self._global_at = time.monotonic()
+
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_end.append(self._on_request_end)
+        self.trace_config.on_request_chunk_sent.append(self._on_request_chunk_sent)
+
+    async def _on_request_end(self, session, context, params) -> None:
+        key = route_key(params.method, params.url.path)
+        self.total += 1
+        self.by_route[key] += 1
+
+        headers = params.response.headers
+        if params.response.status == 429:
+            self.rate_limited += 1
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None:
+            self._budgets[key] = (int(remaining), time.monotonic() + float(reset_after))
+
+        usage = current_usage.get()
+        if usage is not None:
+            size = params.response.content_length or 0
+            for entry in usage.chain():
+                entry.calls += 1
+                entry.routes[key] += 1
+                entry.bytes += size
+                if params.response.status == 429:
+                    entry.rate_limited += 1
+
+    async def _on_request_chunk_sent(self, session, context, params) -> None:
+        usage = current_usage.get()
+        if usage is not None:
+            for entry in usage.chain():
+                entry.bytes += len(params.chunk)
+
+    @asynccontextmanager
+    async def track(self, label: str) -> AsyncIterator[ApiUsage]:
+        """
+        Attribue à `label` les appels REST faits dans ce bloc (y compris via bot.rest)
+        Un bloc imbriqué compte aussi pour les blocs qui l'englobent
+        """
+        usage = ApiUsage(label, parent=current_usage.get())
+        token = current_usage.set(usage)
+        try:
+            yield usage
+        finally:
+            current_usage.reset(token)
+            self._record(usage)
+
+    def _record(self, usage: ApiUsage) -> None:
+        totals = self.usage.setdefault(usage.label, UsageTotals())
+        totals.invocations += 1
+        totals.calls += usage.calls
+        totals.max_calls = max(totals.max_calls, usage.calls)
+        totals.bytes += usage.bytes
+        totals.rate_limited += usage.rate_limited
+        totals.waited += usage.waited
+        totals.routes.update(usage.routes)
+
+        budget = self.budgets.get(usage.label, self.default_budget)
+        if budget is not None and usage.calls > budget:
+            top = ", ".join(f"{route} ×{count}" for route, count in usage.routes.most_common(3))
+            self.logger.warning(
+                f"💸 {usage.label} : {usage.calls} appels API pour un budget de {budget} "
+                f"({usage.rate_limited} × 429, {usage.waited:.1f}s d'attente) — {top}"
+            )
+
+    def remaining(self, method: str, path: str) -> Optional[int]:
+        """Budget restant connu pour une route (None si inconnu ou fenêtre expirée)"""
+        budget = self._budgets.get(route_key(method, path))
+        if budget is None or budget[1] <= time.monotonic():
+            return None
+        return budget[0]
+
+    def _global_wait(self, now: float) -> float:
+        """Secondes avant qu'un jeton global soit disponible (0 sans limite globale)"""
+        if not self.global_rate:
+            return 0.0
+        elapsed = now - self._global_at
+        self._global_tokens = min(self.global_rate, self._global_tokens + elapsed * self.global_rate)
+        self._global_at = now
+        return 0.0 if self._global_tokens >= 1 else (1 - self._global_tokens) / self.global_rate
+
+    def _route_wait(self, key: str, now: float) -> float:
+        budget = self._budgets.get(key)
+        if budget is None or budget[1] <= now or budget[0] - self._in_flight[key] > 0:
+            return 0.0
+        return budget[1] - now
+
+    def wait_time(self, method: str, path: str) -> float:
+        """Secondes avant qu'une requête sur cette route tienne dans le budget (0 = immédiatement)"""
+        now = time.monotonic()
+        return max(self._route_wait(route_key(method, path), now), self._global_wait(now))
+
+    async def acquire(self, method: str, path: str) -> None:
+        """Attend qu'une requête sur cette route tienne dans le budget annoncé"""
+        key = route_key(method, path)
+        while True:
+            now = time.monotonic()
+            wait = max(self._route_wait(key, now), self._global_wait(now))
+            if wait <= 0:
+                self._in_flight[key] += 1
+                if self.global_rate:
+                    self._global_tokens -= 1
+                return
+            await asyncio.sleep(wait)
+            usage = current_usage.get()
+            if usage is not None:
+                usage.add_wait(wait)
+
+    def release(self, method: str, path: str) -> None:
+        key = route_key(method, path)
+        self._in_flight[key] -= 1
+        if self._in_flight[key] <= 0:
+            del self._in_flight[key]
+
+
+def command_label(data: dict) -> str:
+    """« /setup appliquer » à partir des données d'une interaction de commande"""
+    parts = [data.get("name", "?")]
+    options = data.get("options", [])
+    # Types 1 et 2 : sous-commande et groupe de sous-commandes
+    while options and options[0].get("type") in (1, 2):
+        parts.append(options[0]["name"])
+        options = options[0].get("options", [])
+    return "/" + " ".join(parts)
+
+
+class TrackedCommandTree(app_commands.CommandTree):
+    """
+    Arbre de commandes qui attribue les appels REST de chaque commande slash à son nom
+    discord.py exécute chaque interaction dans sa propre tâche : l'invocation ouverte par
+    interaction_check couvre toute la commande, elle est enregistrée à sa fin
+    (événement app_command_completion, ou on_error en cas d'échec)
+    """
+
+    def __init__(self, client, *args, **kwargs):
+        super().__init__(client, *args, **kwargs)
+        if hasattr(client, "add_listener"):
+            client.add_listener(self._on_completion, "on_app_command_completion")
+
+    async def interaction_check(self, interaction) -> bool:
+        ratelimits = getattr(self.client, "ratelimits", None)
+        if ratelimits is not None and interaction.type is not InteractionType.autocomplete:
+            usage = ApiUsage(command_label(interaction.data or {}), parent=current_usage.get())
+            current_usage.set(usage)
+            interaction.extras[USAGE_EXTRA] = usage
+        return True
+
+    def _finish(self, interaction) -> None:
+        usage = interaction.extras.pop(USAGE_EXTRA, None)
+        if usage is not None:
+            self.client.ratelimits._record(usage)
+
+    async def _on_completion(self, interaction, command) -> None:
+        self._finish(interaction)
+
+    async def on_error(self, interaction, error) -> None:
+        self._finish(interaction)
+        await super().on_error(interaction, error)
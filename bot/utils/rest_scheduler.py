@@ -0,0 +1,189 @@
+"""
+📮 Ordonnanceur des appels REST pour Themis-Bot
+File unique à priorités pour les écritures : la modération passe avant les réponses,
+les réponses avant les journaux, les journaux avant les opérations d'administration en masse
+"""
+
+import asyncio
+import time
+import logging
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from bot.utils.ratelimit import ApiUsage, RateLimitTracker, current_usage
+
+
+class Priority(IntEnum):
+    """Classes de priorité, de la plus urgente à la moins urgente"""
+    ENFORCEMENT = 0  # Suppressions de messages, sanctions, rôles
+    RESPONSE = 1     # Messages vus par les utilisateurs
+    LOGGING = 2      # Embeds des canaux de logs
+    BULK = 3         # /setup, /restore, /jugement-divin
+
+
+@dataclass
+class _Request:
+    priority: Priority
+    method: str
+    path: str
+    job: Callable[[], Awaitable[Any]]
+    future: asyncio.Future = field(repr=False)
+    # Invocation à qui imputer l'appel : le worker tourne hors de sa tâche
+    usage: Optional[ApiUsage] = None
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class RestScheduler:
+    """
+    `workers` appels simultanés au plus, tous serveurs confondus
+    À chaque place libre : la classe la plus urgente qui a une requête prête est servie,
+    et dans une même classe les serveurs sont servis à tour de rôle (un gros serveur
+    ne monopolise pas la file). Une requête dont la route a épuisé son budget
+    (appris des en-têtes de Discord) est laissée en tête de file de son serveur
+    sans bloquer les autres routes
+    Un appel en cours peut rester bloqué longtemps (nouvel essai de discord.py après un 429) :
+    `reserved` workers ne servent que la modération, et au plus `bulk_limit` appels
+    d'administration en masse sont en cours à la fois
+    """
+
+    def __init__(self, ratelimits: RateLimitTracker, workers: int = 10, reserved: int = 2,
+                 bulk_limit: Optional[int] = None):
+        self.ratelimits = ratelimits
+        self.workers = workers
+        # Au moins un worker reste ouvert à toutes les classes
+        self.reserved = max(0, min(reserved, workers - 1))
+        self.bulk_limit = bulk_limit or max(1, (workers - self.reserved) // 2)
+        self.logger = logging.getLogger(__name__)
+        # priorité -> serveur -> file FIFO ; l'ordre des serveurs sert au tourniquet
+        self._queues: Dict[Priority, "OrderedDict[int, Deque[_Request]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        # priorité -> appels en cours
+        self._in_flight: Counter = Counter()
+        self.completed: Counter = Counter()
+
+    def pending(self) -> Dict[str, int]:
+        """Requêtes en attente par classe de priorité"""
+        return {
+            priority.name: sum(len(queue) for queue in self._queues[priority].values())
+            for priority in Priority
+        }
+
+    def submit(self, priority: Priority, method: str, path: str, job: Callable[[], Awaitable[Any]],
+               guild_id: Optional[int] = None) -> asyncio.Future:
+        """Ajoute un appel à la file ; le futur reçoit son résultat ou son exception"""
+        loop = asyncio.get_running_loop()
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if not self._tasks:
+            self._tasks = [
+                loop.create_task(self._work(enforcement_only=index < self.reserved))
+                for index in range(self.workers)
+            ]
+
+        future = loop.create_future()
+        request = _Request(priority, method, path, job, future, current_usage.get())
+        self._queues[priority].setdefault(guild_id or 0, deque()).append(request)
+        self._wakeup.set()
+        return future
+
+    async def call(self, priority: Priority, method: str, path: str, job: Callable[[], Awaitable[Any]],
+                   guild_id: Optional[int] = None) -> Any:
+        """Exécute un appel via la file et retourne son résultat"""
+        return await self.submit(priority, method, path, job, guild_id)
+
+    async def run_many(
+        self,
+        requests: Iterable[Tuple[str, str, Callable[[], Awaitable]]],
+        concurrency: Optional[int] = None,
+        priority: Priority = Priority.BULK,
+        guild_id: Optional[int] = None
+    ) -> List:
+        """
+        Appels (méthode, chemin, tâche) indépendants ; `concurrency` borne en plus la part
+        de ce lot dans la file. Les exceptions sont retournées à la place des résultats
+        """
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+        async def one(method, path, job):
+            if semaphore is None:
+                return await self.submit(priority, method, path, job, guild_id)
+            async with semaphore:
+                return await self.submit(priority, method, path, job, guild_id)
+
+        return await asyncio.gather(*(one(*request) for request in requests), return_exceptions=True)
+
+    def _pick(self, priorities: Iterable[Priority]) -> Tuple[Optional[_Request], Optional[float]]:
+        """Prochaine requête prête, ou le délai avant que l'une d'elles le devienne"""
+        soonest = None
+        for priority in priorities:
+            if priority is Priority.BULK and self._in_flight[priority] >= self.bulk_limit:
+                # Plafond atteint : la fin d'un appel en cours réveillera les workers
+                continue
+            guilds = self._queues[priority]
+            for guild_id in list(guilds):
+                queue = guilds[guild_id]
+                while queue and queue[0].future.cancelled():
+                    queue.popleft()
+                if not queue:
+                    del guilds[guild_id]
+                    continue
+
+                request = queue[0]
+                wait = self.ratelimits.wait_time(request.method, request.path)
+                if wait <= 0:
+                    queue.popleft()
+                    if queue:
+                        guilds.move_to_end(guild_id)
+                    else:
+                        del guilds[guild_id]
+                    self._in_flight[priority] += 1
+                    return request, None
+                soonest = wait if soonest is None else min(soonest, wait)
+        return None, soonest
+
+    async def _work(self, enforcement_only: bool = False) -> None:
+        priorities = (Priority.ENFORCEMENT,) if enforcement_only else tuple(Priority)
+        while True:
+            request, wait = self._pick(priorities)
+            if request is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            token = current_usage.set(request.usage)
+            if request.usage is not None:
+                request.usage.add_wait(time.monotonic() - request.queued_at)
+            await self.ratelimits.acquire(request.method, request.path)
+            try:
+                result = await request.job()
+                if not request.future.done():
+                    request.future.set_result(result)
+            except Exception as e:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            finally:
+                self.ratelimits.release(request.method, request.path)
+                self._in_flight[request.priority] -= 1
+                self.completed[request.priority.name] += 1
+                current_usage.reset(token)
+                # Un budget a pu être rafraîchi : réveiller les workers en attente
+                self._wakeup.set()
+
+    def close(self) -> None:
+        """Arrête les workers et annule les appels en attente"""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for guilds in self._queues.values():
+            for queue in guilds.values():
+                for request in queue:
+                    request.future.cancel()
+            guilds.clear()
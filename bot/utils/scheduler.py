@@ -0,0 +1,217 @@
+"""
+⏳ Planificateur de tâches différées pour Themis-Bot
+Tas en mémoire + persistance SQLite : les tâches survivent aux redémarrages
+"""
+
+import asyncio
+import heapq
+import json
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bot.utils.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    run_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    dedup_key TEXT UNIQUE,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    guild_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_run_at ON scheduled_jobs (run_at);
+"""
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class Scheduler:
+    """
+    Exécute des tâches à échéance (« fermer le ticket dans N s », « expirer dans N h »)
+    Les tâches dues sont traitées par lots de taille bornée, exécutés en parallèle
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        batch_size: int = 10,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        wait_ready: Optional[Callable[[], Awaitable[Any]]] = None,
+        owns: Optional[Callable[[Optional[int]], bool]] = None
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.wait_ready = wait_ready
+        # En mode cluster, seules les tâches des serveurs de ce processus sont exécutées ici
+        self.owns = owns
+        self.logger = logging.getLogger(__name__)
+
+        self._handlers: Dict[str, Handler] = {}
+        self._heap: List[Tuple[float, int]] = []
+        # job_id -> échéance courante (les entrées du tas obsolètes sont ignorées)
+        self._pending: Dict[int, float] = {}
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """Associe un type de tâche à sa coroutine d'exécution"""
+        self._handlers[kind] = handler
+
+    def unregister(self, kind: str) -> None:
+        """Retire le gestionnaire d'un type de tâche"""
+        self._handlers.pop(kind, None)
+
+    async def start(self) -> None:
+        """Recharge les tâches en attente depuis la base et démarre l'exécution"""
+        await self.db.executescript(SCHEMA)
+        columns = await self.db.fetchall("PRAGMA table_info(scheduled_jobs)")
+        if "guild_id" not in {column["name"] for column in columns}:
+            # Base antérieure au mode cluster : les anciennes tâches restent sans serveur
+            await self.db.execute("ALTER TABLE scheduled_jobs ADD COLUMN guild_id INTEGER")
+
+        rows = await self.db.fetchall("SELECT id, run_at, guild_id FROM scheduled_jobs")
+        if self.owns is not None:
+            rows = [row for row in rows if self.owns(row["guild_id"])]
+        for row in rows:
+            self._push(row["id"], row["run_at"])
+        if rows:
+            self.logger.info(f"⏳ {len(rows)} tâche(s) planifiée(s) rechargée(s)")
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Arrête l'exécution (les tâches restent en base)"""
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+
+    def _push(self, job_id: int, run_at: float) -> None:
+        self._pending[job_id] = run_at
+        heapq.heappush(self._heap, (run_at, job_id))
+        if self._heap[0][1] == job_id:
+            # Nouvelle échéance la plus proche : réveiller la boucle
+            self._wakeup.set()
+
+    async def schedule(
+        self,
+        kind: str,
+        delay: float = 0,
+        payload: Optional[Dict[str, Any]] = None,
+        key: Optional[str] = None,
+        guild_id: Optional[int] = None
+    ) -> int:
+        """
+        Planifie une tâche dans `delay` secondes
+        Une clé de déduplication remplace la tâche existante portant la même clé (même ID)
+        Le serveur concerné (par défaut `payload["guild_id"]`) désigne le processus qui l'exécutera
+        """
+        payload = payload or {}
+        run_at = time.time() + delay
+        # Insertion ou remplacement en une requête : deux appels concurrents avec la même clé
+        # ne peuvent pas se heurter à la contrainte UNIQUE
+        cursor = await self.db.conn.execute(
+            "INSERT INTO scheduled_jobs (kind, run_at, payload, dedup_key, guild_id) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(dedup_key) DO UPDATE SET kind = excluded.kind, run_at = excluded.run_at, "
+            "payload = excluded.payload, attempts = 0, guild_id = excluded.guild_id "
+            "RETURNING id",
+            (kind, run_at, json.dumps(payload), key, guild_id if guild_id is not None else payload.get("guild_id"))
+        )
+        row = await cursor.fetchone()
+        await cursor.close()
+        await self.db.conn.commit()
+        job_id = row["id"]
+        self._push(job_id, run_at)
+        return job_id
+
+    async def cancel(self, job_id: int) -> None:
+        """Annule une tâche"""
+        self._pending.pop(job_id, None)
+        await self.db.execute("DELETE FROM scheduled_jobs WHERE id = ?", (job_id,))
+
+    async def cancel_key(self, key: str) -> None:
+        """Annule la tâche portant cette clé de déduplication"""
+        row = await self.db.fetchone("SELECT id FROM scheduled_jobs WHERE dedup_key = ?", (key,))
+        if row:
+            await self.cancel(row["id"])
+
+    def _pop_due(self, now: float) -> List[int]:
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            run_at, job_id = heapq.heappop(self._heap)
+            if self._pending.get(job_id) == run_at:
+                del self._pending[job_id]
+                due.append(job_id)
+        return due
+
+    async def _run(self) -> None:
+        if self.wait_ready:
+            await self.wait_ready()
+
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            due = self._pop_due(now)
+
+            if due:
+                results = await asyncio.gather(*(self._execute(job_id) for job_id in due), return_exceptions=True)
+                for job_id, result in zip(due, results):
+                    if isinstance(result, Exception):
+                        # Erreur hors gestionnaire (base indisponible...) : la tâche est reprise plus tard
+                        self.logger.error(f"❌ Erreur du planificateur sur la tâche {job_id}: {result}")
+                        self._push(job_id, time.time() + self.retry_delay)
+                continue
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, job_id: int) -> None:
+        row = await self.db.fetchone(
+            "SELECT kind, run_at, payload, attempts FROM scheduled_jobs WHERE id = ?", (job_id,)
+        )
+        if row is None:
+            return
+        # Les écritures de fin ne touchent que cette échéance : une tâche replanifiée (même clé)
+        # pendant son exécution garde sa nouvelle échéance
+        current = (job_id, row["run_at"])
+
+        handler = self._handlers.get(row["kind"])
+        if handler is None:
+            # Gestionnaire pas encore enregistré (module en cours de chargement) : nouvel essai plus tard
+            self.logger.warning(
+                f"⏳ Aucun gestionnaire pour la tâche {job_id} ({row['kind']}), nouvel essai dans {self.retry_delay:.0f}s"
+            )
+            self._push(job_id, time.time() + self.retry_delay)
+            return
+
+        try:
+            await handler(json.loads(row["payload"]))
+        except Exception as e:
+            attempts = row["attempts"] + 1
+            if attempts >= self.max_attempts:
+                self.logger.error(f"❌ Tâche {job_id} ({row['kind']}) abandonnée après {attempts} essais: {e}")
+                await self.db.execute("DELETE FROM scheduled_jobs WHERE id = ? AND run_at = ?", current)
+                return
+
+            run_at = time.time() + self.retry_delay * attempts
+            self.logger.warning(f"⚠️ Tâche {job_id} ({row['kind']}) en échec, nouvel essai: {e}")
+            await self.db.execute(
+                "UPDATE scheduled_jobs SET attempts = ?, run_at = ? WHERE id = ? AND run_at = ?",
+                (attempts, run_at, *current)
+            )
+            if job_id not in self._pending:
+                self._push(job_id, run_at)
+            return
+
+        await self.db.execute("DELETE FROM scheduled_jobs WHERE id = ? AND run_at = ?", current)
@@ -0,0 +1,401 @@
+"""
+🏗️ Modèle déclaratif du serveur pour Themis-Bot
+Compare le modèle (data/server_template.json) au serveur réel et calcule le minimum d'opérations
+"""
+
+import json
+import time
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+import discord
+
+TEMPLATE_PATH = "data/server_template.json"
+REASON = "Configuration automatique par Themis-Bot"
+
+CHANNEL_TYPES = {
+    "text": discord.ChannelType.text,
+    "voice": discord.ChannelType.voice
+}
+
+
+def load_template(path: str = TEMPLATE_PATH) -> Dict[str, Any]:
+    """Charge le modèle du serveur"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def role_permissions(spec) -> discord.Permissions:
+    """« all » ou liste de noms de permissions -> discord.Permissions"""
+    if spec == "all":
+        return discord.Permissions.all()
+    return discord.Permissions(**{name: True for name in spec})
+
+
+def role_colour(spec: str) -> int:
+    return int(spec.lstrip("#"), 16)
+
+
+class Operation:
+    """Une opération du plan : création, mise à jour ou suppression d'un rôle, d'une catégorie ou d'un canal"""
+
+    ICONS = {"create": "➕", "update": "✏️", "delete": "🗑️"}
+    KINDS = {"role": "Rôle", "category": "Catégorie", "channel": "Canal"}
+
+    def __init__(self, action: str, kind: str, name: str, target=None, spec: Optional[dict] = None,
+                 changes: Optional[List[str]] = None, category: Optional[str] = None):
+        self.action = action
+        self.kind = kind
+        self.name = name
+        self.target = target
+        self.spec = spec or {}
+        self.changes = changes or []
+        self.category = category
+
+    def describe(self) -> str:
+        text = f"{self.ICONS[self.action]} {self.KINDS[self.kind]} **{self.name}**"
+        if self.changes:
+            text += f" ({', '.join(self.changes)})"
+        return text
+
+
+class ServerPlanner:
+    """
+    Planifie puis applique le modèle : seul ce qui diffère du serveur réel donne lieu à un appel d'API,
+    un serveur déjà conforme ne coûte aucune écriture
+    """
+
+    def __init__(self, bot, template: Dict[str, Any]):
+        self.bot = bot
+        self.template = template
+        self.logger = logging.getLogger(__name__)
+
+    # ---- Permissions --------------------------------------------------
+
+    @staticmethod
+    def _resolve_role(guild: discord.Guild, name: str, roles_by_name: Dict[str, discord.Role]):
+        if name == "@everyone":
+            return guild.default_role
+        return roles_by_name.get(name)
+
+    def _overwrites(self, guild, spec: Dict[str, dict], roles_by_name) -> Dict[Any, discord.PermissionOverwrite]:
+        """Permissions voulues ; les rôles inconnus du serveur sont ignorés"""
+        overwrites = {}
+        for role_name, perms in spec.items():
+            role = self._resolve_role(guild, role_name, roles_by_name)
+            if role is not None:
+                overwrites[role] = discord.PermissionOverwrite(**perms)
+        return overwrites
+
+    @staticmethod
+    def _overwrites_match(channel, desired: Dict[Any, discord.PermissionOverwrite]) -> bool:
+        """Compare les permissions des rôles (les permissions propres à un membre sont ignorées)"""
+        current = {
+            target.id: overwrite.pair()
+            for target, overwrite in channel.overwrites.items()
+            if isinstance(target, discord.Role)
+        }
+        return current == {target.id: overwrite.pair() for target, overwrite in desired.items()}
+
+    @staticmethod
+    def _merged_spec(category_spec: dict, channel_spec: dict) -> dict:
+        """Permissions d'un canal : celles de sa catégorie, remplacées rôle par rôle par les siennes"""
+        merged = dict(category_spec.get("permissions", {}))
+        merged.update(channel_spec.get("permissions", {}))
+        return merged
+
+    # ---- Planification ------------------------------------------------
+
+    def plan(self, guild: discord.Guild) -> List[Operation]:
+        """Calcule les opérations qui rendent le serveur conforme au modèle"""
+        operations: List[Operation] = []
+
+        roles_by_name: Dict[str, discord.Role] = {}
+        role_copies: Dict[str, List[discord.Role]] = {}
+        for role in sorted(guild.roles, key=lambda r: r.id):
+            role_copies.setdefault(role.name, []).append(role)
+
+        pending_roles: Set[str] = set()
+        for spec in self.template.get("roles", []):
+            copies = role_copies.get(spec["name"], [])
+            if not copies:
+                pending_roles.add(spec["name"])
+                operations.append(Operation("create", "role", spec["name"], spec=spec))
+                continue
+
+            role = copies[0]
+            roles_by_name[spec["name"]] = role
+            changes = []
+            if role.colour.value != role_colour(spec["color"]):
+                changes.append("couleur")
+            if role.permissions != role_permissions(spec["permissions"]):
+                changes.append("permissions")
+            if changes:
+                operations.append(Operation("update", "role", spec["name"], target=role, spec=spec, changes=changes))
+            for duplicate in copies[1:]:
+                operations.append(Operation("delete", "role", spec["name"], target=duplicate, changes=["doublon"]))
+
+        def needs_overwrites(channel, spec: dict) -> bool:
+            # Un rôle encore à créer : les permissions seront à poser après sa création
+            if any(name in pending_roles for name in spec):
+                return True
+            return not self._overwrites_match(channel, self._overwrites(guild, spec, roles_by_name))
+
+        category_copies: Dict[str, List[discord.CategoryChannel]] = {}
+        for category in sorted(guild.categories, key=lambda c: c.id):
+            category_copies.setdefault(category.name, []).append(category)
+
+        for category_spec in self.template.get("categories", []):
+            copies = category_copies.get(category_spec["name"], [])
+            category = copies[0] if copies else None
+
+            if category is None:
+                operations.append(Operation("create", "category", category_spec["name"], spec=category_spec))
+            elif needs_overwrites(category, category_spec.get("permissions", {})):
+                operations.append(Operation(
+                    "update", "category", category_spec["name"], target=category, spec=category_spec,
+                    changes=["permissions"]
+                ))
+
+            # Canaux du modèle cherchés dans la catégorie et ses éventuels doublons
+            candidates: Dict[tuple, List[discord.abc.GuildChannel]] = {}
+            for copy in copies:
+                for channel in copy.channels:
+                    candidates.setdefault((channel.name, channel.type), []).append(channel)
+
+            for channel_spec in category_spec.get("channels", []):
+                channel_type = CHANNEL_TYPES[channel_spec["type"]]
+                found = sorted(
+                    candidates.get((channel_spec["name"], channel_type), []),
+                    key=lambda c: (c.category_id != (category.id if category else None), c.id)
+                )
+                spec = dict(channel_spec, permissions=self._merged_spec(category_spec, channel_spec))
+
+                if not found:
+                    operations.append(Operation(
+                        "create", "channel", channel_spec["name"], spec=spec, category=category_spec["name"]
+                    ))
+                    continue
+
+                channel = found[0]
+                changes = []
+                if category is None or channel.category_id != category.id:
+                    changes.append("catégorie")
+                if channel_type is discord.ChannelType.text and (channel.topic or "") != channel_spec.get("topic", ""):
+                    changes.append("sujet")
+                if channel_type is discord.ChannelType.voice and channel.user_limit != channel_spec.get("user_limit", 0):
+                    changes.append("limite")
+                if needs_overwrites(channel, spec["permissions"]):
+                    changes.append("permissions")
+                if changes:
+                    operations.append(Operation(
+                        "update", "channel", channel_spec["name"], target=channel, spec=spec,
+                        changes=changes, category=category_spec["name"]
+                    ))
+                for duplicate in found[1:]:
+                    operations.append(Operation("delete", "channel", channel_spec["name"], target=duplicate, changes=["doublon"]))
+
+            for duplicate in copies[1:]:
+                operations.append(Operation("delete", "category", category_spec["name"], target=duplicate, changes=["doublon"]))
+
+        return operations
+
+    # ---- Application --------------------------------------------------
+
+    async def apply(self, guild: discord.Guild, operations: List[Operation], delete_duplicates: bool = False,
+                    concurrency: int = 5) -> Dict[str, Any]:
+        """
+        Applique un plan : rôles, puis catégories, puis canaux, puis suppressions des doublons
+        Les opérations d'une même étape sont indépendantes et exécutées en parallèle
+        """
+        # Appels de cette application seulement (le compteur global inclut ceux des autres commandes)
+        async with self.bot.ratelimits.track("setup.apply") as usage:
+            report = await self._apply(guild, operations, delete_duplicates, concurrency)
+        report["api_calls"] = usage.calls
+        return report
+
+    async def _apply(self, guild: discord.Guild, operations: List[Operation], delete_duplicates: bool,
+                     concurrency: int) -> Dict[str, Any]:
+        rest = self.bot.rest
+        started = time.monotonic()
+        report = {"created": [], "updated": [], "deleted": [], "errors": []}
+
+        def collect(ops, results):
+            done = []
+            for op, result in zip(ops, results):
+                if isinstance(result, Exception):
+                    report["errors"].append(f"{Operation.KINDS[op.kind]} {op.name}: {result}")
+                else:
+                    report[op.action + "d"].append(op.describe())
+                    done.append((op, result))
+            return done
+
+        def step(kind):
+            return [op for op in operations if op.kind == kind and op.action != "delete"]
+
+        # 1. Rôles
+        roles_by_name = {role.name: role for role in sorted(guild.roles, key=lambda r: r.id, reverse=True)}
+        role_ops = step("role")
+        results = await rest.run_many(
+            [self._role_request(guild, op) for op in role_ops], concurrency, guild_id=guild.id
+        )
+        created_roles = []
+        for op, role in collect(role_ops, results):
+            roles_by_name[op.name] = role
+            if op.action == "create":
+                created_roles.append(role)
+
+        if created_roles:
+            # L'ordre d'arrivée est aléatoire : rétablir la hiérarchie du modèle en un seul appel
+            ordered = [roles_by_name[spec["name"]] for spec in self.template.get("roles", []) if spec["name"] in roles_by_name]
+            try:
+                await guild.edit_role_positions(
+                    {role: len(ordered) - index for index, role in enumerate(ordered)}, reason=REASON
+                )
+            except Exception as e:
+                report["errors"].append(f"Hiérarchie des rôles: {e}")
+
+        # 2. Catégories
+        categories = {category.name: category for category in sorted(guild.categories, key=lambda c: c.id, reverse=True)}
+        category_ops = step("category")
+        results = await rest.run_many(
+            [self._category_request(guild, op, roles_by_name) for op in category_ops],
+            concurrency, guild_id=guild.id
+        )
+        for op, category in collect(category_ops, results):
+            categories[op.name] = category
+
+        # 3. Canaux
+        channel_ops = [op for op in step("channel") if op.category in categories]
+        for op in step("channel"):
+            if op.category not in categories:
+                report["errors"].append(f"Canal {op.name}: catégorie {op.category} indisponible")
+        results = await rest.run_many(
+            [self._channel_request(guild, op, roles_by_name, categories[op.category]) for op in channel_ops],
+            concurrency, guild_id=guild.id
+        )
+        collect(channel_ops, results)
+
+        # 4. Doublons (canaux avant les catégories qui les contiennent, puis rôles)
+        if delete_duplicates:
+            for kind, route in (("channel", "/channels/{id}"), ("category", "/channels/{id}"), ("role", f"/guilds/{guild.id}/roles/{{id}}")):
+                delete_ops = [op for op in operations if op.kind == kind and op.action == "delete"]
+                results = await rest.run_many(
+                    [("DELETE", route.format(id=op.target.id), lambda op=op: op.target.delete(reason=REASON)) for op in delete_ops],
+                    concurrency, guild_id=guild.id
+                )
+                collect(delete_ops, results)
+
+        report["elapsed"] = time.monotonic() - started
+        return report
+
+    def _role_request(self, guild, op: Operation):
+        kwargs = {
+            "colour": discord.Colour(role_colour(op.spec["color"])),
+            "permissions": role_permissions(op.spec["permissions"]),
+            "reason": REASON
+        }
+        if op.action == "create":
+            return "POST", f"/guilds/{guild.id}/roles", lambda: guild.create_role(name=op.name, **kwargs)
+
+        async def update():
+            return await op.target.edit(**kwargs) or op.target
+        return "PATCH", f"/guilds/{guild.id}/roles/{op.target.id}", update
+
+    def _category_request(self, guild, op: Operation, roles_by_name):
+        overwrites = self._overwrites(guild, op.spec.get("permissions", {}), roles_by_name)
+        if op.action == "create":
+            return "POST", f"/guilds/{guild.id}/channels", lambda: guild.create_category(
+                name=op.name, overwrites=overwrites, reason=REASON
+            )
+
+        async def update():
+            return await op.target.edit(overwrites=overwrites, reason=REASON) or op.target
+        return "PATCH", f"/channels/{op.target.id}", update
+
+    def _channel_request(self, guild, op: Operation, roles_by_name, category):
+        kwargs = {
+            "category": category,
+            "overwrites": self._overwrites(guild, op.spec.get("permissions", {}), roles_by_name),
+            "reason": REASON
+        }
+        if op.spec["type"] == "text":
+            kwargs["topic"] = op.spec.get("topic", "")
+        else:
+            kwargs["user_limit"] = op.spec.get("user_limit", 0)
+
+        if op.action == "create":
+            create = guild.create_text_channel if op.spec["type"] == "text" else guild.create_voice_channel
+            return "POST", f"/guilds/{guild.id}/channels", lambda: create(name=op.name, **kwargs)
+
+        async def update():
+            return await op.target.edit(**kwargs) or op.target
+        return "PATCH", f"/channels/{op.target.id}", update
+
+
+def plan_embed(operations: List[Operation], delete_duplicates: bool = False) -> discord.Embed:
+    """Aperçu d'un plan, sans rien appliquer"""
+    embed = discord.Embed(
+        title="🔎 Plan de Configuration",
+        color=0x3498DB
+    )
+    if not operations:
+        embed.description = "✅ Le serveur est déjà conforme au modèle : aucune modification nécessaire."
+        return embed
+
+    embed.description = f"**{len(operations)} opération(s)** pour rendre le serveur conforme au modèle."
+    for action, title in (("create", "➕ Créations"), ("update", "✏️ Mises à jour"), ("delete", "🗑️ Doublons à supprimer")):
+        lines = [op.describe() for op in operations if op.action == action]
+        if not lines:
+            continue
+        value = ""
+        for index, line in enumerate(lines):
+            if len(value) + len(line) + 40 > 1024:
+                value += f"... et {len(lines) - index} autre(s)"
+                break
+            value += line + "\n"
+        embed.add_field(name=f"{title} ({len(lines)})", value=value, inline=False)
+
+    if any(op.action == "delete" for op in operations) and not delete_duplicates:
+        embed.set_footer(text="Les doublons ne sont supprimés qu'avec /setup appliquer supprimer_doublons:True")
+    return embed
+
+
+def report_embed(report: Dict[str, Any]) -> discord.Embed:
+    """Résumé de l'application d'un plan"""
+    embed = discord.Embed(
+        title="✅ Configuration du Royaume Accomplie",
+        description="🏛️ **Le royaume de Thémis est conforme au modèle !**",
+        color=0x00FF00
+    )
+    if not (report["created"] or report["updated"] or report["deleted"] or report["errors"]):
+        embed.description = "✅ **Le serveur était déjà conforme au modèle** : aucune modification."
+
+    embed.add_field(
+        name="🏛️ Structure",
+        value=(
+            f"**{len(report['created'])} créations**\n"
+            f"**{len(report['updated'])} mises à jour**\n"
+            f"**{len(report['deleted'])} doublons supprimés**"
+        ),
+        inline=True
+    )
+    embed.add_field(
+        name="⏱️ Performance",
+        value=f"**{report['elapsed']:.1f} s**\n**{report['api_calls']} appels API**",
+        inline=True
+    )
+
+    errors = report["errors"]
+    if errors:
+        error_text = "\n".join(errors[:3])
+        if len(errors) > 3:
+            error_text += f"\n... et {len(errors) - 3} autres erreurs"
+        embed.add_field(
+            name="⚠️ Avertissements",
+            value=f"```{error_text}```",
+            inline=False
+        )
+
+    embed.set_footer(text="Themis-Bot • Configuration avec Permissions Automatiques")
+    return embed
@@ -0,0 +1,113 @@
+"""
+🛰️ Statistiques par shard pour Themis-Bot
+Débit d'événements, connexions, reprises et déconnexions de chaque connexion à la gateway
+"""
+
+import time
+import logging
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+# Fenêtre glissante du débit d'événements, en secondes
+WINDOW = 60
+
+
+class ShardCounters:
+    """Compteurs d'un shard"""
+
+    __slots__ = ("events", "connects", "disconnects", "resumes", "ready_at", "_seconds")
+
+    def __init__(self):
+        self.events = 0
+        self.connects = 0
+        self.disconnects = 0
+        self.resumes = 0
+        self.ready_at: Optional[float] = None
+        # [seconde, nombre d'événements] sur la fenêtre glissante
+        self._seconds: Deque[List[int]] = deque()
+
+    def hit(self, now: int) -> None:
+        self.events += 1
+        if self._seconds and self._seconds[-1][0] == now:
+            self._seconds[-1][1] += 1
+        else:
+            self._seconds.append([now, 1])
+            while self._seconds and self._seconds[0][0] <= now - WINDOW:
+                self._seconds.popleft()
+
+    def rate(self) -> float:
+        """Événements par seconde sur la dernière minute"""
+        horizon = int(time.monotonic()) - WINDOW
+        return sum(count for second, count in self._seconds if second > horizon) / WINDOW
+
+
+class ShardStats:
+    """
+    Service partagé : chaque événement est imputé au shard du serveur qui l'a produit
+    (shard = (guild_id >> 22) % shard_count, la règle de Discord) ; les événements
+    sans serveur (messages privés...) sont imputés au shard 0
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.logger = logging.getLogger(__name__)
+        self.shards: Dict[int, ShardCounters] = {}
+        self.by_event: Counter = Counter()
+
+        for event in ("on_shard_connect", "on_shard_ready", "on_shard_disconnect", "on_shard_resumed"):
+            bot.add_listener(getattr(self, event), event)
+
+    def _shard(self, shard_id: int) -> ShardCounters:
+        counters = self.shards.get(shard_id)
+        if counters is None:
+            counters = self.shards[shard_id] = ShardCounters()
+        return counters
+
+    def shard_for(self, guild_id: Optional[int]) -> int:
+        shard_count = self.bot.shard_count or 1
+        return (guild_id >> 22) % shard_count if guild_id else 0
+
+    @staticmethod
+    def _guild_id(args) -> Optional[int]:
+        """Serveur concerné par un événement, d'après son premier argument"""
+        if not args:
+            return None
+        first: Any = args[0]
+        guild_id = getattr(first, "guild_id", None)
+        if guild_id is not None:
+            return guild_id
+        guild = getattr(first, "guild", None)
+        if guild is not None:
+            return guild.id
+        # Événements de serveur (on_guild_join, on_guild_available...)
+        if type(first).__name__ == "Guild":
+            return first.id
+        return None
+
+    def record(self, event_name: str, args) -> None:
+        """Appelé pour chaque événement dispatché (voir ThemisBot.dispatch)"""
+        if event_name.startswith("shard_"):
+            shard_id = args[0] if args else 0
+        else:
+            shard_id = self.shard_for(self._guild_id(args))
+        self._shard(shard_id).hit(int(time.monotonic()))
+        self.by_event[event_name] += 1
+
+    # ---- Événements de connexion --------------------------------------
+
+    async def on_shard_connect(self, shard_id: int):
+        self._shard(shard_id).connects += 1
+        self.logger.info(f"🔌 [shard {shard_id}] Connecté à la gateway")
+
+    async def on_shard_ready(self, shard_id: int):
+        self._shard(shard_id).ready_at = time.time()
+        guilds = sum(1 for guild in self.bot.guilds if guild.shard_id == shard_id)
+        self.logger.info(f"✅ [shard {shard_id}] Prêt ({guilds} serveurs)")
+
+    async def on_shard_disconnect(self, shard_id: int):
+        self._shard(shard_id).disconnects += 1
+        self.logger.warning(f"⚠️ [shard {shard_id}] Déconnecté de la gateway")
+
+    async def on_shard_resumed(self, shard_id: int):
+        self._shard(shard_id).resumes += 1
+        self.logger.info(f"🔁 [shard {shard_id}] Session reprise")
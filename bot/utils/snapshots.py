@@ -0,0 +1,333 @@
+"""
+📸 Sauvegarde et restauration de la structure d'un serveur pour Themis-Bot
+Snapshots incrémentaux : seuls les objets modifiés depuis le précédent sont écrits
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+SNAPSHOT_VERSION = 1
+REASON = "Restauration d'un snapshot par Themis-Bot"
+
+CHANNEL_KINDS = {
+    discord.ChannelType.category: "category",
+    discord.ChannelType.text: "text",
+    discord.ChannelType.news: "text",
+    discord.ChannelType.voice: "voice",
+    discord.ChannelType.stage_voice: "voice",
+    discord.ChannelType.forum: "forum"
+}
+
+# Un état : {"roles": {id: objet}, "channels": {id: objet}}
+State = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+def _overwrites(channel) -> List[Dict[str, Any]]:
+    overwrites = []
+    for target, overwrite in channel.overwrites.items():
+        allow, deny = overwrite.pair()
+        overwrites.append({
+            "id": str(target.id),
+            "type": "role" if isinstance(target, discord.Role) else "member",
+            "allow": allow.value,
+            "deny": deny.value
+        })
+    return sorted(overwrites, key=lambda o: o["id"])
+
+
+def serialize_guild(guild: discord.Guild) -> State:
+    """État de la structure du serveur (rôles, catégories, canaux et permissions)"""
+    roles = {}
+    for role in guild.roles:
+        if role.managed:
+            # Rôles d'intégrations (bots, boosts) : recréés par Discord, pas par nous
+            continue
+        roles[str(role.id)] = {
+            "name": role.name,
+            "colour": role.colour.value,
+            "permissions": role.permissions.value,
+            "hoist": role.hoist,
+            "mentionable": role.mentionable,
+            "position": role.position,
+            "default": role.is_default()
+        }
+
+    channels = {}
+    for channel in guild.channels:
+        kind = CHANNEL_KINDS.get(channel.type)
+        if kind is None:
+            continue
+        data = {
+            "name": channel.name,
+            "kind": kind,
+            "position": channel.position,
+            "parent": str(channel.category_id) if channel.category_id else None,
+            "overwrites": _overwrites(channel)
+        }
+        if kind == "text":
+            data.update(topic=channel.topic, nsfw=channel.nsfw, slowmode=channel.slowmode_delay)
+        elif kind == "voice":
+            data.update(user_limit=channel.user_limit, bitrate=channel.bitrate)
+        channels[str(channel.id)] = data
+
+    return {"roles": roles, "channels": channels}
+
+
+def _digest(obj: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Un dossier par serveur ; chaque fichier est un delta gzip par rapport au snapshot précédent
+    Un snapshot complet est écrit tous les `full_every` snapshots pour borner la chaîne à relire
+    """
+
+    def __init__(self, directory: str = "data/snapshots/", full_every: int = 7):
+        self.directory = directory
+        self.full_every = full_every
+        self.logger = logging.getLogger(__name__)
+
+    def _guild_dir(self, guild_id: int) -> str:
+        return os.path.join(self.directory, str(guild_id))
+
+    def names(self, guild_id: int) -> List[str]:
+        """Noms des snapshots d'un serveur, du plus ancien au plus récent"""
+        folder = self._guild_dir(guild_id)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name[:-len(".json.gz")] for name in os.listdir(folder) if name.endswith(".json.gz"))
+
+    def _read(self, guild_id: int, name: str) -> Dict[str, Any]:
+        with gzip.open(os.path.join(self._guild_dir(guild_id), f"{name}.json.gz"), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self, guild_id: int, name: Optional[str] = None) -> Tuple[str, State]:
+        """Reconstitue l'état complet d'un snapshot (le plus récent par défaut) en rejouant sa chaîne"""
+        names = self.names(guild_id)
+        if not names:
+            raise FileNotFoundError("Aucun snapshot pour ce serveur")
+        name = name or names[-1]
+
+        chain = []
+        current: Optional[str] = name
+        while current:
+            snapshot = self._read(guild_id, current)
+            chain.append(snapshot)
+            current = snapshot.get("base")
+
+        state: State = {"roles": {}, "channels": {}}
+        for snapshot in reversed(chain):
+            for kind in state:
+                state[kind].update(snapshot["changed"].get(kind, {}))
+                for object_id in snapshot["removed"].get(kind, []):
+                    state[kind].pop(object_id, None)
+        return name, state
+
+    async def capture(self, guild: discord.Guild) -> Dict[str, Any]:
+        """
+        Snapshot du serveur : l'état est lu sur la boucle, où le cache de discord.py est cohérent,
+        seuls le delta, la compression et l'écriture passent dans un thread
+        """
+        state = serialize_guild(guild)
+        return await asyncio.to_thread(self.save, guild.id, guild.name, state)
+
+    def save(self, guild_id: int, guild_name: str, state: State) -> Dict[str, Any]:
+        """Écrit un snapshot d'un état sérialisé. Bloquant : à lancer dans un thread"""
+        names = self.names(guild_id)
+
+        base, previous, depth = None, {"roles": {}, "channels": {}}, 0
+        if names:
+            # Delta tant que la chaîne depuis le dernier complet est courte
+            latest_depth = self._read(guild_id, names[-1]).get("depth", 0)
+            if latest_depth + 1 < self.full_every:
+                base, previous = self.load(guild_id, names[-1])
+                depth = latest_depth + 1
+
+        changed = {
+            kind: {
+                object_id: obj for object_id, obj in objects.items()
+                if object_id not in previous[kind] or _digest(previous[kind][object_id]) != _digest(obj)
+            }
+            for kind, objects in state.items()
+        }
+        removed = {kind: sorted(set(previous[kind]) - set(objects)) for kind, objects in state.items()}
+
+        name = stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        suffix = 1
+        while names and name <= names[-1]:
+            suffix += 1
+            name = f"{stamp}_{suffix}"
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "guild_id": str(guild_id),
+            "guild_name": guild_name,
+            "created_at": datetime.utcnow().isoformat(),
+            "base": base,
+            "depth": depth,
+            "changed": changed,
+            "removed": removed
+        }
+
+        folder = self._guild_dir(guild_id)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{name}.json.gz")
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+        return {
+            "name": name,
+            "full": base is None,
+            "changed": sum(len(objects) for objects in changed.values()),
+            "removed": sum(len(ids) for ids in removed.values()),
+            "total": sum(len(objects) for objects in state.values()),
+            "size": os.path.getsize(path)
+        }
+
+
+class SnapshotRestorer:
+    """
+    Recrée ce qui manque sur le serveur à partir d'un état sauvegardé
+    Ordre des dépendances : rôles, puis catégories, puis canaux (dont les permissions
+    référencent les rôles) ; chaque étape est parallèle et rythmée par les limites de l'API
+    Les objets encore présents (même ID ou même nom) sont conservés tels quels
+    """
+
+    def __init__(self, bot, concurrency: int = 5):
+        self.bot = bot
+        self.concurrency = concurrency
+        self.logger = logging.getLogger(__name__)
+
+    async def restore(self, guild: discord.Guild, state: State) -> Dict[str, Any]:
+        # Appels de cette restauration seulement (le compteur global inclut ceux des autres commandes)
+        async with self.bot.ratelimits.track("snapshot.restore") as usage:
+            report = await self._restore(guild, state)
+        report["api_calls"] = usage.calls
+        return report
+
+    async def _restore(self, guild: discord.Guild, state: State) -> Dict[str, Any]:
+        rest = self.bot.rest
+        started = time.monotonic()
+        report = {"roles": 0, "channels": 0, "errors": []}
+
+        # ---- Rôles ----
+        role_map: Dict[str, discord.Role] = {}
+        by_name = {role.name: role for role in guild.roles}
+        missing_roles = []
+        for role_id, data in state["roles"].items():
+            if data["default"]:
+                role_map[role_id] = guild.default_role
+                if guild.default_role.permissions.value != data["permissions"]:
+                    try:
+                        await guild.default_role.edit(permissions=discord.Permissions(data["permissions"]), reason=REASON)
+                    except discord.HTTPException as e:
+                        report["errors"].append(f"@everyone: {e}")
+                continue
+            existing = guild.get_role(int(role_id)) or by_name.get(data["name"])
+            if existing:
+                role_map[role_id] = existing
+            else:
+                missing_roles.append((role_id, data))
+
+        results = await rest.run_many(
+            [
+                ("POST", f"/guilds/{guild.id}/roles", lambda data=data: guild.create_role(
+                    name=data["name"],
+                    colour=discord.Colour(data["colour"]),
+                    permissions=discord.Permissions(data["permissions"]),
+                    hoist=data["hoist"],
+                    mentionable=data["mentionable"],
+                    reason=REASON
+                ))
+                for _, data in missing_roles
+            ],
+            self.concurrency, guild_id=guild.id
+        )
+        created_roles = {}
+        for (role_id, data), result in zip(missing_roles, results):
+            if isinstance(result, Exception):
+                report["errors"].append(f"Rôle {data['name']}: {result}")
+            else:
+                role_map[role_id] = result
+                created_roles[result] = data["position"]
+                report["roles"] += 1
+
+        if created_roles:
+            # Positions d'origine, en un seul appel
+            try:
+                await guild.edit_role_positions(
+                    {role: max(1, position) for role, position in created_roles.items()}, reason=REASON
+                )
+            except discord.HTTPException as e:
+                report["errors"].append(f"Hiérarchie des rôles: {e}")
+
+        def overwrites_for(data):
+            overwrites = {}
+            for entry in data["overwrites"]:
+                if entry["type"] == "role":
+                    target = role_map.get(entry["id"])
+                else:
+                    target = guild.get_member(int(entry["id"]))
+                if target is not None:
+                    overwrites[target] = discord.PermissionOverwrite.from_pair(
+                        discord.Permissions(entry["allow"]), discord.Permissions(entry["deny"])
+                    )
+            return overwrites
+
+        # ---- Catégories puis canaux ----
+        channel_map: Dict[str, discord.abc.GuildChannel] = {}
+        by_key = {(channel.name, CHANNEL_KINDS.get(channel.type)): channel for channel in guild.channels}
+        for stage in ("category", "channel"):
+            missing = []
+            for channel_id, data in state["channels"].items():
+                if (data["kind"] == "category") != (stage == "category"):
+                    continue
+                existing = guild.get_channel(int(channel_id)) or by_key.get((data["name"], data["kind"]))
+                if existing:
+                    channel_map[channel_id] = existing
+                else:
+                    missing.append((channel_id, data))
+
+            results = await rest.run_many(
+                [
+                    ("POST", f"/guilds/{guild.id}/channels",
+                     lambda data=data: self._create_channel(guild, data, overwrites_for(data), channel_map))
+                    for _, data in missing
+                ],
+                self.concurrency, guild_id=guild.id
+            )
+            for (channel_id, data), result in zip(missing, results):
+                if isinstance(result, Exception):
+                    report["errors"].append(f"Canal {data['name']}: {result}")
+                else:
+                    channel_map[channel_id] = result
+                    report["channels"] += 1
+
+        report["elapsed"] = time.monotonic() - started
+        return report
+
+    async def _create_channel(self, guild, data, overwrites, channel_map):
+        kwargs = {"name": data["name"], "overwrites": overwrites, "position": data["position"], "reason": REASON}
+        if data["kind"] == "category":
+            return await guild.create_category(**kwargs)
+
+        kwargs["category"] = channel_map.get(data["parent"]) if data["parent"] else None
+        if data["kind"] == "voice":
+            return await guild.create_voice_channel(
+                user_limit=data.get("user_limit", 0), bitrate=min(data.get("bitrate", 64000), guild.bitrate_limit), **kwargs
+            )
+        if data["kind"] == "forum":
+            return await guild.create_forum(**kwargs)
+        return await guild.create_text_channel(
+            topic=data.get("topic") or "", nsfw=data.get("nsfw", False), slowmode_delay=data.get("slowmode", 0), **kwargs
+        )
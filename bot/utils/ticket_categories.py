@@ -0,0 +1,194 @@
+"""
+🗂️ Catégories de tickets avec débordement pour Themis-Bot
+Discord limite une catégorie à 50 canaux : au-delà, des catégories « 🎫 TICKETS 2, 3… » sont ouvertes
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+import discord
+
+CLEANUP_JOB = "tickets.category_cleanup"
+
+
+class TicketCategoryPool:
+    """
+    Répartit les canaux de tickets entre la catégorie principale et ses catégories de débordement
+    Le nombre de canaux par catégorie est tenu en cache et mis à jour par les événements,
+    sans parcourir les canaux du serveur à chaque création de ticket
+    """
+
+    def __init__(self, bot, base_name: str = "🎫 TICKETS", capacity: int = 50, cleanup_delay: float = 600):
+        self.bot = bot
+        self.base_name = base_name
+        self.capacity = capacity
+        self.cleanup_delay = cleanup_delay
+        self.logger = logging.getLogger(__name__)
+        # serveur -> catégories du pool dans l'ordre (principale, 2, 3…)
+        self._order: Dict[int, List[int]] = {}
+        # ID catégorie -> nombre de canaux (y compris les places réservées)
+        self._counts: Dict[int, int] = {}
+        # ID catégorie -> places réservées par acquire() dont le canal n'a pas encore été vu
+        self._reserved: Dict[int, int] = {}
+        # ID catégorie -> rang (1 = principale)
+        self._ranks: Dict[int, int] = {}
+        # ID catégorie -> objet (une catégorie juste créée peut manquer au cache du serveur)
+        self._categories: Dict[int, discord.CategoryChannel] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._tasks = set()
+
+    def name_for(self, index: int) -> str:
+        return self.base_name if index == 1 else f"{self.base_name} {index}"
+
+    def index_of(self, name: str) -> Optional[int]:
+        """Rang d'une catégorie du pool d'après son nom (None si elle n'en fait pas partie)"""
+        if name == self.base_name:
+            return 1
+        prefix = f"{self.base_name} "
+        if name.startswith(prefix) and name[len(prefix):].isdigit():
+            return int(name[len(prefix):])
+        return None
+
+    def start(self) -> None:
+        """Branche les événements et la tâche de nettoyage"""
+        self.bot.add_listener(self.on_guild_channel_create, "on_guild_channel_create")
+        self.bot.add_listener(self.on_guild_channel_delete, "on_guild_channel_delete")
+        self.bot.add_listener(self.on_guild_channel_update, "on_guild_channel_update")
+        self.bot.scheduler.register(CLEANUP_JOB, self._cleanup)
+
+    def stop(self) -> None:
+        self.bot.remove_listener(self.on_guild_channel_create, "on_guild_channel_create")
+        self.bot.remove_listener(self.on_guild_channel_delete, "on_guild_channel_delete")
+        self.bot.remove_listener(self.on_guild_channel_update, "on_guild_channel_update")
+        self.bot.scheduler.unregister(CLEANUP_JOB)
+
+    def _ensure(self, guild: discord.Guild) -> List[int]:
+        """Indexe une fois les catégories existantes du serveur"""
+        if guild.id not in self._order:
+            found = []
+            for category in guild.categories:
+                index = self.index_of(category.name)
+                if index is not None:
+                    found.append((index, category.position, category))
+                    self._counts[category.id] = len(category.channels)
+                    self._ranks[category.id] = index
+                    self._categories[category.id] = category
+            self._order[guild.id] = [category.id for _, _, category in sorted(found, key=lambda item: item[:2])]
+        return self._order[guild.id]
+
+    async def acquire(self, guild: discord.Guild) -> discord.CategoryChannel:
+        """Réserve une place dans la première catégorie non pleine, en créant un débordement si besoin"""
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            order = self._ensure(guild)
+            for category_id in order:
+                if self._counts.get(category_id, 0) < self.capacity:
+                    self._counts[category_id] += 1
+                    self._reserved[category_id] = self._reserved.get(category_id, 0) + 1
+                    return self._categories[category_id]
+
+            used = {self._ranks.get(category_id) for category_id in order}
+            index = next(i for i in range(1, len(order) + 2) if i not in used)
+            name = self.name_for(index)
+            category = await guild.create_category(
+                name,
+                overwrites={guild.default_role: discord.PermissionOverwrite(view_channel=False)},
+                reason="Catégorie de tickets pleine"
+            )
+            self._ranks[category.id] = index
+            self._categories[category.id] = category
+            order.append(category.id)
+            order.sort(key=lambda category_id: self._ranks.get(category_id, 0))
+            self._counts[category.id] = 1
+            self._reserved[category.id] = 1
+            if index > 1:
+                self.logger.info(f"🗂️ Catégorie de débordement créée : {name}")
+            return category
+
+    def release(self, category_id: int, guild: Optional[discord.Guild] = None) -> None:
+        """Libère une place (canal supprimé ou déplacé)"""
+        if category_id not in self._counts:
+            return
+        self._counts[category_id] = max(0, self._counts[category_id] - 1)
+        self._schedule_cleanup(category_id, guild)
+
+    def cancel(self, category_id: int, guild: discord.Guild) -> None:
+        """
+        Rend la place réservée d'une création de canal échouée
+        Le compteur est recalculé depuis les canaux de la catégorie : un canal créé hors du bot
+        entre-temps a pu consommer la réservation
+        """
+        if category_id not in self._counts:
+            return
+        reserved = max(0, self._reserved.get(category_id, 0) - 1)
+        self._reserved[category_id] = reserved
+        category = guild.get_channel(category_id) or self._categories.get(category_id)
+        self._counts[category_id] = (len(category.channels) if category is not None else 0) + reserved
+        self._schedule_cleanup(category_id, guild)
+
+    def _schedule_cleanup(self, category_id: int, guild: Optional[discord.Guild]) -> None:
+        if self._counts[category_id] == 0 and guild is not None:
+            if self._ranks.get(category_id, 1) > 1:
+                # Débordement vide : suppression différée, au cas où la vague reprendrait
+                task = asyncio.create_task(self.bot.scheduler.schedule(
+                    CLEANUP_JOB,
+                    delay=self.cleanup_delay,
+                    payload={"guild_id": guild.id, "category_id": category_id},
+                    key=f"{CLEANUP_JOB}:{category_id}"
+                ))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _cleanup(self, payload) -> None:
+        """Supprime une catégorie de débordement restée vide"""
+        guild = self.bot.get_guild(payload["guild_id"])
+        if guild is None:
+            return
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            category = guild.get_channel(payload["category_id"])
+            if category is None or self._counts.get(category.id, 0) > 0 or category.channels:
+                return
+            order = self._order.get(guild.id, [])
+            if category.id in order:
+                order.remove(category.id)
+            self._counts.pop(category.id, None)
+            self._reserved.pop(category.id, None)
+            self._ranks.pop(category.id, None)
+            self._categories.pop(category.id, None)
+            await category.delete(reason="Catégorie de débordement des tickets vide")
+            self.logger.info(f"🗂️ Catégorie de débordement supprimée : {category.name}")
+
+    # ---- Événements ---------------------------------------------------
+
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        category_id = channel.category_id
+        if category_id not in self._counts:
+            return
+        if self._reserved.get(category_id, 0) > 0:
+            # Canal d'une place réservée par acquire() : déjà compté
+            self._reserved[category_id] -= 1
+        else:
+            # Canal créé hors du bot (ou par un autre module)
+            self._counts[category_id] += 1
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if isinstance(channel, discord.CategoryChannel):
+            self._counts.pop(channel.id, None)
+            self._reserved.pop(channel.id, None)
+            self._ranks.pop(channel.id, None)
+            self._categories.pop(channel.id, None)
+            order = self._order.get(channel.guild.id)
+            if order and channel.id in order:
+                order.remove(channel.id)
+        elif channel.category_id is not None:
+            self.release(channel.category_id, channel.guild)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if before.category_id == after.category_id:
+            return
+        if before.category_id is not None:
+            self.release(before.category_id, after.guild)
+        if after.category_id in self._counts:
+            self._counts[after.category_id] += 1
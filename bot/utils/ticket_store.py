@@ -0,0 +1,79 @@
+"""
+🗃️ Fichier des tickets partagé entre processus pour Themis-Bot
+En mode cluster, chaque processus relit data/tickets_data.json sous verrou avant d'écrire
+et n'y remplace que les tickets des serveurs qu'il gère
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre processus
+    fcntl = None
+
+Tickets = Dict[str, Any]
+
+
+@contextmanager
+def locked(path: str) -> Iterator[None]:
+    """Verrou exclusif entre processus (fichier `path`.lock), bloquant"""
+    with open(path + ".lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read(path: str) -> Optional[Tickets]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write(path: str, data: Tickets) -> None:
+    """Écriture atomique : un autre processus ne lit jamais un fichier à moitié écrit"""
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
+    os.replace(path + ".tmp", path)
+
+
+def merge(disk: Tickets, memory: Tickets, owned: Callable[[Dict[str, Any]], bool]) -> Tickets:
+    """
+    Fusionne le fichier et l'état en mémoire d'un processus : les tickets (et leurs entrées
+    de file de vérification) des serveurs gérés viennent de la mémoire, les autres du fichier
+    """
+    disk_active = disk.get("active_tickets", {})
+    active = {uid: ticket for uid, ticket in disk_active.items() if not owned(ticket)}
+
+    for uid, ticket in memory.get("active_tickets", {}).items():
+        on_disk = disk_active.get(uid)
+        if ticket.get("guild_id") is None and on_disk is not None and on_disk.get("guild_id") is not None:
+            # Ancien ticket rattaché entre-temps à son serveur par le processus qui voit son canal
+            continue
+        if owned(ticket):
+            active[uid] = ticket
+
+    # Une entrée de file suit son ticket ; celles des tickets fermés disparaissent
+    live_ids = {ticket["ticket_id"] for ticket in active.values()}
+    owned_ids = {ticket["ticket_id"] for ticket in active.values() if owned(ticket)}
+    queue = {
+        ticket_id: entry for ticket_id, entry in disk.get("verification_queue", {}).items()
+        if ticket_id in live_ids and ticket_id not in owned_ids
+    }
+    queue.update({
+        ticket_id: entry for ticket_id, entry in memory.get("verification_queue", {}).items()
+        if ticket_id in owned_ids
+    })
+
+    merged = dict(memory)
+    merged["active_tickets"] = active
+    merged["verification_queue"] = queue
+    return merged
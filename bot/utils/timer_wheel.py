@@ -0,0 +1,70 @@
+"""
+🕰️ Roue temporelle (hashed timer wheel) pour Themis-Bot
+Planification et annulation en O(1), chaque tick ne parcourt qu'une case
+"""
+
+import time
+from typing import Dict, Hashable, List, Optional
+
+
+class TimerWheel:
+    """
+    Roue de `slots` cases de `tick_seconds` secondes
+    Une échéance au-delà d'un tour complet reste dans sa case et est ignorée
+    tant qu'elle n'est pas atteinte : le coût d'un tick ne dépend que du contenu de la case
+    """
+
+    def __init__(self, tick_seconds: float = 60.0, slots: int = 1440, now: Optional[float] = None):
+        self.tick_seconds = tick_seconds
+        self.slots: List[Dict[Hashable, float]] = [{} for _ in range(slots)]
+        # clé -> case courante, pour annuler/replanifier sans recherche
+        self._where: Dict[Hashable, int] = {}
+        self._last_tick = self._tick_of(time.time() if now is None else now)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self.tick_seconds)
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """Planifie (ou replanifie) une clé à une échéance absolue"""
+        self.cancel(key)
+        # Une échéance déjà passée est traitée au prochain tick
+        tick = max(self._tick_of(deadline), self._last_tick + 1)
+        slot = tick % len(self.slots)
+        self.slots[slot][key] = deadline
+        self._where[key] = slot
+
+    def cancel(self, key: Hashable) -> None:
+        """Retire une clé de la roue"""
+        slot = self._where.pop(key, None)
+        if slot is not None:
+            self.slots[slot].pop(key, None)
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """Fait tourner la roue jusqu'à `now` et retourne les clés échues"""
+        now = time.time() if now is None else now
+        target = self._tick_of(now)
+        if target <= self._last_tick:
+            return []
+
+        # Après une longue pause, un seul passage sur chaque case suffit
+        ticks = range(self._last_tick + 1, target + 1)
+        if len(ticks) > len(self.slots):
+            ticks = range(target - len(self.slots) + 1, target + 1)
+
+        expired = []
+        for tick in ticks:
+            bucket = self.slots[tick % len(self.slots)]
+            for key, deadline in list(bucket.items()):
+                if deadline <= now:
+                    del bucket[key]
+                    del self._where[key]
+                    expired.append(key)
+
+        self._last_tick = target
+        return expired
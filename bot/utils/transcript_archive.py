@@ -0,0 +1,159 @@
+"""
+🗃️ Archives compactées des transcripts de tickets
+Segments gzip multi-membres avec index d'offsets pour un accès direct
+"""
+
+import gzip
+import json
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from bot.utils.transcript_index import parse_ticket_id, parse_transcript_name
+
+INDEX_VERSION = 1
+
+
+class TranscriptArchive:
+    """
+    Regroupe les vieux transcripts dans des segments compressés
+    Chaque transcript est un membre gzip indépendant : la lecture d'un seul transcript
+    ne décompresse que ses propres octets, et un segment reste lisible avec zcat
+    """
+
+    def __init__(self, tickets_dir: str = "data/tickets/", archive_dir: Optional[str] = None):
+        self.tickets_dir = tickets_dir
+        self.archive_dir = archive_dir or os.path.join(tickets_dir, "archives")
+        self.logger = logging.getLogger(__name__)
+        # nom de fichier -> (segment, offset, longueur)
+        self._by_name: Dict[str, Tuple[str, int, int]] = {}
+        # ID ticket -> nom de fichier
+        self._by_ticket: Dict[str, str] = {}
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+    def load(self) -> int:
+        """Charge en mémoire les index de tous les segments"""
+        self._by_name.clear()
+        self._by_ticket.clear()
+        for filename in sorted(os.listdir(self.archive_dir)):
+            if filename.endswith(".idx.json"):
+                with open(os.path.join(self.archive_dir, filename), "r", encoding="utf-8") as f:
+                    self._register(json.load(f))
+        return len(self._by_name)
+
+    def _register(self, index: dict) -> None:
+        segment = index["segment"]
+        for entry in index["entries"]:
+            self._by_name[entry["name"]] = (segment, entry["offset"], entry["length"])
+            if entry.get("ticket_id"):
+                self._by_ticket[entry["ticket_id"]] = entry["name"]
+
+    def contains(self, name: str) -> bool:
+        """Indique si un transcript (nom de fichier) est archivé"""
+        return os.path.basename(name) in self._by_name
+
+    def name_for_ticket(self, ticket_id: str) -> Optional[str]:
+        """Nom de fichier d'un transcript archivé à partir de l'ID du ticket"""
+        return self._by_ticket.get(ticket_id)
+
+    def read(self, name: str) -> Optional[str]:
+        """Lit un transcript archivé sans décompresser le reste du segment"""
+        location = self._by_name.get(os.path.basename(name))
+        if location is None:
+            return None
+        segment, offset, length = location
+        with open(os.path.join(self.archive_dir, segment), "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        return gzip.decompress(data).decode("utf-8", errors="replace")
+
+    def resolve(self, path: str) -> Optional[str]:
+        """Lit un transcript depuis son chemin d'origine, qu'il soit encore sur disque ou archivé"""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except FileNotFoundError:
+            return self.read(path)
+
+    def _candidates(self, older_than_days: int) -> List[str]:
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        candidates = []
+        for filename in sorted(os.listdir(self.tickets_dir)):
+            parsed = parse_transcript_name(filename)
+            if parsed and datetime.strptime(parsed[1], "%Y-%m-%d %H:%M:%S") < cutoff:
+                candidates.append(filename)
+        return candidates
+
+    def compact(self, older_than_days: int = 30, segment_max_bytes: int = 64 * 1024 * 1024) -> Tuple[int, int]:
+        """
+        Archive les transcripts plus vieux que N jours
+        Retourne (transcripts archivés, segments écrits). Bloquant : à lancer dans un thread
+        """
+        archived = 0
+        segments = 0
+        batch: List[str] = []
+
+        for filename in self._candidates(older_than_days):
+            path = os.path.join(self.tickets_dir, filename)
+            if filename in self._by_name:
+                # Déjà archivé lors d'un passage interrompu avant la suppression
+                os.remove(path)
+                continue
+            batch.append(filename)
+
+        while batch:
+            written = self._write_segment(batch, segment_max_bytes)
+            archived += written
+            segments += 1
+            batch = batch[written:]
+
+        if archived:
+            self.logger.info(f"🗃️ {archived} transcripts compactés dans {segments} segment(s)")
+        return archived, segments
+
+    def _write_segment(self, filenames: List[str], segment_max_bytes: int) -> int:
+        """Écrit un segment et son index, puis supprime les originaux. Retourne le nombre archivé"""
+        segment = f"segment_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.gz"
+        segment_path = os.path.join(self.archive_dir, segment)
+        index_path = segment_path[:-len(".gz")] + ".idx.json"
+
+        entries = []
+        offset = 0
+        with open(segment_path + ".tmp", "wb") as out:
+            for filename in filenames:
+                with open(os.path.join(self.tickets_dir, filename), "rb") as f:
+                    raw = f.read()
+                member = gzip.compress(raw, mtime=0)
+                out.write(member)
+
+                parsed = parse_transcript_name(filename)
+                entries.append({
+                    "name": filename,
+                    "ticket_id": parse_ticket_id(raw.decode("utf-8", errors="replace")),
+                    "user_id": parsed[0] if parsed else None,
+                    "offset": offset,
+                    "length": len(member),
+                    "size": len(raw)
+                })
+                offset += len(member)
+                if offset >= segment_max_bytes:
+                    break
+            out.flush()
+            os.fsync(out.fileno())
+
+        index = {"version": INDEX_VERSION, "segment": segment, "entries": entries}
+        with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Le segment d'abord, l'index ensuite : un index publié pointe toujours vers un segment complet
+        os.replace(segment_path + ".tmp", segment_path)
+        os.replace(index_path + ".tmp", index_path)
+        self._register(index)
+
+        for entry in entries:
+            os.remove(os.path.join(self.tickets_dir, entry["name"]))
+
+        return len(entries)
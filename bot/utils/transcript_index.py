@@ -0,0 +1,220 @@
+"""
+🔎 Index plein texte des transcripts de tickets
+Table SQLite FTS5 alimentée à la fermeture des tickets
+"""
+
+import asyncio
+import os
+import re
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiofiles
+
+from bot.utils.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    ticket_id TEXT,
+    user_id TEXT,
+    closed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_transcripts_user ON transcripts (user_id, closed_at);
+CREATE INDEX IF NOT EXISTS idx_transcripts_closed ON transcripts (closed_at);
+CREATE INDEX IF NOT EXISTS idx_transcripts_ticket ON transcripts (ticket_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+    content,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# SQLite compilé sans FTS5 : texte brut, recherche par LIKE (parcours complet, plus lent)
+FALLBACK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts_text (
+    rowid INTEGER PRIMARY KEY,
+    content TEXT NOT NULL
+);
+"""
+
+TRANSCRIPT_NAME = re.compile(r"^transcript_(?P<user>\d+)_(?P<stamp>\d{8}_\d{6})\.txt$")
+TICKET_ID_LINE = re.compile(r"^ID Ticket: (?P<ticket>\w+)$", re.MULTILINE)
+CHANNEL_LINE = re.compile(r"^Canal: #ticket-.*-(?P<ticket>[0-9a-f]{8})$", re.MULTILINE)
+
+
+def parse_transcript_name(filename: str) -> Optional[Tuple[str, str]]:
+    """Extrait (user_id, date ISO) d'un nom transcript_<user>_<AAAAMMJJ_HHMMSS>.txt"""
+    match = TRANSCRIPT_NAME.match(filename)
+    if not match:
+        return None
+    closed_at = datetime.strptime(match.group("stamp"), "%Y%m%d_%H%M%S")
+    return match.group("user"), closed_at.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_ticket_id(content: str) -> Optional[str]:
+    """Retrouve l'ID du ticket dans l'en-tête du transcript"""
+    match = TICKET_ID_LINE.search(content) or CHANNEL_LINE.search(content)
+    return match.group("ticket") if match else None
+
+
+def phrase_query(text: str) -> str:
+    """Transforme un texte libre en requête de phrase exacte FTS5"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def like_pattern(text: str) -> str:
+    """Motif LIKE « contient ce texte » (caractères spéciaux échappés par \\)"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def text_snippet(content: str, text: str, width: int = 60) -> str:
+    """Extrait autour de la première occurrence de `text`, mise en gras comme snippet() de FTS5"""
+    start = content.lower().find(text.lower())
+    if start < 0:
+        return content[:width * 2].strip() + "…"
+    end = start + len(text)
+    before = content[max(0, start - width):start]
+    after = content[end:end + width]
+    prefix = "…" if start > width else ""
+    suffix = "…" if end + width < len(content) else ""
+    return f"{prefix}{before}**{content[start:end]}**{after}{suffix}"
+
+
+class TranscriptIndex:
+    """Index FTS5 des transcripts (recherche par utilisateur, période et phrase)"""
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.logger = logging.getLogger(__name__)
+        # False si SQLite n'a pas le module FTS5 (voir FALLBACK_SCHEMA)
+        self.fts = True
+
+    async def setup(self) -> None:
+        """Crée les tables de l'index si nécessaire"""
+        await self.db.executescript(SCHEMA)
+        try:
+            await self.db.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self.fts = False
+            await self.db.executescript(FALLBACK_SCHEMA)
+            self.logger.warning(f"🔎 FTS5 indisponible ({e}) : recherche des transcripts par LIKE, plus lente")
+
+    async def index_file(self, path: str, content: Optional[str] = None) -> bool:
+        """Indexe un transcript (ignoré s'il est déjà présent). Retourne True si ajouté"""
+        parsed = parse_transcript_name(os.path.basename(path))
+        if parsed is None:
+            return False
+
+        if content is None:
+            async with aiofiles.open(path, "r", encoding="utf-8", errors="replace") as f:
+                content = await f.read()
+
+        user_id, closed_at = parsed
+        conn = self.db.conn
+        cursor = await conn.execute(
+            "INSERT OR IGNORE INTO transcripts (path, ticket_id, user_id, closed_at) VALUES (?, ?, ?, ?)",
+            (os.path.normpath(path), parse_ticket_id(content), user_id, closed_at)
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        await conn.execute(
+            f"INSERT INTO {'transcripts_fts' if self.fts else 'transcripts_text'} (rowid, content) VALUES (?, ?)",
+            (cursor.lastrowid, content)
+        )
+        await conn.commit()
+        return True
+
+    async def backfill(self, directory: str) -> int:
+        """Indexe en une fois les transcripts existants pas encore présents dans l'index"""
+        known = {row["path"] for row in await self.db.fetchall("SELECT path FROM transcripts")}
+
+        pending = []
+        for filename in os.listdir(directory):
+            path = os.path.normpath(os.path.join(directory, filename))
+            if path not in known and parse_transcript_name(filename):
+                pending.append(path)
+
+        def read_all() -> List[Tuple[str, str]]:
+            rows = []
+            for path in pending:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    rows.append((path, f.read()))
+            return rows
+
+        added = 0
+        for path, content in await asyncio.to_thread(read_all):
+            if await self.index_file(path, content):
+                added += 1
+
+        if added:
+            self.logger.info(f"🔎 {added} transcripts existants indexés")
+        return added
+
+    async def search(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Recherche plein texte avec filtres optionnels
+        since/until sont des dates 'AAAA-MM-JJ' (bornes incluses)
+        """
+        where: List[str] = []
+        filters: List[Any] = []
+
+        if user_id:
+            where.append("t.user_id = ?")
+            filters.append(user_id)
+        if since:
+            where.append("t.closed_at >= ?")
+            filters.append(f"{since} 00:00:00")
+        if until:
+            where.append("t.closed_at <= ?")
+            filters.append(f"{until} 23:59:59")
+
+        if not self.fts:
+            return await self._search_text(query, where, filters, limit)
+
+        sql = (
+            "SELECT t.path, t.ticket_id, t.user_id, t.closed_at, "
+            "snippet(transcripts_fts, 0, '**', '**', '…', 16) AS extract "
+            "FROM transcripts_fts JOIN transcripts t ON t.id = transcripts_fts.rowid "
+            f"WHERE {' AND '.join(['transcripts_fts MATCH ?', *where])} ORDER BY rank LIMIT ?"
+        )
+
+        try:
+            rows = await self.db.fetchall(sql, [query, *filters, limit])
+        except sqlite3.OperationalError:
+            # Syntaxe FTS invalide : recherche de la phrase exacte
+            rows = await self.db.fetchall(sql, [phrase_query(query), *filters, limit])
+
+        return [dict(row) for row in rows]
+
+    async def _search_text(self, query: str, where: List[str], filters: List[Any], limit: int) -> List[Dict[str, Any]]:
+        """Recherche de la phrase par LIKE, sans FTS5 (plus récents d'abord)"""
+        conditions = ["x.content LIKE ? ESCAPE '\\'", *where]
+        sql = (
+            "SELECT t.path, t.ticket_id, t.user_id, t.closed_at, x.content "
+            "FROM transcripts_text x JOIN transcripts t ON t.id = x.rowid "
+            f"WHERE {' AND '.join(conditions)} "
+            "ORDER BY t.closed_at DESC LIMIT ?"
+        )
+        rows = await self.db.fetchall(sql, [like_pattern(query), *filters, limit])
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            result["extract"] = text_snippet(result.pop("content"), query)
+            results.append(result)
+        return results
@@ -0,0 +1,152 @@
+"""
+📥 File de vérification d'identité pour Themis-Bot
+Tas ordonné par priorité puis ancienneté, adossé au store des tickets
+"""
+
+import heapq
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# (-priorité, soumis à, ID ticket)
+HeapItem = Tuple[int, float, str]
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Percentile par rang le plus proche (None si aucune valeur)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class VerificationQueue:
+    """
+    File des tickets en attente de vérification
+    Les entrées vivent dans le dict `entries` (persisté avec les tickets) ; le tas n'est
+    qu'un ordre de passage, ses entrées obsolètes (boost, prise, retrait) sont ignorées à la lecture
+    """
+
+    def __init__(self, wait_samples: int = 500):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[HeapItem] = []
+        # Temps d'attente récents (soumission -> prise en charge), en secondes
+        self.waits: Deque[float] = deque(maxlen=wait_samples)
+
+    def load(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Adopte le dict persistant des entrées et reconstruit le tas"""
+        self.entries = entries
+        self._heap = [self._key(entry) for entry in entries.values() if not entry.get("claimed_by")]
+        heapq.heapify(self._heap)
+
+    @staticmethod
+    def _key(entry: Dict[str, Any]) -> HeapItem:
+        return (-entry.get("priority", 0), entry["submitted_at"], entry["ticket_id"])
+
+    def _is_current(self, item: HeapItem) -> bool:
+        entry = self.entries.get(item[2])
+        return entry is not None and not entry.get("claimed_by") and self._key(entry) == item
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self.entries.values() if not entry.get("claimed_by"))
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self.entries
+
+    def push(self, ticket_id: str, user_id: str, channel_id: int, priority: int = 0) -> bool:
+        """Ajoute un ticket à la file. Retourne False s'il y est déjà (l'ancienneté est conservée)"""
+        if ticket_id in self.entries:
+            return False
+        entry = {
+            "ticket_id": ticket_id,
+            "user_id": user_id,
+            "channel_id": channel_id,
+            "submitted_at": time.time(),
+            "priority": priority,
+            "claimed_by": None,
+            "claimed_at": None
+        }
+        self.entries[ticket_id] = entry
+        heapq.heappush(self._heap, self._key(entry))
+        return True
+
+    def boost(self, ticket_id: str, amount: int = 1) -> Optional[Dict[str, Any]]:
+        """Augmente la priorité d'un ticket en attente"""
+        entry = self.entries.get(ticket_id)
+        if entry is None:
+            return None
+        entry["priority"] = entry.get("priority", 0) + amount
+        if not entry.get("claimed_by"):
+            heapq.heappush(self._heap, self._key(entry))
+        return entry
+
+    def remove(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """Retire un ticket de la file (vérifié, rejeté ou fermé)"""
+        return self.entries.pop(ticket_id, None)
+
+    def peek(self, count: int) -> List[Dict[str, Any]]:
+        """Retourne les `count` prochains tickets non pris, sans les retirer"""
+        taken: List[HeapItem] = []
+        seen = set()
+        while self._heap and len(taken) < count:
+            item = heapq.heappop(self._heap)
+            # Une prise ciblée laisse sa clé dans le tas, release() en pousse une identique :
+            # un même ticket ne doit sortir qu'une fois
+            if item[2] not in seen and self._is_current(item):
+                seen.add(item[2])
+                taken.append(item)
+        # Les entrées obsolètes et les doublons rencontrés sont simplement abandonnés
+        for item in taken:
+            heapq.heappush(self._heap, item)
+        return [self.entries[item[2]] for item in taken]
+
+    def claim(self, moderator_id: int, ticket_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Attribue un ticket à un modérateur : le prochain de la file, ou celui demandé
+        Sans point d'attente : deux appels concurrents ne peuvent pas obtenir le même ticket
+        """
+        if ticket_id is None:
+            while self._heap:
+                item = heapq.heappop(self._heap)
+                if self._is_current(item):
+                    ticket_id = item[2]
+                    break
+            else:
+                return None
+
+        entry = self.entries.get(ticket_id)
+        if entry is None or entry.get("claimed_by"):
+            return None
+
+        now = time.time()
+        entry["claimed_by"] = moderator_id
+        entry["claimed_at"] = now
+        self.waits.append(now - entry["submitted_at"])
+        return entry
+
+    def release(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """Remet un ticket pris dans la file, avec son ancienneté d'origine"""
+        entry = self.entries.get(ticket_id)
+        if entry is None or not entry.get("claimed_by"):
+            return None
+        entry["claimed_by"] = None
+        entry["claimed_at"] = None
+        heapq.heappush(self._heap, self._key(entry))
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Profondeur de la file et percentiles des temps d'attente"""
+        now = time.time()
+        pending = [now - entry["submitted_at"] for entry in self.entries.values() if not entry.get("claimed_by")]
+        waits = list(self.waits)
+        return {
+            "depth": len(pending),
+            "claimed": len(self.entries) - len(pending),
+            "oldest": max(pending) if pending else None,
+            "p50": percentile(waits, 50),
+            "p90": percentile(waits, 90),
+            "p99": percentile(waits, 99),
+            "samples": len(waits)
+        }
@@ -1,11 +1,13 @@
 """
 🏛️ Themis-Bot - Gardien de l'Ordre
 Point d'entrée principal du bot Discord
+Avec `cluster.processes` > 1, un superviseur répartit les shards entre plusieurs processus
 """
 
 import asyncio
 import logging
 from bot.themis import ThemisBot
+from bot.utils.cluster import ClusterInfo, Supervisor, recommended_shards, shard_ranges
 from bot.utils.config import Config
 from bot.utils.logger import setup_logger
 
@@ -35,5 +37,33 @@ async def main():
         await bot.close()
         logger.info("🏛️ Themis-Bot s'est retiré dans l'Olympe")
 
+def main_cluster(config: Config, processes: int):
+    """Mode cluster : un processus par plage de shards, sous la garde d'un superviseur"""
+    
+    setup_logger()
+    logger = logging.getLogger(__name__)
+    
+    # Le découpage doit être connu avant de lancer les processus
+    shard_count = config.get('bot.shard_count') or asyncio.run(recommended_shards(config.get('bot.token')))
+    ranges = shard_ranges(shard_count, processes)
+    clusters = [
+        ClusterInfo(id=index, count=len(ranges), shard_ids=shard_ids, shard_count=shard_count)
+        for index, shard_ids in enumerate(ranges)
+    ]
+    
+    logger.info(f"🧩 Mode cluster : {shard_count} shards répartis sur {len(clusters)} processus")
+    Supervisor(
+        clusters,
+        metrics_path=config.get('cluster.metrics_path', 'data/cluster_metrics.json'),
+        report_interval=config.get('cluster.report_interval', 60),
+        max_backoff=config.get('cluster.max_backoff', 60)
+    ).run()
+    logger.info("🏛️ Themis-Bot s'est retiré dans l'Olympe")
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    config = Config()
+    processes = config.get('cluster.processes', 1)
+    if processes > 1:
+        main_cluster(config, processes)
+    else:
+        asyncio.run(main())
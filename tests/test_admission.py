@@ -0,0 +1,157 @@
+"""
+🚦 Tests du contrôle d'admission
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from bot.utils.admission import AdmissionQueue
+
+
+def test_jobs_of_one_guild_run_in_order():
+    async def scenario():
+        queue = AdmissionQueue()
+        started = []
+
+        def job(n):
+            async def run():
+                started.append(n)
+                return n
+            return run
+
+        futures = [queue.submit(1, job(n))[1] for n in range(3)]
+        return await asyncio.gather(*futures), started
+
+    assert asyncio.run(scenario()) == ([0, 1, 2], [0, 1, 2])
+
+
+def test_jobs_wait_for_the_route_budget():
+    async def scenario():
+        # Budget épuisé pendant 50 ms, puis disponible (comme RateLimitTracker.wait_time)
+        reset_at = time.monotonic() + 0.05
+        queue = AdmissionQueue(pace=lambda key: max(0.0, reset_at - time.monotonic()))
+
+        async def job():
+            return time.monotonic()
+
+        _, future = queue.submit(1, job)
+        return await future, reset_at
+
+    ran_at, reset_at = asyncio.run(scenario())
+    assert ran_at >= reset_at
+
+
+def test_pace_is_asked_per_guild():
+    async def scenario():
+        asked = []
+
+        def pace(key):
+            asked.append(key)
+            return 0.0
+
+        queue = AdmissionQueue(pace=pace)
+
+        async def job():
+            pass
+
+        await asyncio.gather(queue.submit(1, job)[1], queue.submit(2, job)[1])
+        return sorted(asked)
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+def test_guilds_do_not_wait_for_each_other():
+    async def scenario():
+        queue = AdmissionQueue()
+        gate = asyncio.Event()
+
+        async def slow():
+            await gate.wait()
+
+        async def fast():
+            return "ok"
+
+        queue.submit(1, slow)
+        _, future = queue.submit(2, fast)
+        result = await asyncio.wait_for(future, timeout=1)
+        gate.set()
+        queue.close()
+        return result
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_positions_count_the_running_job():
+    async def scenario():
+        queue = AdmissionQueue()
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+
+        first, _ = queue.submit(1, blocked)
+        await asyncio.sleep(0)
+        second, _ = queue.submit(1, blocked)
+        third, _ = queue.submit(1, blocked)
+        queue.close()
+        return first, second, third
+
+    assert asyncio.run(scenario()) == (1, 2, 3)
+
+
+def test_full_queue_rejects_new_jobs():
+    async def scenario():
+        queue = AdmissionQueue(maxsize=2)
+
+        async def job():
+            pass
+
+        queue.submit(1, job)
+        queue.submit(1, job)
+        try:
+            with pytest.raises(asyncio.QueueFull):
+                queue.submit(1, job)
+            # Les autres serveurs ne sont pas concernés
+            queue.submit(2, job)
+        finally:
+            queue.close()
+
+    asyncio.run(scenario())
+
+
+def test_job_errors_reach_the_caller_and_the_worker_continues():
+    async def scenario():
+        queue = AdmissionQueue()
+
+        async def failing():
+            raise RuntimeError("création refusée")
+
+        async def working():
+            return "suivant"
+
+        _, failed = queue.submit(1, failing)
+        _, next_one = queue.submit(1, working)
+        with pytest.raises(RuntimeError):
+            await failed
+        return await next_one
+
+    assert asyncio.run(scenario()) == "suivant"
+
+
+def test_close_cancels_pending_jobs():
+    async def scenario():
+        queue = AdmissionQueue()
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+
+        queue.submit(1, blocked)
+        _, pending = queue.submit(1, blocked)
+        await asyncio.sleep(0)
+        queue.close()
+        return pending.cancelled()
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,49 @@
+"""
+🧠 Tests de l'estimation des caches
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from bot.utils import cache_report
+from bot.utils.cache_report import estimate_size, guild_cache_report
+
+
+def test_estimate_size_extrapolates_from_a_sample(monkeypatch):
+    objects = [SimpleNamespace(name="membre") for _ in range(1000)]
+    measured = []
+    shallow = cache_report._shallow_size
+
+    def counting(obj):
+        measured.append(obj)
+        return shallow(obj)
+
+    monkeypatch.setattr(cache_report, "_shallow_size", counting)
+    size = estimate_size(objects, sample=20)
+
+    assert len(measured) == 20
+    assert size == shallow(objects[0]) * 1000
+
+
+def test_report_is_built_off_the_event_loop(monkeypatch):
+    big = SimpleNamespace(id=1, name="Grand", member_count=300, chunked=False,
+                          members=[SimpleNamespace(id=n) for n in range(200)], channels=[], roles=[])
+    small = SimpleNamespace(id=2, name="Petit", member_count=2, chunked=True,
+                            members=[SimpleNamespace(id=1)], channels=[], roles=[])
+    messages = [SimpleNamespace(guild=small, content="bonjour"), SimpleNamespace(guild=None, content="mp")]
+    bot = SimpleNamespace(guilds=[small, big], cached_messages=messages)
+
+    threads = []
+    build = cache_report._build_report
+
+    def recording(*args):
+        threads.append(threading.current_thread())
+        return build(*args)
+
+    monkeypatch.setattr(cache_report, "_build_report", recording)
+    report = asyncio.run(guild_cache_report(bot))
+    assert threads and threads[0] is not threading.main_thread()
+    assert [entry["guild"].name for entry in report] == ["Grand", "Petit"]
+    assert report[0]["members"] == 200 and not report[0]["chunked"]
+    assert report[1]["messages"] == 1
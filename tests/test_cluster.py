@@ -0,0 +1,61 @@
+"""
+🧩 Tests du mode cluster
+"""
+
+from bot.utils.cluster import aggregate, shard_for_guild, shard_ranges
+
+
+def test_shard_ranges_cover_every_shard_once():
+    assert shard_ranges(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert shard_ranges(4, 2) == [[0, 1], [2, 3]]
+
+
+def test_shard_ranges_never_leave_a_process_empty():
+    assert shard_ranges(2, 5) == [[0], [1]]
+    assert shard_ranges(3, 0) == [[0, 1, 2]]
+
+
+def test_shard_for_guild_follows_discord_rule():
+    guild_id = 81384788765712384
+    assert shard_for_guild(guild_id, 1) == 0
+    assert shard_for_guild(guild_id, 4) == (guild_id >> 22) % 4
+
+
+def shard(latency_ms, rate, connects=1, resumes=0):
+    return {"latency_ms": latency_ms, "events": 0, "rate": rate,
+            "connects": connects, "resumes": resumes, "disconnects": 0}
+
+
+def test_aggregate_sums_processes():
+    metrics = [
+        {"ready": True, "guilds": 3, "users": 100, "users_partial": False,
+         "shards": {0: shard(40, 1.5), 1: shard(None, 0.5, connects=2)},
+         "stats": {"messages_moderated": 2}, "rest": {"high": 1}, "memory": 1000},
+        {"ready": False, "guilds": 2, "users": 50, "users_partial": True,
+         "shards": {2: shard(90, 1.0, resumes=1)},
+         "stats": {"messages_moderated": 3}, "rest": {"high": 2, "bulk": 4}, "memory": None}
+    ]
+
+    summary = aggregate(metrics)
+
+    assert summary["processes"] == 2
+    assert summary["ready"] == 1
+    assert summary["guilds"] == 5
+    assert summary["users"] == 150
+    assert summary["users_partial"] is True
+    assert summary["shards"] == 3
+    assert summary["events_per_second"] == 3.0
+    # Une connexion initiale par shard n'est pas une reconnexion
+    assert summary["reconnects"] == 2
+    assert summary["max_latency_ms"] == 90
+    assert summary["memory"] == 1000
+    assert summary["stats"] == {"messages_moderated": 5}
+    assert summary["rest"] == {"high": 3, "bulk": 4}
+
+
+def test_aggregate_without_metrics():
+    summary = aggregate([])
+
+    assert summary["processes"] == 0
+    assert summary["max_latency_ms"] is None
+    assert summary["users_partial"] is False
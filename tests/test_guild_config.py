@@ -0,0 +1,43 @@
+"""
+🗂️ Tests de la configuration par serveur
+"""
+
+import pytest
+
+from bot.utils.guild_config import parse_value
+
+
+def test_bool_accepts_french_and_english():
+    assert parse_value("moderation.auto_delete", " Oui ") is True
+    assert parse_value("moderation.auto_delete", "off") is False
+    with pytest.raises(ValueError):
+        parse_value("moderation.auto_delete", "peut-être")
+
+
+def test_int_is_parsed():
+    assert parse_value("security.test_timeout", " 45 ") == 45
+    with pytest.raises(ValueError, match="entier"):
+        parse_value("security.test_timeout", "45s")
+
+
+def test_dict_expects_a_json_object():
+    assert parse_value("channel_rules", '{"123": {"no_links": true}}') == {"123": {"no_links": True}}
+    with pytest.raises(ValueError, match="objet JSON"):
+        parse_value("channel_rules", "[1, 2]")
+    with pytest.raises(ValueError, match="JSON invalide"):
+        parse_value("channel_rules", "{")
+
+
+def test_unknown_key_is_rejected():
+    with pytest.raises(ValueError, match="inconnu"):
+        parse_value("bot.token", "secret")
+
+
+def test_prefix_is_stripped():
+    assert parse_value("prefix", "  ?? ") == "??"
+
+
+@pytest.mark.parametrize("raw", ["", "   "])
+def test_empty_prefix_is_rejected(raw):
+    with pytest.raises(ValueError):
+        parse_value("prefix", raw)
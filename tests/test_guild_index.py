@@ -0,0 +1,138 @@
+"""
+🗂️ Tests de l'index des rôles et canaux
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from bot.utils.guild_index import GuildIndex
+
+
+class FakeBot:
+    def add_listener(self, func, name):
+        pass
+
+
+class FakeGuild:
+    def __init__(self, guild_id=1):
+        self.id = guild_id
+        self._roles = {}
+        self._channels = {}
+
+    @property
+    def roles(self):
+        return sorted(self._roles.values(), key=lambda role: role.position)
+
+    @property
+    def channels(self):
+        return list(self._channels.values())
+
+    def get_role(self, role_id):
+        return self._roles.get(role_id)
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def add_role(self, role_id, name, position):
+        role = SimpleNamespace(id=role_id, name=name, position=position, guild=self)
+        self._roles[role_id] = role
+        return role
+
+    def add_channel(self, channel_id, name, position=0):
+        channel = SimpleNamespace(id=channel_id, name=name, position=position, guild=self)
+        self._channels[channel_id] = channel
+        return channel
+
+
+def indexed(aliases=None):
+    guild = FakeGuild()
+    guild.add_role(10, "🎭 Citoyen", 1)
+    guild.add_role(11, "⚖️ Magistrat", 2)
+    guild.add_channel(20, "🎫-logs-tickets")
+    index = GuildIndex(FakeBot(), aliases)
+    asyncio.run(index.on_guild_available(guild))
+    return index, guild
+
+
+def test_lookups_by_name():
+    index, guild = indexed()
+
+    assert index.role(guild, "🎭 Citoyen").id == 10
+    assert index.channel(guild, "🎫-logs-tickets").id == 20
+    assert index.role(guild, "inconnu") is None
+    assert [role.id for role in index.roles(guild, ["⚖️ Magistrat", "inconnu", "🎭 Citoyen"])] == [11, 10]
+
+
+def test_role_rename_moves_the_entry():
+    index, guild = indexed()
+    before = guild.get_role(10)
+    after = guild.add_role(10, "🎭 Habitant", 1)
+
+    asyncio.run(index.on_guild_role_update(before, after))
+
+    assert index.role(guild, "🎭 Citoyen") is None
+    assert index.role(guild, "🎭 Habitant") is after
+
+
+def test_channel_rename_and_delete():
+    index, guild = indexed()
+    before = guild.get_channel(20)
+    after = guild.add_channel(20, "📜-logs")
+
+    asyncio.run(index.on_guild_channel_update(before, after))
+    assert index.channel(guild, "🎫-logs-tickets") is None
+    assert index.channel(guild, "📜-logs") is after
+
+    del guild._channels[20]
+    asyncio.run(index.on_guild_channel_delete(after))
+    assert index.channel(guild, "📜-logs") is None
+    assert "📜-logs" not in index._channels[guild.id]
+
+
+def test_role_delete_falls_back_to_remaining_homonym():
+    index, guild = indexed()
+    twin = guild.add_role(12, "🎭 Citoyen", 5)
+    asyncio.run(index.on_guild_role_create(twin))
+
+    deleted = guild._roles.pop(10)
+    asyncio.run(index.on_guild_role_delete(deleted))
+
+    assert index.role(guild, "🎭 Citoyen") is twin
+
+
+def test_homonyms_resolve_in_position_order():
+    index, guild = indexed()
+    # Un nouveau rôle arrive tout en bas de la hiérarchie, avant le rôle existant
+    newest = guild.add_role(13, "⚖️ Magistrat", 1)
+    guild.get_role(10).position = 2
+    guild.get_role(11).position = 3
+    asyncio.run(index.on_guild_role_create(newest))
+
+    assert index.role(guild, "⚖️ Magistrat") is newest
+
+    # Même règle que discord.utils.get sur la liste triée du serveur
+    first = next(role for role in guild.roles if role.name == "⚖️ Magistrat")
+    assert index.role(guild, "⚖️ Magistrat") is first
+
+    second = guild.add_channel(21, "🎫-logs-tickets", position=-1)
+    asyncio.run(index.on_guild_channel_create(second))
+    assert index.channel(guild, "🎫-logs-tickets") is second
+
+
+def test_aliases_map_canonical_names():
+    index, guild = indexed(aliases={"🎭 Citoyen": "Membre vérifié"})
+    renamed = guild.add_role(10, "Membre vérifié", 1)
+    asyncio.run(index.on_guild_available(guild))
+
+    assert index.role(guild, "🎭 Citoyen") is renamed
+    assert index.role(guild, "Membre vérifié") is renamed
+
+
+def test_guild_remove_drops_the_index():
+    index, guild = indexed()
+
+    asyncio.run(index.on_guild_remove(guild))
+
+    assert guild.id not in index._roles
+    # Reconstruit à la demande
+    assert index.role(guild, "🎭 Citoyen").id == 10
@@ -0,0 +1,79 @@
+"""
+📜 Tests du journal des tickets
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from bot.utils.journal import TicketJournal
+
+
+def message(content):
+    return SimpleNamespace(
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        author=SimpleNamespace(display_name="Alice", id=42),
+        content=content,
+        attachments=[],
+        embeds=[]
+    )
+
+
+def test_messages_are_appended_in_order(tmp_path):
+    journal = TicketJournal(str(tmp_path))
+
+    async def scenario():
+        await journal.open("t1", "ticket-alice", "42")
+        await journal.append_message("t1", message("bonjour"))
+        await journal.append_delete("t1", 123)
+
+    asyncio.run(scenario())
+    text = open(journal.path_for("t1"), encoding="utf-8").read()
+    assert text.startswith("=== TRANSCRIPT DU TICKET ===")
+    assert text.index("Alice (42): bonjour") < text.index("Message 123 supprimé")
+
+
+def test_finalize_moves_journal_to_transcript(tmp_path):
+    journal = TicketJournal(str(tmp_path / "journals"))
+    transcript = str(tmp_path / "transcript.txt")
+
+    async def scenario():
+        await journal.open("t1", "ticket-alice", "42")
+        return await journal.finalize("t1", transcript, "Modérateur", "Résolu")
+
+    assert asyncio.run(scenario()) is True
+    assert not journal.exists("t1")
+    text = open(transcript, encoding="utf-8").read()
+    assert "Fermé par: Modérateur" in text
+    assert "Raison: Résolu" in text
+
+
+def test_messages_after_finalize_do_not_recreate_journal(tmp_path):
+    journal = TicketJournal(str(tmp_path / "journals"))
+    transcript = str(tmp_path / "transcript.txt")
+
+    async def scenario():
+        await journal.open("t1", "ticket-alice", "42")
+        await journal.finalize("t1", transcript, None, "Fermé")
+        await journal.append_message("t1", message("trop tard"))
+
+    asyncio.run(scenario())
+    assert not journal.exists("t1")
+    assert "trop tard" not in open(transcript, encoding="utf-8").read()
+    assert os.listdir(journal.journal_dir) == []
+
+
+def test_message_waiting_on_finalize_is_dropped(tmp_path):
+    journal = TicketJournal(str(tmp_path / "journals"))
+    transcript = str(tmp_path / "transcript.txt")
+
+    async def scenario():
+        await journal.open("t1", "ticket-alice", "42")
+        await asyncio.gather(
+            journal.finalize("t1", transcript, None, "Fermé"),
+            journal.append_message("t1", message("en vol"))
+        )
+
+    asyncio.run(scenario())
+    assert not journal.exists("t1")
@@ -0,0 +1,163 @@
+"""
+⚖️ Tests du Jugement Divin (exécution par lots et reprise)
+"""
+
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import discord
+
+from bot.utils.judgment import DivineJudgment
+from bot.utils.ratelimit import RateLimitTracker
+from bot.utils.rest_scheduler import RestScheduler
+
+
+def not_found():
+    return discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Channel")
+
+
+class FakeRedemption:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.name = "rédemption"
+        self.sent = []
+        self.edits = 0
+
+    async def send(self, embed=None):
+        self.sent.append(embed)
+        return SimpleNamespace(id=len(self.sent))
+
+    def get_partial_message(self, message_id):
+        async def edit(embed=None):
+            self.edits += 1
+        return SimpleNamespace(edit=edit)
+
+
+class FakeGuild:
+    def __init__(self, guild_id=1, channels=0, roles=0):
+        self.id = guild_id
+        self.name = "Royaume"
+        self.deleted = []
+        self._channels = {}
+        self._roles = {}
+        for n in range(channels):
+            self._add(self._channels, 100 + n, f"canal-{n}")
+        for n in range(roles):
+            self._add(self._roles, 500 + n, f"rôle-{n}", is_default=lambda: False, managed=False)
+        self._roles[1] = SimpleNamespace(id=1, name="@everyone", is_default=lambda: True, managed=False)
+
+    def _add(self, store, object_id, name, **extra):
+        async def delete(reason=None):
+            if object_id not in store:
+                raise not_found()
+            del store[object_id]
+            self.deleted.append(object_id)
+        store[object_id] = SimpleNamespace(id=object_id, name=name, delete=delete, **extra)
+
+    @property
+    def channels(self):
+        return list(self._channels.values())
+
+    @property
+    def roles(self):
+        return list(self._roles.values())
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    async def create_text_channel(self, name, topic=None, reason=None):
+        channel = FakeRedemption(900)
+        self._channels[channel.id] = channel
+        return channel
+
+
+def make_bot(guild):
+    return SimpleNamespace(
+        rest=RestScheduler(RateLimitTracker()),
+        get_guild=lambda guild_id: guild if guild_id == guild.id else None
+    )
+
+
+def checkpoint(tmp_path, guild_id=1):
+    path = os.path.join(str(tmp_path), f"{guild_id}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_delete_batches_checkpoints_after_each_batch(tmp_path):
+    async def scenario():
+        guild = FakeGuild(channels=5)
+        judgment = DivineJudgment(make_bot(guild), directory=str(tmp_path), batch_size=2)
+        redemption = await guild.create_text_channel("rédemption")
+        state = {"guild_id": guild.id, "progress_message_id": None, "deleted_channels": 0,
+                 "deleted_roles": 0, "errors": [], "phase": "channels"}
+
+        saved = []
+        save = judgment._save
+        judgment._save = lambda state: (saved.append(state["deleted_channels"]), save(state))
+
+        # Un canal déjà supprimé (reprise) n'est ni compté ni une erreur
+        gone = guild._channels.pop(104)
+        requests = [(channel, "DELETE", f"/channels/{channel.id}", channel.delete)
+                    for channel in [*guild.channels, gone] if channel.id != redemption.id]
+        await judgment._delete_batches(state, redemption, "deleted_channels", "Canal", requests)
+        judgment.bot.rest.close()
+        return state, saved, redemption
+
+    state, saved, redemption = asyncio.run(scenario())
+    # 5 suppressions en lots de 2 : un point de reprise par lot (plus celui du premier message de progression)
+    assert saved == [2, 2, 4, 4]
+    assert state["deleted_channels"] == 4
+    assert state["errors"] == []
+    assert checkpoint(tmp_path)["deleted_channels"] == 4
+    assert redemption.edits + len(redemption.sent) == 3
+
+
+def test_resume_all_finishes_an_interrupted_judgment(tmp_path):
+    guild = FakeGuild(channels=4, roles=3)
+
+    async def first_run():
+        judgment = DivineJudgment(make_bot(guild), directory=str(tmp_path), batch_size=2)
+        # Le processus s'arrête pendant la suppression du premier rôle : tous les canaux sont déjà partis
+        blocked = asyncio.Event()
+        deleting = guild._roles[500].delete
+
+        async def hang(reason=None):
+            blocked.set()
+            await asyncio.Event().wait()
+            await deleting(reason)
+
+        guild._roles[500].delete = hang
+        judgment.start(guild, "Modérateur#0001")
+        await asyncio.wait_for(blocked.wait(), timeout=2)
+        await asyncio.sleep(0.05)
+        judgment.cancel_all()
+        judgment.bot.rest.close()
+        guild._roles[500].delete = deleting
+
+    asyncio.run(first_run())
+    interrupted = checkpoint(tmp_path)
+    assert interrupted["phase"] == "roles"
+    assert interrupted["deleted_channels"] == 4
+    assert interrupted["redemption_channel_id"] == 900
+
+    # Le rôle 501 est parti dans le lot interrompu : la reprise le trouve absent sans erreur
+    async def resumed_run():
+        judgment = DivineJudgment(make_bot(guild), directory=str(tmp_path), batch_size=2)
+        assert judgment.resume_all() == 1
+        assert judgment.running(guild.id)
+        await asyncio.wait_for(judgment._tasks[guild.id], timeout=2)
+        judgment.bot.rest.close()
+        return judgment
+
+    asyncio.run(resumed_run())
+    assert checkpoint(tmp_path) is None
+    assert sorted(object_id for object_id in guild.deleted if object_id >= 500) == [500, 501, 502]
+    assert len(set(guild.deleted)) == len(guild.deleted)
+    # Le canal de rédemption survit, seul
+    assert [channel.id for channel in guild.channels] == [900]
+    assert [role.id for role in guild.roles] == [1]
@@ -0,0 +1,106 @@
+"""
+📈 Tests des compteurs de membres
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from bot.utils.member_stats import MemberStats
+
+
+class FakeBot:
+    def __init__(self):
+        self.guilds = []
+
+    def add_listener(self, func, name):
+        pass
+
+
+def member(user_id, *role_ids, bot=False, guild=None):
+    roles = [SimpleNamespace(id=role_id) for role_id in role_ids]
+    return SimpleNamespace(id=user_id, bot=bot, roles=roles, guild=guild)
+
+
+def guild(guild_id, members, chunked=True, member_count=None):
+    return SimpleNamespace(
+        id=guild_id, members=members, chunked=chunked,
+        member_count=member_count if member_count is not None else len(members)
+    )
+
+
+def test_counts_humans_bots_and_roles():
+    bot = FakeBot()
+    stats = MemberStats(bot)
+    server = guild(1, [member(10, 100), member(11, 100, 101), member(12, bot=True)])
+    bot.guilds.append(server)
+    asyncio.run(stats.on_guild_available(server))
+
+    assert stats.humans(server) == 2
+    assert stats.bots(server) == 1
+    role = SimpleNamespace(id=100, guild=server, is_default=lambda: False)
+    assert stats.role_count(role) == 2
+
+
+def test_member_update_moves_role_counts():
+    bot = FakeBot()
+    stats = MemberStats(bot)
+    server = guild(1, [member(10, 100)])
+    bot.guilds.append(server)
+    asyncio.run(stats.on_guild_available(server))
+
+    before = member(10, 100, guild=server)
+    after = member(10, 101, guild=server)
+    asyncio.run(stats.on_member_update(before, after))
+
+    counters = stats._guilds[1]
+    assert counters.roles[100] == 0
+    assert counters.roles[101] == 1
+
+
+def test_unique_users_deduplicates_counted_guilds():
+    bot = FakeBot()
+    stats = MemberStats(bot)
+    first = guild(1, [member(10), member(11)])
+    second = guild(2, [member(11), member(12)])
+    bot.guilds += [first, second]
+    for server in bot.guilds:
+        asyncio.run(stats.on_guild_available(server))
+
+    assert stats.unique_users() == 3
+    assert not stats.partial()
+
+
+def test_unique_users_falls_back_to_member_count():
+    bot = FakeBot()
+    stats = MemberStats(bot)
+    counted = guild(1, [member(10), member(11)])
+    # Serveur non parcouru : seul le bot est en cache, Discord annonce 500 membres
+    uncounted = guild(2, [member(99, bot=True)], chunked=False, member_count=500)
+    bot.guilds += [counted, uncounted]
+    for server in bot.guilds:
+        asyncio.run(stats.on_guild_available(server))
+
+    assert stats.unique_users() == 502
+    assert stats.partial()
+
+    # Liste chargée à la demande : le serveur est compté exactement
+    uncounted.members = [member(99, bot=True), member(10), member(20)]
+    uncounted.member_count = 3
+    uncounted.chunked = True
+    stats.refresh(uncounted)
+    assert stats.unique_users() == 4
+    assert not stats.partial()
+
+
+def test_unchunked_guild_is_never_cached():
+    bot = FakeBot()
+    stats = MemberStats(bot)
+    server = guild(1, [member(10, 100), member(11, bot=True)], chunked=False, member_count=500)
+    bot.guilds.append(server)
+
+    # Lecture à la demande : estimation depuis le cache, sans figer le serveur comme compté
+    assert stats.humans(server) == 1
+    assert stats.bots(server) == 1
+    assert 1 not in stats._guilds
+    assert stats.partial()
+    assert stats.unique_users() == 500
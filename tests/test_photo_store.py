@@ -0,0 +1,110 @@
+"""
+🪪 Tests du stockage des photos d'identité
+"""
+
+import asyncio
+import os
+
+import discord
+
+from bot.utils.photo_store import CHUNK_SIZE, FRAME_HEADER, IdentityPhotoStore
+
+KEY = "00" * 32
+
+
+def read_all(store, path):
+    async def scenario():
+        return b"".join([chunk async for chunk in store.iter_chunks(path)])
+    return asyncio.run(scenario())
+
+
+def test_plain_photo_is_read_back_in_chunks(tmp_path):
+    store = IdentityPhotoStore(str(tmp_path))
+    data = os.urandom(CHUNK_SIZE * 2 + 10)
+    os.makedirs(store.ticket_dir("t1"))
+    with open(os.path.join(store.ticket_dir("t1"), "abc.bin"), "wb") as f:
+        f.write(data)
+
+    path = store.path_for("t1", "abc")
+    assert path.endswith("abc.bin")
+    assert read_all(store, path) == data
+
+
+def test_encrypted_photo_is_decrypted_frame_by_frame(tmp_path):
+    store = IdentityPhotoStore(str(tmp_path), key=KEY)
+    chunks = [os.urandom(CHUNK_SIZE), os.urandom(123)]
+    os.makedirs(store.ticket_dir("t1"))
+    with open(os.path.join(store.ticket_dir("t1"), "abc.enc"), "wb") as f:
+        for chunk in chunks:
+            frame = store._box.encrypt(chunk)
+            f.write(FRAME_HEADER.pack(len(frame)) + frame)
+
+    assert store.encrypted
+    path = store.path_for("t1", "abc")
+    assert path.endswith("abc.enc")
+    assert read_all(store, path) == b"".join(chunks)
+
+
+def test_path_for_prefers_current_mode_and_falls_back(tmp_path):
+    plain = IdentityPhotoStore(str(tmp_path))
+    encrypted = IdentityPhotoStore(str(tmp_path), key=KEY)
+    os.makedirs(plain.ticket_dir("t1"))
+    for extension in (".bin", ".enc"):
+        open(os.path.join(plain.ticket_dir("t1"), "abc" + extension), "wb").close()
+
+    assert plain.path_for("t1", "abc").endswith(".bin")
+    assert encrypted.path_for("t1", "abc").endswith(".enc")
+    os.remove(os.path.join(plain.ticket_dir("t1"), "abc.bin"))
+    assert plain.path_for("t1", "abc").endswith(".enc")
+    assert plain.path_for("t1", "inconnue") is None
+
+
+def test_purge_except_keeps_active_tickets(tmp_path):
+    store = IdentityPhotoStore(str(tmp_path))
+    for ticket_id in ("actif", "ferme"):
+        os.makedirs(store.ticket_dir(ticket_id))
+
+    assert asyncio.run(store.purge_except(["actif"])) == 1
+    assert os.listdir(str(tmp_path)) == ["actif"]
+
+
+def write_encrypted(store, ticket_id, name, chunks):
+    os.makedirs(store.ticket_dir(ticket_id), exist_ok=True)
+    with open(os.path.join(store.ticket_dir(ticket_id), name + ".enc"), "wb") as f:
+        for chunk in chunks:
+            frame = store._box.encrypt(chunk)
+            f.write(FRAME_HEADER.pack(len(frame)) + frame)
+    return store.path_for(ticket_id, name)
+
+
+def test_open_streams_encrypted_photo_for_discord_file(tmp_path):
+    store = IdentityPhotoStore(str(tmp_path), key=KEY)
+    chunks = [os.urandom(CHUNK_SIZE), os.urandom(CHUNK_SIZE), os.urandom(7)]
+    path = write_encrypted(store, "t1", "abc", chunks)
+
+    reader = store.open(path)
+    # discord.File exige un flux lisible et repositionnable
+    file = discord.File(reader, filename="photo.png")
+    assert reader.read(10) == chunks[0][:10]
+    file.reset(seek=True)
+    assert reader.tell() == 0
+    parts = []
+    while part := reader.read(1000):
+        parts.append(part)
+    assert b"".join(parts) == b"".join(chunks)
+
+    reader.seek(CHUNK_SIZE + 3)
+    assert reader.read(4) == chunks[1][3:7]
+    file.close()
+    reader.close()
+    assert reader.closed
+
+
+def test_open_plain_photo_returns_the_file(tmp_path):
+    store = IdentityPhotoStore(str(tmp_path))
+    os.makedirs(store.ticket_dir("t1"))
+    with open(os.path.join(store.ticket_dir("t1"), "abc.bin"), "wb") as f:
+        f.write(b"image")
+
+    with store.open(store.path_for("t1", "abc")) as f:
+        assert f.read() == b"image"
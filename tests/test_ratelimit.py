@@ -0,0 +1,128 @@
+"""
+🚥 Tests du suivi des limites de l'API
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from bot.utils.ratelimit import RateLimitTracker, route_key
+
+GUILD = "/guilds/123456789012345678"
+
+
+def response(method, path, remaining=None, reset_after=None, status=200):
+    headers = {}
+    if remaining is not None:
+        headers["X-RateLimit-Remaining"] = str(remaining)
+        headers["X-RateLimit-Reset-After"] = str(reset_after)
+    return SimpleNamespace(
+        method=method,
+        url=SimpleNamespace(path=path),
+        response=SimpleNamespace(headers=headers, status=status, content_length=0)
+    )
+
+
+def test_route_key_keeps_major_parameters_and_masks_the_others():
+    assert route_key("post", f"/api/v10{GUILD}/channels") == f"POST {GUILD}/channels"
+    assert route_key("PATCH", f"{GUILD}/members/234567890123456789") == f"PATCH {GUILD}/members/{{id}}"
+    assert route_key("DELETE", "/channels/345678901234567890/messages/456789012345678901") == \
+        "DELETE /channels/345678901234567890/messages/{id}"
+    assert route_key("GET", "/users/567890123456789012") == "GET /users/{id}"
+
+
+def test_routes_of_other_guilds_have_their_own_budget():
+    tracker = RateLimitTracker()
+    asyncio.run(tracker._on_request_end(None, None, response("POST", f"{GUILD}/channels", 0, 5)))
+
+    assert tracker.remaining("POST", f"{GUILD}/channels") == 0
+    assert tracker.remaining("POST", "/guilds/987654321098765432/channels") is None
+    assert tracker.wait_time("POST", f"{GUILD}/channels") > 4
+    assert tracker.wait_time("POST", "/guilds/987654321098765432/channels") == 0
+
+
+def test_budget_expires_with_its_window():
+    tracker = RateLimitTracker()
+    asyncio.run(tracker._on_request_end(None, None, response("POST", f"{GUILD}/roles", 0, 0)))
+
+    assert tracker.remaining("POST", f"{GUILD}/roles") is None
+    assert tracker.wait_time("POST", f"{GUILD}/roles") == 0
+
+
+def test_requests_in_flight_consume_the_remaining_budget():
+    tracker = RateLimitTracker()
+    path = f"{GUILD}/channels"
+    asyncio.run(tracker._on_request_end(None, None, response("POST", path, 2, 5)))
+
+    async def scenario():
+        await tracker.acquire("POST", path)
+        await tracker.acquire("POST", path)
+        blocked = tracker.wait_time("POST", path)
+        tracker.release("POST", path)
+        return blocked, tracker.wait_time("POST", path)
+
+    blocked, after_release = asyncio.run(scenario())
+    assert blocked > 4
+    assert after_release == 0
+
+
+def test_calls_are_counted_per_route_and_429():
+    tracker = RateLimitTracker()
+
+    async def scenario():
+        await tracker._on_request_end(None, None, response("POST", f"{GUILD}/channels"))
+        await tracker._on_request_end(None, None, response("POST", f"{GUILD}/channels", status=429))
+
+    asyncio.run(scenario())
+    assert tracker.total == 2
+    assert tracker.rate_limited == 1
+    assert tracker.by_route[f"POST {GUILD}/channels"] == 2
+
+
+def test_tracked_usage_only_counts_its_own_task():
+    tracker = RateLimitTracker()
+
+    async def command(label, calls):
+        async with tracker.track(label) as usage:
+            for _ in range(calls):
+                await tracker._on_request_end(None, None, response("POST", f"{GUILD}/channels"))
+                await asyncio.sleep(0)
+        return usage.calls
+
+    async def scenario():
+        return await asyncio.gather(command("/setup", 3), command("/ping", 1))
+
+    assert asyncio.run(scenario()) == [3, 1]
+    assert tracker.total == 4
+    assert tracker.usage["/setup"].calls == 3
+
+
+def test_command_tree_attributes_calls_to_the_slash_command():
+    import discord
+    from discord.ext import commands
+
+    from bot.utils.ratelimit import TrackedCommandTree
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none(), tree_cls=TrackedCommandTree)
+    bot.ratelimits = tracker = RateLimitTracker()
+    interaction = SimpleNamespace(
+        type=discord.InteractionType.application_command,
+        data={"name": "setup", "options": [{"type": 1, "name": "appliquer", "options": []}]},
+        extras={}
+    )
+
+    async def invoker():
+        # Même enchaînement que la tâche d'une interaction dans discord.py
+        assert await bot.tree.interaction_check(interaction)
+        await tracker._on_request_end(None, None, response("POST", f"{GUILD}/roles"))
+        await tracker._on_request_end(None, None, response("POST", f"{GUILD}/channels"))
+        await bot.tree._on_completion(interaction, None)
+
+    async def scenario():
+        await asyncio.create_task(invoker())
+        # Hors de la tâche de l'interaction, rien n'est attribué à la commande
+        await tracker._on_request_end(None, None, response("GET", "/users/567890123456789012"))
+
+    asyncio.run(scenario())
+    totals = tracker.usage["/setup appliquer"]
+    assert (totals.invocations, totals.calls) == (1, 2)
+    assert interaction.extras == {}
@@ -0,0 +1,183 @@
+"""
+📮 Tests de l'ordonnanceur des appels REST
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.utils.ratelimit import RateLimitTracker
+from bot.utils.rest_scheduler import Priority, RestScheduler
+
+
+def test_urgent_classes_are_served_first():
+    async def scenario():
+        rest = RestScheduler(RateLimitTracker(), workers=1)
+        gate = asyncio.Event()
+        order = []
+
+        def job(name):
+            async def run():
+                order.append(name)
+            return run
+
+        async def blocked():
+            await gate.wait()
+
+        first = rest.submit(Priority.BULK, "POST", "/a", blocked)
+        await asyncio.sleep(0)
+        futures = [
+            rest.submit(Priority.LOGGING, "POST", "/b", job("log")),
+            rest.submit(Priority.BULK, "POST", "/c", job("bulk")),
+            rest.submit(Priority.ENFORCEMENT, "DELETE", "/d", job("enforcement")),
+            rest.submit(Priority.RESPONSE, "POST", "/e", job("response")),
+        ]
+        assert rest.pending() == {"ENFORCEMENT": 1, "RESPONSE": 1, "LOGGING": 1, "BULK": 1}
+        gate.set()
+        await asyncio.gather(first, *futures)
+        rest.close()
+        return order
+
+    assert asyncio.run(scenario()) == ["enforcement", "response", "log", "bulk"]
+
+
+def test_guilds_take_turns_within_a_class():
+    async def scenario():
+        rest = RestScheduler(RateLimitTracker(), workers=1)
+        gate = asyncio.Event()
+        order = []
+
+        def job(name):
+            async def run():
+                order.append(name)
+            return run
+
+        async def blocked():
+            await gate.wait()
+
+        first = rest.submit(Priority.LOGGING, "POST", "/x", blocked, guild_id=9)
+        await asyncio.sleep(0)
+        futures = [rest.submit(Priority.LOGGING, "POST", "/a", job(f"a{n}"), guild_id=1) for n in range(3)]
+        futures.append(rest.submit(Priority.LOGGING, "POST", "/b", job("b0"), guild_id=2))
+        gate.set()
+        await asyncio.gather(first, *futures)
+        rest.close()
+        return order
+
+    assert asyncio.run(scenario()) == ["a0", "b0", "a1", "a2"]
+
+
+def test_exhausted_route_does_not_block_other_routes():
+    async def scenario():
+        tracker = RateLimitTracker()
+        exhausted = "/channels/123456789012345678/messages"
+        await tracker._on_request_end(None, None, SimpleNamespace(
+            method="POST", url=SimpleNamespace(path=exhausted),
+            response=SimpleNamespace(headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.2"},
+                                     status=200, content_length=0)
+        ))
+        rest = RestScheduler(tracker, workers=2)
+        order = []
+
+        def job(name):
+            async def run():
+                order.append(name)
+            return run
+
+        waiting = rest.submit(Priority.ENFORCEMENT, "POST", exhausted, job("exhausted"))
+        ready = rest.submit(Priority.BULK, "POST", "/channels/234567890123456789/messages", job("other"))
+        await asyncio.gather(waiting, ready)
+        rest.close()
+        return order
+
+    assert asyncio.run(scenario()) == ["other", "exhausted"]
+
+
+def test_errors_reach_the_caller():
+    async def scenario():
+        rest = RestScheduler(RateLimitTracker(), workers=1)
+
+        async def failing():
+            raise RuntimeError("403")
+
+        try:
+            with pytest.raises(RuntimeError):
+                await rest.call(Priority.RESPONSE, "POST", "/a", failing)
+            return await rest.call(Priority.RESPONSE, "POST", "/a", lambda: asyncio.sleep(0, "ok"))
+        finally:
+            rest.close()
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_run_many_returns_exceptions_in_place():
+    async def scenario():
+        rest = RestScheduler(RateLimitTracker(), workers=4)
+
+        async def ok():
+            return 1
+
+        async def failing():
+            raise ValueError("refusé")
+
+        try:
+            return await rest.run_many([("POST", "/a", ok), ("POST", "/b", failing), ("POST", "/c", ok)], concurrency=2)
+        finally:
+            rest.close()
+
+    results = asyncio.run(scenario())
+    assert results[0] == 1 and results[2] == 1
+    assert isinstance(results[1], ValueError)
+
+
+def test_stuck_bulk_calls_do_not_starve_enforcement():
+    async def scenario():
+        rest = RestScheduler(RateLimitTracker(), workers=4, reserved=1, bulk_limit=10)
+        gate = asyncio.Event()
+
+        async def stuck():
+            # Appel bloqué dans un nouvel essai après un 429
+            await gate.wait()
+
+        async def enforce():
+            return "supprimé"
+
+        bulk = [rest.submit(Priority.BULK, "DELETE", f"/channels/{n}", stuck) for n in range(10)]
+        await asyncio.sleep(0)
+        result = await asyncio.wait_for(rest.submit(Priority.ENFORCEMENT, "DELETE", "/m", enforce), timeout=1)
+        gate.set()
+        await asyncio.gather(*bulk)
+        rest.close()
+        return result
+
+    assert asyncio.run(scenario()) == "supprimé"
+
+
+def test_bulk_calls_in_flight_are_capped():
+    async def scenario():
+        rest = RestScheduler(RateLimitTracker(), workers=6, reserved=0, bulk_limit=2)
+        gate = asyncio.Event()
+        running = []
+        peak = []
+
+        async def bulk():
+            running.append(1)
+            peak.append(len(running))
+            await gate.wait()
+            running.pop()
+
+        async def respond():
+            return "ok"
+
+        bulks = [rest.submit(Priority.BULK, "POST", f"/guilds/1/roles/{n}", bulk) for n in range(5)]
+        await asyncio.sleep(0.01)
+        # Les autres classes gardent des workers libres
+        answer = await asyncio.wait_for(rest.submit(Priority.RESPONSE, "POST", "/r", respond), timeout=1)
+        in_flight = len(running)
+        gate.set()
+        await asyncio.gather(*bulks)
+        rest.close()
+        return answer, in_flight, max(peak)
+
+    assert asyncio.run(scenario()) == ("ok", 2, 2)
@@ -0,0 +1,139 @@
+"""
+⏳ Tests du planificateur de tâches
+"""
+
+import asyncio
+import os
+
+from bot.utils.database import Database
+from bot.utils.scheduler import Scheduler
+
+
+def run(tmp_path, scenario, **kwargs):
+    async def main():
+        db = Database(os.path.join(str(tmp_path), "themis.db"))
+        await db.connect()
+        scheduler = Scheduler(db, retry_delay=0.05, **kwargs)
+        try:
+            return await scenario(db, scheduler)
+        finally:
+            try:
+                await scheduler.stop()
+            finally:
+                await db.close()
+    return asyncio.run(main())
+
+
+def test_due_jobs_run_and_are_removed(tmp_path):
+    async def scenario(db, scheduler):
+        done = []
+
+        async def handler(payload):
+            done.append(payload["n"])
+
+        scheduler.register("test", handler)
+        await scheduler.start()
+        for n in range(3):
+            await scheduler.schedule("test", delay=0, payload={"n": n})
+        await asyncio.sleep(0.1)
+        return done, await db.fetchall("SELECT id FROM scheduled_jobs")
+
+    done, rows = run(tmp_path, scenario)
+    assert sorted(done) == [0, 1, 2]
+    assert rows == []
+
+
+def test_dedup_key_replaces_pending_job(tmp_path):
+    async def scenario(db, scheduler):
+        done = []
+
+        async def handler(payload):
+            done.append(payload["n"])
+
+        scheduler.register("test", handler)
+        await scheduler.start()
+        await scheduler.schedule("test", delay=0.05, payload={"n": 1}, key="k")
+        await scheduler.schedule("test", delay=0.05, payload={"n": 2}, key="k")
+        await asyncio.sleep(0.2)
+        return done
+
+    assert run(tmp_path, scenario) == [2]
+
+
+def test_missing_handler_keeps_job_until_registered(tmp_path):
+    async def scenario(db, scheduler):
+        done = []
+
+        async def handler(payload):
+            done.append(payload)
+
+        await scheduler.start()
+        await scheduler.schedule("late", delay=0)
+        await asyncio.sleep(0.02)
+        scheduler.register("late", handler)
+        await asyncio.sleep(0.15)
+        return done
+
+    assert run(tmp_path, scenario) == [{}]
+
+
+def test_infrastructure_error_does_not_stop_the_runner(tmp_path):
+    async def scenario(db, scheduler):
+        done = []
+
+        async def handler(payload):
+            done.append(payload)
+
+        scheduler.register("test", handler)
+        await scheduler.start()
+
+        fetchone = db.fetchone
+        failures = [RuntimeError("base indisponible")]
+
+        async def flaky_fetchone(*args):
+            if failures:
+                raise failures.pop()
+            return await fetchone(*args)
+
+        db.fetchone = flaky_fetchone
+        await scheduler.schedule("test", delay=0)
+        await asyncio.sleep(0.15)
+        return done, scheduler._runner.done()
+
+    done, stopped = run(tmp_path, scenario)
+    assert done == [{}]
+    assert not stopped
+
+
+def test_concurrent_schedules_with_same_key_keep_one_job(tmp_path):
+    async def scenario(db, scheduler):
+        await scheduler.start()
+        ids = await asyncio.gather(*(
+            scheduler.schedule("test", delay=60, payload={"n": n}, key="k") for n in range(5)
+        ))
+        return ids, await db.fetchall("SELECT id FROM scheduled_jobs")
+
+    ids, rows = run(tmp_path, scenario)
+    assert len(set(ids)) == 1
+    assert [row["id"] for row in rows] == [ids[0]]
+
+
+def test_job_rescheduled_while_running_is_kept(tmp_path):
+    async def scenario(db, scheduler):
+        done = []
+
+        async def handler(payload):
+            done.append(payload["n"])
+            if payload["n"] == 1:
+                # Même clé replanifiée pendant l'exécution : la nouvelle échéance doit survivre
+                await scheduler.schedule("test", delay=0.05, payload={"n": 2}, key="k")
+
+        scheduler.register("test", handler)
+        await scheduler.start()
+        await scheduler.schedule("test", delay=0, payload={"n": 1}, key="k")
+        await asyncio.sleep(0.2)
+        return done, await db.fetchall("SELECT id FROM scheduled_jobs")
+
+    done, rows = run(tmp_path, scenario)
+    assert done == [1, 2]
+    assert rows == []
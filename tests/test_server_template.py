@@ -0,0 +1,39 @@
+"""
+🏗️ Tests du modèle de serveur
+"""
+
+from types import SimpleNamespace
+
+from bot.utils.ratelimit import route_key
+from bot.utils.server_template import Operation, ServerPlanner
+
+GUILD = SimpleNamespace(id=123456789012345678)
+
+
+def role_op(action, target=None):
+    spec = {"color": "0x3498DB", "permissions": ["send_messages"]}
+    return Operation(action, "role", "⚖️ Magistrat", target=target, spec=spec)
+
+
+def test_role_update_request_targets_the_role():
+    planner = ServerPlanner(None, {})
+    role = SimpleNamespace(id=234567890123456789)
+
+    method, path, _ = planner._role_request(GUILD, role_op("update", role))
+
+    assert (method, path) == ("PATCH", f"/guilds/{GUILD.id}/roles/{role.id}")
+    assert route_key(method, path) == f"PATCH /guilds/{GUILD.id}/roles/{{id}}"
+
+
+def test_role_create_request_targets_the_guild():
+    planner = ServerPlanner(None, {})
+
+    method, path, _ = planner._role_request(GUILD, role_op("create"))
+
+    assert (method, path) == ("POST", f"/guilds/{GUILD.id}/roles")
+
+
+def test_operation_description():
+    op = Operation("update", "channel", "📜-règles", changes=["sujet"])
+
+    assert op.describe() == "✏️ Canal **📜-règles** (sujet)"
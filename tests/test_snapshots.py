@@ -0,0 +1,88 @@
+"""
+📸 Tests des snapshots de serveur
+"""
+
+import asyncio
+import copy
+from types import SimpleNamespace
+
+from bot.utils.snapshots import SnapshotStore
+
+GUILD_ID = 123
+
+
+def role(name, position):
+    return {"name": name, "colour": 0, "permissions": 0, "hoist": False,
+            "mentionable": False, "position": position, "default": False}
+
+
+def channel(name, parent=None):
+    return {"name": name, "kind": "text", "position": 0, "parent": parent, "overwrites": [],
+            "topic": None, "nsfw": False, "slowmode": 0}
+
+
+def base_state():
+    return {
+        "roles": {"1": role("@everyone", 0), "2": role("⚖️ Magistrat", 1)},
+        "channels": {"10": channel("général"), "11": channel("règles")}
+    }
+
+
+def test_first_snapshot_is_full_then_incremental(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    state = base_state()
+
+    first = store.save(GUILD_ID, "Olympe", state)
+    assert first["full"] and first["changed"] == 4 and first["total"] == 4
+
+    state = copy.deepcopy(state)
+    state["channels"]["11"]["topic"] = "Lisez-moi"
+    del state["roles"]["2"]
+    second = store.save(GUILD_ID, "Olympe", state)
+
+    assert not second["full"]
+    assert (second["changed"], second["removed"], second["total"]) == (1, 1, 3)
+    assert store._read(GUILD_ID, second["name"])["base"] == first["name"]
+
+
+def test_load_replays_the_chain(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    states = [base_state()]
+    for step in range(3):
+        state = copy.deepcopy(states[-1])
+        state["channels"][str(20 + step)] = channel(f"salon-{step}")
+        state["channels"].pop("10", None)
+        states.append(state)
+    names = [store.save(GUILD_ID, "Olympe", state)["name"] for state in states]
+
+    assert store.names(GUILD_ID) == names
+    for name, state in zip(names, states):
+        assert store.load(GUILD_ID, name) == (name, state)
+    assert store.load(GUILD_ID) == (names[-1], states[-1])
+
+
+def test_chain_is_bounded_by_full_every(tmp_path):
+    store = SnapshotStore(str(tmp_path), full_every=3)
+    results = [store.save(GUILD_ID, "Olympe", base_state()) for _ in range(5)]
+
+    assert [result["full"] for result in results] == [True, False, False, True, False]
+    # Rien n'a changé : les deltas sont vides
+    assert results[1]["changed"] == 0 and results[1]["removed"] == 0
+    assert store.load(GUILD_ID)[1] == base_state()
+
+
+def test_capture_serializes_then_writes(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    everyone = SimpleNamespace(
+        id=1, name="@everyone", managed=False, colour=SimpleNamespace(value=0),
+        permissions=SimpleNamespace(value=104324673), hoist=False, mentionable=False, position=0,
+        is_default=lambda: True
+    )
+    bot_role = SimpleNamespace(id=2, managed=True)
+    guild = SimpleNamespace(id=GUILD_ID, name="Olympe", roles=[everyone, bot_role], channels=[])
+
+    result = asyncio.run(store.capture(guild))
+
+    assert result["full"] and result["total"] == 1
+    _, state = store.load(GUILD_ID)
+    assert list(state["roles"]) == ["1"] and state["roles"]["1"]["default"]
@@ -0,0 +1,89 @@
+"""
+🗂️ Tests du pool de catégories de tickets
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from bot.utils.ticket_categories import TicketCategoryPool
+
+
+class FakeCategory:
+    def __init__(self, guild):
+        self.id, self.name, self.position, self.guild = 10, "🎫 TICKETS", 0, guild
+
+    @property
+    def channels(self):
+        # Comme discord.py : les canaux d'une catégorie sont lus dans le cache du serveur
+        return [channel for channel in self.guild.channels if channel.category_id == self.id]
+
+
+class FakeGuild:
+    def __init__(self, existing=0):
+        self.id = 1
+        self.channels = []
+        self.category = FakeCategory(self)
+        self.categories = [self.category]
+        for _ in range(existing):
+            self.add_channel()
+
+    def add_channel(self):
+        channel = SimpleNamespace(category_id=self.category.id, guild=self)
+        self.channels.append(channel)
+        return channel
+
+    def get_channel(self, channel_id):
+        return self.category if channel_id == self.category.id else None
+
+
+def make_pool(existing=0):
+    guild = FakeGuild(existing)
+    pool = TicketCategoryPool(SimpleNamespace(), capacity=3)
+    pool._ensure(guild)
+    return pool, guild
+
+
+def create(pool, guild):
+    asyncio.run(pool.on_guild_channel_create(guild.add_channel()))
+
+
+def test_reserved_channel_is_counted_once():
+    pool, guild = make_pool(existing=1)
+
+    asyncio.run(pool.acquire(guild))
+    assert pool._counts[10] == 2
+    create(pool, guild)
+
+    assert pool._counts[10] == 2
+
+
+def test_channels_created_outside_the_pool_are_counted():
+    pool, guild = make_pool()
+
+    create(pool, guild)
+    create(pool, guild)
+    assert pool._counts[10] == 2
+
+    asyncio.run(pool.on_guild_channel_delete(guild.channels.pop()))
+    assert pool._counts[10] == 1
+
+
+def test_failed_creation_recounts_from_category_channels():
+    pool, guild = make_pool(existing=1)
+
+    asyncio.run(pool.acquire(guild))
+    # Un canal créé à la main consomme la réservation avant l'échec de la création du bot
+    create(pool, guild)
+    pool.cancel(10, guild)
+
+    assert pool._counts[10] == 2
+    assert pool._reserved[10] == 0
+
+
+def test_failed_creation_frees_the_slot():
+    pool, guild = make_pool(existing=1)
+
+    asyncio.run(pool.acquire(guild))
+    pool.cancel(10, guild)
+
+    assert pool._counts[10] == 1
@@ -0,0 +1,66 @@
+"""
+🎫 Tests du fichier de tickets partagé entre processus
+"""
+
+from bot.utils.ticket_store import merge
+
+OURS, THEIRS = 1, 2
+
+
+def owned(ticket):
+    return ticket.get("guild_id") == OURS
+
+
+def ticket(ticket_id, guild_id, **extra):
+    return {"ticket_id": ticket_id, "guild_id": guild_id, **extra}
+
+
+def test_owned_tickets_come_from_memory_others_from_disk():
+    disk = {"active_tickets": {
+        "10": ticket("a", OURS, status="ancien"),
+        "20": ticket("b", THEIRS, status="disque")
+    }}
+    memory = {"active_tickets": {
+        "10": ticket("a", OURS, status="mémoire"),
+        "20": ticket("b", THEIRS, status="périmé")
+    }}
+
+    merged = merge(disk, memory, owned)
+
+    assert merged["active_tickets"]["10"]["status"] == "mémoire"
+    assert merged["active_tickets"]["20"]["status"] == "disque"
+
+
+def test_ticket_closed_in_memory_disappears():
+    disk = {"active_tickets": {"10": ticket("a", OURS)}, "verification_queue": {"a": {"user_id": 10}}}
+    memory = {"active_tickets": {}, "verification_queue": {}}
+
+    merged = merge(disk, memory, owned)
+
+    assert merged["active_tickets"] == {}
+    assert merged["verification_queue"] == {}
+
+
+def test_queue_entries_follow_their_ticket():
+    disk = {
+        "active_tickets": {"10": ticket("a", OURS), "20": ticket("b", THEIRS)},
+        "verification_queue": {"a": {"from": "disque"}, "b": {"from": "disque"}, "x": {"from": "disque"}}
+    }
+    memory = {
+        "active_tickets": {"10": ticket("a", OURS)},
+        "verification_queue": {"a": {"from": "mémoire"}, "b": {"from": "mémoire"}}
+    }
+
+    merged = merge(disk, memory, owned)
+
+    assert merged["verification_queue"] == {"a": {"from": "mémoire"}, "b": {"from": "disque"}}
+
+
+def test_legacy_ticket_attached_by_another_process_is_kept():
+    # Ancien ticket sans serveur en mémoire, rattaché sur disque par le processus qui voit son canal
+    disk = {"active_tickets": {"30": ticket("c", THEIRS)}}
+    memory = {"active_tickets": {"30": ticket("c", None)}}
+
+    merged = merge(disk, memory, lambda t: t.get("guild_id") in (OURS, None))
+
+    assert merged["active_tickets"]["30"]["guild_id"] == THEIRS
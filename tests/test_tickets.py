@@ -0,0 +1,64 @@
+"""
+🎫 Tests du système de tickets
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from bot.cogs.tickets import TicketSystem, utc_timestamp
+from bot.utils.photo_store import IdentityPhotoStore
+
+
+def test_legacy_ticket_created_at_is_read_as_utc():
+    # Ticket enregistré avant le suivi d'activité : created_at vient de datetime.utcnow()
+    legacy = {"ticket_id": "0a1b2c3d", "created_at": "2024-03-01T12:00:00.123456"}
+    expected = datetime(2024, 3, 1, 12, 0, 0, 123456, tzinfo=timezone.utc).timestamp()
+
+    assert TicketSystem._last_activity(legacy) == expected
+
+
+def test_last_activity_takes_precedence_over_created_at():
+    ticket = {"created_at": "2024-03-01T12:00:00", "last_activity": 42.0}
+
+    assert TicketSystem._last_activity(ticket) == 42.0
+
+
+def test_aware_dates_keep_their_offset():
+    assert utc_timestamp("2024-03-01T14:00:00+02:00") == utc_timestamp("2024-03-01T12:00:00")
+
+
+def _compaction_calls(cluster_id):
+    calls = []
+    bot = SimpleNamespace(
+        owns_guild=lambda guild_id: guild_id is None and cluster_id == 0,
+        config=SimpleNamespace(get=lambda key, default=None: default)
+    )
+    cog = SimpleNamespace(bot=bot, archive=SimpleNamespace(compact=calls.append))
+    asyncio.run(TicketSystem.compact_transcripts.coro(cog))
+    return calls
+
+
+def test_only_first_cluster_compacts_transcripts():
+    assert _compaction_calls(0) == [30]
+    assert _compaction_calls(1) == []
+
+
+def test_photo_batches_respect_upload_limits(tmp_path):
+    store = IdentityPhotoStore(str(tmp_path))
+    os.makedirs(store.ticket_dir("t1"))
+    photos = []
+    for n, size in enumerate([4, 4, 4, 12] + [1] * 11):
+        sha = f"p{n}"
+        open(os.path.join(store.ticket_dir("t1"), sha + ".bin"), "wb").close()
+        photos.append({"sha256": sha, "filename": f"{sha}.png", "size": size})
+    photos.append({"sha256": "supprimee", "filename": "x.png", "size": 1})
+    cog = SimpleNamespace(photos=store)
+
+    batches, too_large = TicketSystem._photo_batches(cog, {"ticket_id": "t1", "photos": photos}, size_limit=10)
+
+    assert too_large == ["p3.png"]
+    sizes = [[photo["size"] for _, photo in batch] for batch in batches]
+    # Taille cumulée sous la limite et 10 pièces jointes au plus par message
+    assert sizes == [[4, 4], [4, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1]]
@@ -0,0 +1,58 @@
+"""
+🕰️ Tests de la roue temporelle
+"""
+
+from bot.utils.timer_wheel import TimerWheel
+
+
+def test_keys_expire_at_their_deadline():
+    wheel = TimerWheel(tick_seconds=10, slots=8, now=0)
+    wheel.schedule("a", 25)
+    wheel.schedule("b", 45)
+
+    assert wheel.advance(19) == []
+    assert wheel.advance(30) == ["a"]
+    assert "a" not in wheel and "b" in wheel
+    assert wheel.advance(50) == ["b"]
+    assert len(wheel) == 0
+
+
+def test_past_deadline_fires_on_next_tick():
+    wheel = TimerWheel(tick_seconds=10, slots=8, now=100)
+    wheel.schedule("late", 5)
+
+    assert wheel.advance(105) == []
+    assert wheel.advance(110) == ["late"]
+
+
+def test_reschedule_and_cancel():
+    wheel = TimerWheel(tick_seconds=10, slots=8, now=0)
+    wheel.schedule("a", 15)
+    wheel.schedule("a", 55)
+    wheel.schedule("b", 15)
+    wheel.cancel("b")
+    wheel.cancel("inconnue")
+
+    assert wheel.advance(20) == []
+    assert len(wheel) == 1
+    assert wheel.advance(60) == ["a"]
+
+
+def test_deadline_beyond_one_turn_waits_for_its_round():
+    wheel = TimerWheel(tick_seconds=10, slots=4, now=0)
+    # Même case que l'échéance 15, mais deux tours plus loin
+    wheel.schedule("far", 95)
+
+    assert wheel.advance(20) == []
+    assert wheel.advance(60) == []
+    assert "far" in wheel
+    assert wheel.advance(100) == ["far"]
+
+
+def test_long_pause_visits_each_slot_once():
+    wheel = TimerWheel(tick_seconds=10, slots=4, now=0)
+    for key, deadline in (("a", 15), ("b", 25), ("c", 35), ("d", 45)):
+        wheel.schedule(key, deadline)
+
+    assert sorted(wheel.advance(10_000)) == ["a", "b", "c", "d"]
+    assert len(wheel) == 0
@@ -0,0 +1,85 @@
+"""
+🗃️ Tests des archives de transcripts
+"""
+
+import gzip
+import json
+import os
+
+from bot.utils.transcript_archive import TranscriptArchive
+
+
+def write_transcript(directory, user_id, stamp, ticket_id, body):
+    name = f"transcript_{user_id}_{stamp}.txt"
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        f.write(f"ID Ticket: {ticket_id}\n{body}\n")
+    return name
+
+
+def test_compact_moves_old_transcripts_into_a_segment(tmp_path):
+    tickets = str(tmp_path)
+    old = write_transcript(tickets, 1, "20200101_120000", "aaaa1111", "premier")
+    recent = write_transcript(tickets, 2, "29990101_120000", "bbbb2222", "récent")
+    archive = TranscriptArchive(tickets)
+
+    assert archive.compact(older_than_days=30) == (1, 1)
+
+    assert not os.path.exists(os.path.join(tickets, old))
+    assert os.path.exists(os.path.join(tickets, recent))
+    assert archive.contains(old)
+    assert not archive.contains(recent)
+    assert archive.name_for_ticket("aaaa1111") == old
+
+
+def test_index_offsets_point_to_independent_gzip_members(tmp_path):
+    tickets = str(tmp_path)
+    names = [
+        write_transcript(tickets, user, f"2020010{user}_120000", f"t{user}", "x" * (100 * user))
+        for user in range(1, 4)
+    ]
+    archive = TranscriptArchive(tickets)
+    archive.compact(older_than_days=30)
+
+    [index_file] = [f for f in os.listdir(archive.archive_dir) if f.endswith(".idx.json")]
+    with open(os.path.join(archive.archive_dir, index_file), encoding="utf-8") as f:
+        index = json.load(f)
+    entries = index["entries"]
+
+    assert [entry["name"] for entry in entries] == names
+    assert entries[0]["offset"] == 0
+    for previous, entry in zip(entries, entries[1:]):
+        assert entry["offset"] == previous["offset"] + previous["length"]
+
+    with open(os.path.join(archive.archive_dir, index["segment"]), "rb") as f:
+        segment = f.read()
+    # Le segment entier reste un flux gzip valide (zcat)
+    assert gzip.decompress(segment).count(b"ID Ticket:") == 3
+    for entry in entries:
+        member = segment[entry["offset"]:entry["offset"] + entry["length"]]
+        assert len(gzip.decompress(member)) == entry["size"]
+
+
+def test_read_back_after_reload(tmp_path):
+    tickets = str(tmp_path)
+    name = write_transcript(tickets, 7, "20200101_120000", "cccc3333", "contenu archivé")
+    TranscriptArchive(tickets).compact(older_than_days=30)
+
+    archive = TranscriptArchive(tickets)
+    assert archive.read(name) is None
+    assert archive.load() == 1
+
+    assert archive.read(name) == "ID Ticket: cccc3333\ncontenu archivé\n"
+    assert archive.resolve(os.path.join(tickets, name)) == archive.read(name)
+    assert archive.read("transcript_0_20200101_120000.txt") is None
+
+
+def test_segments_are_split_at_max_size(tmp_path):
+    tickets = str(tmp_path)
+    for user in range(1, 4):
+        write_transcript(tickets, user, f"2020010{user}_120000", f"t{user}", os.urandom(200).hex())
+    archive = TranscriptArchive(tickets)
+
+    archived, segments = archive.compact(older_than_days=30, segment_max_bytes=1)
+
+    assert (archived, segments) == (3, 3)
+    assert archive.load() == 3
@@ -0,0 +1,97 @@
+"""
+🔎 Tests de l'index plein texte des transcripts
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from bot.utils import transcript_index
+from bot.utils.database import Database
+from bot.utils.transcript_index import TranscriptIndex
+
+TRANSCRIPTS = {
+    "transcript_111_20240301_120000.txt":
+        "ID Ticket: 0a1b2c3d\n[12:00] Alice: bonjour, voici ma pièce d'identité\n",
+    "transcript_111_20240410_090000.txt":
+        "ID Ticket: 1b2c3d4e\n[09:00] Alice: problème de vérification, photo floue\n",
+    "transcript_222_20240402_180000.txt":
+        "ID Ticket: 2c3d4e5f\n[18:00] Bob: ma photo est refusée, 100% nette pourtant\n",
+}
+
+
+def run(tmp_path, scenario):
+    async def main():
+        db = Database(os.path.join(str(tmp_path), "themis.db"))
+        await db.connect()
+        try:
+            index = TranscriptIndex(db)
+            await index.setup()
+            directory = tmp_path / "tickets"
+            directory.mkdir()
+            for name, content in TRANSCRIPTS.items():
+                (directory / name).write_text(content, encoding="utf-8")
+            assert await index.backfill(str(directory)) == len(TRANSCRIPTS)
+            return index, await scenario(index)
+        finally:
+            await db.close()
+    return asyncio.run(main())
+
+
+@pytest.fixture(params=["fts5", "like"])
+def mode(request, monkeypatch):
+    if request.param == "like":
+        # SQLite sans FTS5 : la création de la table virtuelle échoue
+        monkeypatch.setattr(transcript_index, "FTS_SCHEMA", "CREATE VIRTUAL TABLE x USING absent_module(content);")
+    return request.param
+
+
+def test_setup_picks_the_available_engine(tmp_path, mode):
+    async def scenario(index):
+        return None
+
+    index, _ = run(tmp_path, scenario)
+    assert index.fts is (mode == "fts5")
+
+
+def test_search_returns_matching_transcripts_with_snippet(tmp_path, mode):
+    async def scenario(index):
+        return await index.search("photo")
+
+    _, results = run(tmp_path, scenario)
+    assert {result["ticket_id"] for result in results} == {"1b2c3d4e", "2c3d4e5f"}
+    assert all("**photo**" in result["extract"] for result in results)
+
+
+def test_search_filters_by_user_and_dates(tmp_path, mode):
+    async def scenario(index):
+        return (
+            await index.search("photo", user_id="111"),
+            await index.search("photo", since="2024-04-05"),
+            await index.search("photo", until="2024-04-02")
+        )
+
+    _, (by_user, since, until) = run(tmp_path, scenario)
+    assert [result["ticket_id"] for result in by_user] == ["1b2c3d4e"]
+    assert [result["ticket_id"] for result in since] == ["1b2c3d4e"]
+    # Borne de fin incluse : toute la journée du 2 avril
+    assert [result["ticket_id"] for result in until] == ["2c3d4e5f"]
+
+
+def test_search_text_with_special_characters(tmp_path, mode):
+    async def scenario(index):
+        # « % » est invalide en syntaxe FTS5 (phrase exacte) et joker pour LIKE (échappé)
+        return await index.search("100% nette"), await index.search("10_%")
+
+    _, (phrase, jokers) = run(tmp_path, scenario)
+    assert [result["ticket_id"] for result in phrase] == ["2c3d4e5f"]
+    assert jokers == []
+
+
+def test_backfill_skips_already_indexed_files(tmp_path, mode):
+    async def scenario(index):
+        return await index.backfill(str(tmp_path / "tickets"))
+
+    _, added = run(tmp_path, scenario)
+    assert added == 0
@@ -0,0 +1,102 @@
+"""
+📥 Tests de la file de vérification
+"""
+
+from bot.utils.verification_queue import VerificationQueue, percentile
+
+
+def queue_of(*ticket_ids):
+    queue = VerificationQueue()
+    for index, ticket_id in enumerate(ticket_ids):
+        queue.push(ticket_id, str(index), index)
+        # Anciennetés distinctes et déterministes
+        queue.entries[ticket_id]["submitted_at"] = float(index)
+    queue.load(queue.entries)
+    return queue
+
+
+def ids(entries):
+    return [entry["ticket_id"] for entry in entries]
+
+
+def test_peek_follows_priority_then_age():
+    queue = queue_of("a", "b", "c")
+    queue.boost("c", 2)
+
+    assert ids(queue.peek(10)) == ["c", "a", "b"]
+    # peek ne consomme rien
+    assert ids(queue.peek(2)) == ["c", "a"]
+    assert len(queue) == 3
+
+
+def test_push_twice_keeps_original_entry():
+    queue = queue_of("a")
+
+    assert not queue.push("a", "0", 0)
+    assert queue.entries["a"]["submitted_at"] == 0.0
+
+
+def test_claim_next_then_release_restores_position():
+    queue = queue_of("a", "b")
+
+    assert queue.claim(1)["ticket_id"] == "a"
+    assert ids(queue.peek(10)) == ["b"]
+    assert queue.claim(2, "a") is None
+
+    queue.release("a")
+    assert ids(queue.peek(10)) == ["a", "b"]
+    assert len(queue.waits) == 1
+
+
+def test_targeted_claim_and_release_do_not_duplicate_entries():
+    queue = queue_of("a", "b", "c")
+
+    # Prise ciblée puis remise sans lecture intermédiaire : deux clés identiques dans le tas
+    queue.claim(1, "b")
+    queue.release("b")
+
+    assert ids(queue.peek(10)) == ["a", "b", "c"]
+    # Toujours sans doublon une fois le tas nettoyé par le premier peek
+    assert ids(queue.peek(10)) == ["a", "b", "c"]
+    assert [queue.claim(1)["ticket_id"] for _ in range(3)] == ["a", "b", "c"]
+    assert queue.claim(1) is None
+
+
+def test_removed_and_boosted_entries_are_skipped():
+    queue = queue_of("a", "b", "c")
+    queue.boost("b")
+    queue.remove("a")
+
+    assert ids(queue.peek(10)) == ["b", "c"]
+    assert queue.claim(1, "a") is None
+
+
+def test_load_skips_claimed_entries():
+    queue = queue_of("a", "b")
+    queue.claim(1, "a")
+
+    reloaded = VerificationQueue()
+    reloaded.load(queue.entries)
+
+    assert ids(reloaded.peek(10)) == ["b"]
+    assert "a" in reloaded and len(reloaded) == 1
+
+
+def test_stats_and_percentile():
+    queue = queue_of("a", "b")
+    queue.claim(1)
+
+    stats = queue.stats()
+    assert stats["depth"] == 1 and stats["claimed"] == 1 and stats["samples"] == 1
+    assert percentile([], 50) is None
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile([1, 2, 3, 4], 99) == 4
+
+
+def test_percentile_nearest_rank_on_even_counts():
+    # round() arrondit les demis au pair : 50 % de 2 valeurs donnait le maximum
+    assert percentile([10, 20], 50) == 10
+    assert percentile([10, 20], 51) == 20
+    assert percentile([1, 2, 3, 4, 5, 6], 50) == 3
+    assert percentile([1, 2, 3, 4, 5, 6], 0) == 1
+    assert percentile([1, 2, 3, 4, 5, 6], 100) == 6